@@ -9,6 +9,7 @@ prioritization, and graceful error handling.
 import time
 import queue
 import threading
+import itertools
 import os
 from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
@@ -46,6 +47,10 @@ class FetchRequest:
         return self.added_time > other.added_time
 
 
+# Tie-breaker for queue entries so the heap never compares requests, priorities or pills
+_queue_seq = itertools.count()
+
+
 class WorkerThread(QThread):
     """Worker thread for fetching individual durations"""
     
@@ -53,12 +58,13 @@ class WorkerThread(QThread):
     fetchFailed = Signal(int, str)  # playlist_index, error_message
     
     def __init__(self, worker_id: int, request_queue: queue.PriorityQueue, 
-                 cache: DurationCache, settings: DurationFetchSettings):
+                 cache: DurationCache, settings: DurationFetchSettings, broker: Any = None):
         super().__init__()
         self.worker_id = worker_id
         self.request_queue = request_queue
         self.cache = cache
         self.settings = settings
+        self.broker = broker  # Optional shared metadata broker (single request per URL)
         self._should_stop = False
         self._current_request = None
     
@@ -67,7 +73,7 @@ class WorkerThread(QThread):
         self._should_stop = True
         # Add a poison pill to wake up the thread
         try:
-            self.request_queue.put((FetchPriority.LOW, None), block=False)
+            self.request_queue.put(((0, next(_queue_seq)), None), block=False)
         except queue.Full:
             pass
     
@@ -209,6 +215,16 @@ class WorkerThread(QThread):
     
     def _fetch_online_duration(self, url: str, item_type: str) -> Tuple[bool, int, str, Optional[str]]:
         """Fetch duration for online video using yt-dlp"""
+        if self.broker is not None:
+            try:
+                meta = self.broker.fetch(url, item_type, need=('duration',))
+                duration = int((meta or {}).get('duration') or 0)
+                if duration > 0:
+                    return True, duration, 'yt-dlp', None
+                return False, 0, 'yt-dlp', 'No duration found'
+            except Exception as e:
+                return False, 0, 'yt-dlp', str(e)
+        
         try:
             import yt_dlp
             
@@ -313,6 +329,13 @@ class BackgroundDurationFetcher(QThread):
         self.save_timer.start(30000)  # Save every 30 seconds
         
         self._should_stop = False
+        self.metadata_broker = None
+    
+    def set_metadata_broker(self, broker: Any):
+        """Share a metadata broker with workers so durations come from combined requests"""
+        self.metadata_broker = broker
+        for worker in self.workers:
+            worker.broker = broker
         
     def start_workers(self):
         """Start worker threads"""
@@ -322,7 +345,7 @@ class BackgroundDurationFetcher(QThread):
         worker_count = max(1, min(self.settings.worker_thread_count, 8))
         
         for i in range(worker_count):
-            worker = WorkerThread(i, self.request_queue, self.cache, self.settings)
+            worker = WorkerThread(i, self.request_queue, self.cache, self.settings, self.metadata_broker)
             worker.fetchCompleted.connect(self._on_fetch_completed)
             worker.fetchFailed.connect(self._on_fetch_failed)
             self.workers.append(worker)
@@ -395,7 +418,9 @@ class BackgroundDurationFetcher(QThread):
             )
             
             try:
-                self.request_queue.put((item_priority, request), block=False)
+                # Enum members don't order, so key the heap on the negated value
+                # (higher priority first, then FIFO); mixed priorities can share the queue
+                self.request_queue.put(((-item_priority.value, next(_queue_seq)), request), block=False)
                 self.stats['queued'] += 1
             except queue.Full:
                 # Queue is full, skip this item
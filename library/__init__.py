@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Library Module for Silence Suzuka Player
+
+Provides data structures that keep the in-memory library (the playlist and
+its tree view) fast to query and update as it grows.
+"""
+
+from .index import PlaylistIndex
+from .persistence import atomic_write_json, BackgroundJsonWriter, DebouncedPersister
+from .settings import LibrarySettings
+from .lazy_groups import LazyGroupStore
+from .aggregates import GroupAggregates, GroupTotals
+from .up_next import UpNextQueue
+from .model import LibraryModel, LibraryView
+
+__all__ = ['PlaylistIndex', 'atomic_write_json', 'BackgroundJsonWriter', 'DebouncedPersister',
+           'LibrarySettings', 'LibraryModel', 'LibraryView', 'LazyGroupStore',
+           'GroupAggregates', 'GroupTotals', 'UpNextQueue']
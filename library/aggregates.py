@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Group Aggregates for Silence Suzuka Player
+
+Per-group totals (item count, total and remaining duration, unwatched count,
+last-played time) maintained incrementally as items are added, removed,
+completed, resumed or receive durations. Group headers and scope summaries
+read these instead of iterating the group's members.
+
+Like PlaylistIndex, the aggregates heal themselves on lookup: a playlist that
+changed size or identity without telling us triggers a one-off rebuild.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .reconcile import MISC_GROUP_KEY
+
+
+@dataclass
+class GroupTotals:
+    """Aggregate values for one group (or the whole library)"""
+    count: int = 0
+    total_duration: int = 0       # Seconds, items with a known duration only
+    remaining_duration: int = 0   # Seconds left in unwatched items, after resume points
+    unwatched: int = 0
+    last_played: float = 0.0      # Unix time, 0 if never played
+
+    def _apply(self, part: 'GroupTotals', sign: int):
+        self.count += sign * part.count
+        self.total_duration += sign * part.total_duration
+        self.remaining_duration += sign * part.remaining_duration
+        self.unwatched += sign * part.unwatched
+
+
+def group_key_of(item: Dict[str, Any]) -> Hashable:
+    """Key of the library group an item is shown under (see group_layout)"""
+    return item.get('playlist_key') or item.get('playlist') or MISC_GROUP_KEY
+
+
+class GroupAggregates:
+    """
+    Running totals per group key plus a library-wide total.
+
+    Each item's contribution is remembered, so update(item) subtracts the
+    old values and adds the new ones in O(1). Only last_played, a maximum,
+    is recomputed over the group's members, and only when the item holding
+    the maximum is removed.
+    """
+
+    def __init__(self, is_watched: Callable[[Dict[str, Any]], bool],
+                 resume_seconds: Callable[[Dict[str, Any]], float]):
+        self._is_watched = is_watched
+        self._resume_seconds = resume_seconds
+        self._groups: Dict[Hashable, GroupTotals] = {}
+        self._members: Dict[Hashable, Dict[int, Dict[str, Any]]] = {}
+        self._contrib: Dict[int, Tuple[Hashable, GroupTotals]] = {}
+        self._library = GroupTotals()
+        self._size = 0
+        self._playlist_id = None
+        self._stale = True
+        self.rebuilds = 0
+
+    def _contribution(self, item: Dict[str, Any]) -> GroupTotals:
+        try:
+            duration = max(0, int(item.get('duration') or 0))
+        except (TypeError, ValueError):
+            duration = 0
+        part = GroupTotals(count=1, total_duration=duration)
+        if not self._is_watched(item):
+            part.unwatched = 1
+            try:
+                resumed = int(self._resume_seconds(item) or 0)
+            except (TypeError, ValueError):
+                resumed = 0
+            part.remaining_duration = max(0, duration - resumed)
+        try:
+            part.last_played = float(item.get('last_played') or 0)
+        except (TypeError, ValueError):
+            pass
+        return part
+
+    # --- Maintenance ---
+
+    def rebuild(self, playlist: List[Dict[str, Any]]):
+        """Recompute every group from scratch (O(n))"""
+        self._groups.clear()
+        self._members.clear()
+        self._contrib.clear()
+        self._library = GroupTotals()
+        for item in playlist:
+            if isinstance(item, dict):
+                self._add(item)
+        self._size = len(playlist)
+        self._playlist_id = id(playlist)
+        self._stale = False
+        self.rebuilds += 1
+
+    def invalidate(self):
+        """Rebuild on the next lookup (after bulk changes, e.g. marking a group watched)"""
+        self._stale = True
+
+    def _in_sync(self, playlist) -> bool:
+        return not self._stale and self._playlist_id == id(playlist) and self._size == len(playlist)
+
+    def _add(self, item: Dict[str, Any]):
+        key = group_key_of(item)
+        part = self._contribution(item)
+        totals = self._groups.setdefault(key, GroupTotals())
+        totals._apply(part, 1)
+        totals.last_played = max(totals.last_played, part.last_played)
+        self._library._apply(part, 1)
+        self._library.last_played = max(self._library.last_played, part.last_played)
+        self._members.setdefault(key, {})[id(item)] = item
+        self._contrib[id(item)] = (key, part)
+
+    def _discard(self, item: Dict[str, Any]):
+        entry = self._contrib.pop(id(item), None)
+        if entry is None:
+            return
+        key, part = entry
+        self._members.get(key, {}).pop(id(item), None)
+        totals = self._groups.get(key)
+        if totals is not None:
+            totals._apply(part, -1)
+            if totals.count <= 0:
+                del self._groups[key]
+                self._members.pop(key, None)
+            elif part.last_played and part.last_played >= totals.last_played:
+                totals.last_played = max((self._contrib[i][1].last_played for i in self._members[key]),
+                                         default=0.0)
+        self._library._apply(part, -1)
+        if part.last_played and part.last_played >= self._library.last_played:
+            self._library.last_played = max((g.last_played for g in self._groups.values()), default=0.0)
+
+    def extend(self, items: List[Dict[str, Any]], playlist: List[Dict[str, Any]]):
+        """Record items appended to (or inserted into) playlist"""
+        if not self._in_sync_after(playlist, len(items)):
+            self.invalidate()
+            return
+        for item in items:
+            self._add(item)
+        self._size = len(playlist)
+
+    def remove(self, items: List[Dict[str, Any]], playlist: List[Dict[str, Any]]):
+        """Record items removed from playlist"""
+        if not self._in_sync_after(playlist, -len(items)):
+            self.invalidate()
+            return
+        for item in items:
+            self._discard(item)
+        self._size = len(playlist)
+
+    def _in_sync_after(self, playlist, delta: int) -> bool:
+        return not self._stale and self._playlist_id == id(playlist) and self._size == len(playlist) - delta
+
+    def update(self, item: Dict[str, Any]):
+        """Re-count one item after its duration, group, completion or resume point changed"""
+        if self._stale or id(item) not in self._contrib:
+            return
+        self._discard(item)
+        self._add(item)
+
+    # --- Lookups ---
+
+    def totals(self, key: Hashable, playlist: List[Dict[str, Any]]) -> Optional[GroupTotals]:
+        """Totals for a group key (None if no item is in that group)"""
+        if not self._in_sync(playlist):
+            self.rebuild(playlist)
+        totals = self._groups.get(key)
+        return replace(totals) if totals is not None else None
+
+    def library_totals(self, playlist: List[Dict[str, Any]]) -> GroupTotals:
+        if not self._in_sync(playlist):
+            self.rebuild(playlist)
+        return replace(self._library)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'groups': len(self._groups),
+            'items': self._library.count,
+            'rebuilds': self.rebuilds,
+            'stale': self._stale
+        }
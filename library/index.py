@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Playlist Index for Silence Suzuka Player
+
+Maintained lookups from canonical media ID to playlist positions and from
+playlist position to tree node, so per-item updates (title, duration,
+thumbnail) no longer scan the playlist or walk the tree.
+
+The index is updated incrementally by the common mutation paths and heals
+itself on lookup: a stale position or a playlist that changed size or
+identity behind its back triggers a one-off rebuild.
+"""
+
+from bisect import insort
+from typing import Any, Callable, Dict, List, Optional
+
+from metadata.ids import media_id_for_url
+
+
+class PlaylistIndex:
+    """
+    Media ID -> positions and position -> tree node maps.
+
+    Tree nodes are stored opaquely; the caller validates them (a node can be
+    deleted by the widget at any time) and re-registers on a miss.
+    """
+
+    def __init__(self, key_func: Callable[[str], str] = media_id_for_url):
+        self._key = key_func
+        self._positions: Dict[str, List[int]] = {}
+        self._nodes: Dict[int, Any] = {}
+        self._size = 0
+        self._playlist_id = None
+        self.nodes_complete = False  # True once every visible item has registered its node
+        self.rebuilds = 0
+
+    # --- Position map ---
+
+    def rebuild(self, playlist: List[Dict[str, Any]]):
+        """Recompute media ID positions from scratch (O(n))"""
+        positions: Dict[str, List[int]] = {}
+        for i, item in enumerate(playlist):
+            if isinstance(item, dict):
+                positions.setdefault(self._key(item.get('url', '')), []).append(i)
+        self._positions = positions
+        self._size = len(playlist)
+        self._playlist_id = id(playlist)
+        self.rebuilds += 1
+
+    def _in_sync(self, playlist) -> bool:
+        return self._playlist_id == id(playlist) and self._size == len(playlist)
+
+    def positions(self, url: str, playlist: List[Dict[str, Any]]) -> List[int]:
+        """Playlist positions holding url (any URL variant of the same media)"""
+        if not url:
+            return []
+        if not self._in_sync(playlist):
+            self.rebuild(playlist)
+
+        key = self._key(url)
+        found = self._positions.get(key, [])
+        for pos in found:
+            if not (0 <= pos < len(playlist) and
+                    isinstance(playlist[pos], dict) and
+                    self._key(playlist[pos].get('url', '')) == key):
+                # Playlist was reordered without telling us
+                self.rebuild(playlist)
+                found = self._positions.get(key, [])
+                break
+        return list(found)
+
+    def first(self, url: str, playlist: List[Dict[str, Any]]) -> int:
+        found = self.positions(url, playlist)
+        return found[0] if found else -1
+
+    def append(self, item: Dict[str, Any], playlist: List[Dict[str, Any]]):
+        """Record an item appended at the end of playlist (O(1))"""
+        if not (self._playlist_id == id(playlist) and self._size == len(playlist) - 1):
+            self.rebuild(playlist)
+            return
+        self._positions.setdefault(self._key(item.get('url', '')), []).append(self._size)
+        self._size += 1
+
+    def extend(self, items: List[Dict[str, Any]], playlist: List[Dict[str, Any]]):
+        """Record items appended at the end of playlist"""
+        start = len(playlist) - len(items)
+        if not (self._playlist_id == id(playlist) and self._size == start):
+            self.rebuild(playlist)
+            return
+        for offset, item in enumerate(items):
+            self._positions.setdefault(self._key(item.get('url', '')), []).append(start + offset)
+        self._size = len(playlist)
+
+    def insert(self, position: int, item: Dict[str, Any], playlist: List[Dict[str, Any]]):
+        """Record an item inserted at position; later positions shift by one"""
+        if not (self._playlist_id == id(playlist) and self._size == len(playlist) - 1):
+            self.rebuild(playlist)
+            return
+        self._shift(position, 1)
+        insort(self._positions.setdefault(self._key(item.get('url', '')), []), position)
+        self._size += 1
+
+    def remove(self, position: int, item: Dict[str, Any], playlist: List[Dict[str, Any]]):
+        """Record the item removed from position; later positions shift down by one"""
+        if not (self._playlist_id == id(playlist) and self._size == len(playlist) + 1):
+            self.rebuild(playlist)
+            return
+        key = self._key(item.get('url', ''))
+        bucket = self._positions.get(key, [])
+        if position in bucket:
+            bucket.remove(position)
+            if not bucket:
+                del self._positions[key]
+        self._nodes.pop(position, None)
+        self._shift(position + 1, -1)
+        self._size -= 1
+
+    def move(self, src: int, dst: int, playlist: List[Dict[str, Any]]):
+        """Record playlist.insert(dst, playlist.pop(src))"""
+        if src == dst:
+            return
+        # Positions between src and dst all shift; recomputing is simplest and still O(n)
+        self.rebuild(playlist)
+        self.invalidate_nodes()
+
+    def _shift(self, start: int, delta: int):
+        for bucket in self._positions.values():
+            for i, pos in enumerate(bucket):
+                if pos >= start:
+                    bucket[i] = pos + delta
+        if self._nodes:
+            self._nodes = {(p + delta if p >= start else p): n for p, n in self._nodes.items()}
+
+    # --- Tree node map ---
+
+    def set_node(self, position: int, node: Any):
+        self._nodes[position] = node
+
+    def node(self, position: int) -> Optional[Any]:
+        return self._nodes.get(position)
+
+    def clear_node(self, position: int):
+        """Forget the node of one position (its row was released, not deleted with the tree)"""
+        self._nodes.pop(position, None)
+
+    def invalidate_nodes(self):
+        """Forget every node (the tree was cleared or rebuilt)"""
+        self._nodes.clear()
+        self.nodes_complete = False
+
+    def clear(self):
+        self._positions.clear()
+        self._nodes.clear()
+        self._size = 0
+        self._playlist_id = None
+        self.nodes_complete = False
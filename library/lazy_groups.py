@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Lazy Group Bookkeeping for Silence Suzuka Player
+
+Collapsed library groups are built as a header only. LazyGroupStore remembers
+which playlist positions each unpopulated group stands for, so the player can
+create the child rows on first expand. It also tracks how long populated
+groups have been collapsed, so their rows can be released again.
+"""
+
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+
+class LazyGroupStore:
+    """
+    Pending rows of unpopulated groups and collapse times of populated ones.
+
+    Positions are only valid until the playlist changes; the tree refresh
+    paths replace them whenever they lay the library out again.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Hashable, List[int]] = {}
+        self._collapsed_at: Dict[Hashable, float] = {}
+
+    def clear(self):
+        self._pending.clear()
+        self._collapsed_at.clear()
+
+    # --- Unpopulated groups ---
+
+    def defer(self, key: Hashable, positions: Iterable[int]):
+        """Record a group whose children have not been created"""
+        self._pending[key] = list(positions)
+        self._collapsed_at.pop(key, None)
+
+    def extend(self, key: Hashable, positions: Iterable[int]):
+        self._pending.setdefault(key, []).extend(positions)
+
+    def is_pending(self, key: Hashable) -> bool:
+        return key in self._pending
+
+    def pending(self, key: Hashable) -> List[int]:
+        return self._pending.get(key, [])
+
+    def pending_keys(self) -> List[Hashable]:
+        return list(self._pending)
+
+    def take(self, key: Hashable) -> Optional[List[int]]:
+        """Positions to populate now (None if the group is already populated)"""
+        return self._pending.pop(key, None)
+
+    def group_of(self, position: int) -> Optional[Hashable]:
+        """Key of the unpopulated group holding position, if any"""
+        for key, positions in self._pending.items():
+            if position in positions:
+                return key
+        return None
+
+    def forget(self, key: Hashable):
+        self._pending.pop(key, None)
+        self._collapsed_at.pop(key, None)
+
+    # --- Release of collapsed groups ---
+
+    def collapsed(self, key: Hashable, now: Optional[float] = None):
+        if key not in self._pending:
+            self._collapsed_at[key] = now or time.monotonic()
+
+    def expanded(self, key: Hashable):
+        self._collapsed_at.pop(key, None)
+
+    def due_for_release(self, after_s: float, now: Optional[float] = None) -> List[Hashable]:
+        """Populated groups collapsed for at least after_s seconds"""
+        if after_s <= 0:
+            return []
+        now = now or time.monotonic()
+        return [key for key, since in self._collapsed_at.items() if now - since >= after_s]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending_groups': len(self._pending),
+            'pending_rows': sum(len(p) for p in self._pending.values()),
+            'collapsed_populated': len(self._collapsed_at)
+        }
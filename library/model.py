@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Library Model for Silence Suzuka Player
+
+A QAbstractItemModel over the playlist list itself, grouped the same way as
+the QTreeWidget library (one group per playlist, singles at the top level or
+under "Miscellaneous"). Rows are lightweight nodes that point at playlist
+positions; text, icons and fonts are produced in data() only for rows the
+view actually paints. Changes are reported as insert/remove/move/dataChanged
+notifications instead of rebuilding every item.
+"""
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import (Qt, QAbstractItemModel, QByteArray, QMimeData, QModelIndex,
+                            QPersistentModelIndex, Signal)
+from PySide6.QtGui import QColor, QIcon
+from PySide6.QtWidgets import QTreeView, QAbstractItemView, QHeaderView
+
+from .reconcile import MISC_GROUP_KEY
+
+
+class _Node:
+    """One row: a group header or a playlist item (by playlist position)"""
+    __slots__ = ('kind', 'key', 'title', 'pos', 'parent', 'children')
+
+    def __init__(self, kind: str, key: Any = None, title: str = '', pos: int = -1,
+                 parent: Optional['_Node'] = None):
+        self.kind = kind  # 'root', 'group' or 'current'
+        self.key = key
+        self.title = title
+        self.pos = pos
+        self.parent = parent
+        self.children: List['_Node'] = []
+
+    def row(self) -> int:
+        return self.parent.children.index(self) if self.parent else 0
+
+
+class LibraryModel(QAbstractItemModel):
+    """
+    Grouped playlist model.
+
+    Qt.UserRole returns the same tuples the tree widget stores on its items:
+    ('current', index, item_dict) for tracks and ('group', key) for groups.
+    """
+
+    GroupKeyRole = Qt.UserRole + 1
+    PositionsMimeType = 'application/x-suzuka-playlist-positions'
+
+    def __init__(self, parent=None,
+                 icon_func: Optional[Callable[[str], Any]] = None,
+                 duration_func: Optional[Callable[[Any], str]] = None,
+                 font_func: Optional[Callable[[], Any]] = None):
+        super().__init__(parent)
+        self.icon_func = icon_func
+        self.duration_func = duration_func or (lambda seconds: '')
+        self.font_func = font_func
+        self.group_singles = False
+        self.current_index = -1
+        self._playlist: List[Dict[str, Any]] = []
+        self._root = _Node('root')
+        self._groups: Dict[Any, _Node] = {}
+        self._by_pos: Dict[int, _Node] = {}
+
+    # --- Structure ---
+
+    def _group_key(self, item: Dict[str, Any]):
+        if item.get('playlist') or item.get('playlist_key'):
+            return item.get('playlist_key') or item.get('playlist')
+        return MISC_GROUP_KEY if self.group_singles else None
+
+    def _group_title(self, key, item: Dict[str, Any]) -> str:
+        if key == MISC_GROUP_KEY and not (item.get('playlist') or item.get('playlist_key')):
+            return 'Miscellaneous'
+        return item.get('playlist') or str(key)
+
+    def set_playlist(self, playlist: List[Dict[str, Any]], group_singles: bool = False):
+        """Rebuild the row structure (one reset; used when the playlist is replaced)"""
+        self.beginResetModel()
+        self._playlist = playlist
+        self.group_singles = group_singles
+        self._root = _Node('root')
+        self._groups = {}
+        self._by_pos = {}
+
+        singles = []
+        misc = None
+        for pos, item in enumerate(playlist):
+            if not isinstance(item, dict):
+                continue
+            key = self._group_key(item)
+            if key is None:
+                singles.append(pos)
+                continue
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Node('group', key, self._group_title(key, item), parent=self._root)
+                if key == MISC_GROUP_KEY:
+                    misc = group  # Miscellaneous goes after the playlist groups
+                else:
+                    self._root.children.append(group)
+            node = _Node('current', pos=pos, parent=group)
+            group.children.append(node)
+            self._by_pos[pos] = node
+
+        if misc is not None:
+            self._root.children.append(misc)
+        for pos in singles:
+            node = _Node('current', pos=pos, parent=self._root)
+            self._root.children.append(node)
+            self._by_pos[pos] = node
+        self.endResetModel()
+
+    def _index_for_node(self, node: _Node, column: int = 0) -> QModelIndex:
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row(), column, node)
+
+    def index_for_position(self, pos: int, column: int = 0) -> QModelIndex:
+        return self._index_for_node(self._by_pos.get(pos), column)
+
+    def append_items(self, start: int, items: List[Dict[str, Any]]):
+        """Rows for items just appended to the playlist at start (inserts only the new rows)"""
+        runs: List[tuple] = []  # (parent node, [positions]) in arrival order
+        for offset, item in enumerate(items):
+            pos = start + offset
+            key = self._group_key(item)
+            parent = self._root if key is None else self._groups.get(key)
+            if parent is None:
+                parent = self._insert_group(key, item, pos)
+            if runs and runs[-1][0] is parent:
+                runs[-1][1].append(pos)
+            else:
+                runs.append((parent, [pos]))
+
+        for parent, positions in runs:
+            first = len(parent.children)
+            self.beginInsertRows(self._index_for_node(parent), first, first + len(positions) - 1)
+            for pos in positions:
+                node = _Node('current', pos=pos, parent=parent)
+                parent.children.append(node)
+                self._by_pos[pos] = node
+            self.endInsertRows()
+            if parent is not self._root:
+                self._emit_changed(parent)  # Group header count
+
+    def _insert_group(self, key, item: Dict[str, Any], pos: int) -> _Node:
+        """
+        Insert a header row for a new group whose first track is at pos, where
+        set_playlist would put it: playlist groups in order of first track,
+        then Miscellaneous, then the top-level singles.
+        """
+        group = _Node('group', key, self._group_title(key, item), parent=self._root)
+        row = self._group_row(self._root.children, key, pos)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._root.children.insert(row, group)
+        self._groups[key] = group
+        self.endInsertRows()
+        return group
+
+    def _group_row(self, siblings: List[_Node], key, pos: int) -> int:
+        row = 0
+        for sibling in siblings:
+            if sibling.kind != 'group':
+                break
+            if key != MISC_GROUP_KEY and (sibling.key == MISC_GROUP_KEY
+                                          or (sibling.children and sibling.children[0].pos > pos)):
+                break
+            row += 1
+        return row
+
+    def _place_group(self, group: _Node):
+        """Move a group header after its first track changed (groups are ordered by first track)"""
+        if group.key == MISC_GROUP_KEY or not group.children:
+            return
+        old_row = group.row()
+        siblings = [c for c in self._root.children if c is not group]
+        new_row = self._group_row(siblings, group.key, group.children[0].pos)
+        if new_row == old_row:
+            return
+        dest = new_row + 1 if new_row > old_row else new_row
+        if self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), dest):
+            self._root.children = siblings[:new_row] + [group] + siblings[new_row:]
+            self.endMoveRows()
+
+    def insert_position(self, pos: int):
+        """Insert the row for playlist position pos (after playlist.insert(pos, item))"""
+        if not (0 <= pos < len(self._playlist)) or not isinstance(self._playlist[pos], dict):
+            return
+        item = self._playlist[pos]
+        self._renumber(pos, 1)
+        key = self._group_key(item)
+        parent = self._root if key is None else self._groups.get(key)
+        if parent is None:
+            parent = self._insert_group(key, item, pos)
+        if parent is self._root:
+            row = self._root_row_for(parent.children, pos)
+        else:
+            row = bisect_left([c.pos for c in parent.children], pos)
+        node = _Node('current', pos=pos, parent=parent)
+        self.beginInsertRows(self._index_for_node(parent), row, row)
+        parent.children.insert(row, node)
+        self._by_pos[pos] = node
+        self.endInsertRows()
+        if parent is not self._root:
+            self._emit_changed(parent)  # Group header count
+            if row == 0:
+                self._place_group(parent)
+
+    def _renumber(self, start: int, delta: int):
+        """Shift stored playlist positions >= start by delta"""
+        shifted = {}
+        for pos, node in self._by_pos.items():
+            if pos >= start:
+                node.pos = pos + delta
+            shifted[node.pos] = node
+        self._by_pos = shifted
+
+    def remove_position(self, pos: int):
+        """Remove the row for playlist position pos (after playlist.pop(pos))"""
+        node = self._by_pos.pop(pos, None)
+        if node is None:
+            self._renumber(pos + 1, -1)
+            return
+        parent = node.parent
+        row = node.row()
+        self.beginRemoveRows(self._index_for_node(parent), row, row)
+        del parent.children[row]
+        self.endRemoveRows()
+        self._renumber(pos + 1, -1)
+
+        if parent is not self._root:
+            if not parent.children:
+                grow = parent.row()
+                self.beginRemoveRows(QModelIndex(), grow, grow)
+                del self._root.children[grow]
+                self._groups.pop(parent.key, None)
+                self.endRemoveRows()
+            else:
+                self._emit_changed(parent)
+                if row == 0:
+                    self._place_group(parent)
+
+    def move_position(self, src: int, dst: int):
+        """Reflect playlist.insert(dst, playlist.pop(src)) with a row move"""
+        if src == dst or src not in self._by_pos:
+            return
+        node = self._by_pos.pop(src)
+        # Positions between src and dst close the gap left by src
+        if src < dst:
+            self._renumber_range(src + 1, dst, -1)
+        else:
+            self._renumber_range(dst, src - 1, 1)
+        node.pos = dst
+        self._by_pos[dst] = node
+
+        parent = node.parent
+        old_row = node.row()
+        siblings = [c for c in parent.children if c is not node]
+        # Groups list their tracks in playlist order; groups themselves keep their place
+        keys = [c.pos if c.kind == 'current' else -1 for c in siblings]
+        new_row = bisect_left(keys, dst) if parent is not self._root else self._root_row_for(siblings, dst)
+        if new_row == old_row:
+            return
+        parent_index = self._index_for_node(parent)
+        # Qt wants the destination row in pre-move coordinates
+        dest = new_row + 1 if new_row > old_row else new_row
+        if self.beginMoveRows(parent_index, old_row, old_row, parent_index, dest):
+            parent.children = siblings[:new_row] + [node] + siblings[new_row:]
+            self.endMoveRows()
+
+    def _root_row_for(self, siblings: List[_Node], pos: int) -> int:
+        for row, sibling in enumerate(siblings):
+            if sibling.kind == 'current' and sibling.pos > pos:
+                return row
+        return len(siblings)
+
+    def _renumber_range(self, first: int, last: int, delta: int):
+        shifted = {}
+        for pos, node in self._by_pos.items():
+            if first <= pos <= last:
+                node.pos = pos + delta
+            shifted[node.pos] = node
+        self._by_pos = shifted
+
+    # --- Change notifications ---
+
+    def _emit_changed(self, node: _Node):
+        if node is None or node is self._root:
+            return
+        self.dataChanged.emit(self._index_for_node(node, 0), self._index_for_node(node, 1))
+
+    def item_changed(self, pos: int):
+        """Title, duration or type of playlist[pos] changed"""
+        self._emit_changed(self._by_pos.get(pos))
+
+    def set_current_index(self, pos: int):
+        """Restyle only the previous and the new current rows"""
+        old = self.current_index
+        self.current_index = pos
+        if old != pos:
+            self.item_changed(old)
+        self.item_changed(pos)
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self._root
+        if node is None or not (0 <= row < len(node.children)) or not (0 <= column < 2):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is None or node.parent is None or node.parent is self._root:
+            return QModelIndex()
+        return self._index_for_node(node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self._root
+        return len(node.children) if node else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self._root
+        return bool(node and node.kind != 'current' and node.children)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDropEnabled
+        if index.internalPointer().kind == 'current':
+            flags |= Qt.ItemIsDragEnabled
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [self.PositionsMimeType]
+
+    def mimeData(self, indexes):
+        """Dragged rows as their playlist positions (rows hold no serialisable data of their own)"""
+        positions = sorted({index.internalPointer().pos for index in indexes
+                            if index.isValid() and index.internalPointer().kind == 'current'})
+        mime = QMimeData()
+        mime.setData(self.PositionsMimeType, QByteArray(','.join(map(str, positions)).encode()))
+        return mime
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+
+        if node.kind == 'group':
+            if role == Qt.DisplayRole and column == 0:
+                prefix = '🎵' if node.key == MISC_GROUP_KEY else '📃'
+                return f"{prefix} {node.title} ({len(node.children)})"
+            if role == Qt.UserRole:
+                return ('group', node.key)
+            if role == self.GroupKeyRole:
+                return node.key
+            if role == Qt.FontRole and self.font_func:
+                return self.font_func()
+            return None
+
+        if not (0 <= node.pos < len(self._playlist)):
+            return None
+        item = self._playlist[node.pos]
+        is_current = node.pos == self.current_index
+
+        if role == Qt.DisplayRole:
+            if column == 1:
+                return self.duration_func(item.get('duration', 0))
+            icon = self.icon_func(item.get('type')) if self.icon_func else None
+            title = item.get('title', 'Unknown')
+            if icon is not None and not isinstance(icon, QIcon):
+                title = f"{icon} {title}"
+            return f"▶ {title}" if is_current else title
+        if role == Qt.DecorationRole and column == 0 and self.icon_func:
+            icon = self.icon_func(item.get('type'))
+            return icon if isinstance(icon, QIcon) else None
+        if role == Qt.ToolTipRole and column == 0:
+            return item.get('title', '')
+        if role == Qt.TextAlignmentRole and column == 1:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.FontRole and self.font_func:
+            return self.font_func()
+        if role == Qt.ForegroundRole and column == 0:
+            if is_current:
+                return QColor("#e76f51")
+            if item.get('needs_title') and item.get('type') in ('youtube', 'bilibili'):
+                return QColor("#888888")
+            return None
+        if role == Qt.BackgroundRole and is_current:
+            return QColor(231, 111, 81, 40)
+        if role == Qt.UserRole:
+            return ('current', node.pos, item)
+        return None
+
+
+class LibraryRow:
+    """
+    A selected LibraryView row with the data()/text() accessors of a
+    QTreeWidgetItem, so selection code written for PlaylistTree works on both.
+    """
+    __slots__ = ('_index',)
+
+    def __init__(self, index: QModelIndex):
+        self._index = QPersistentModelIndex(index)
+
+    def data(self, column: int, role=Qt.DisplayRole):
+        if not self._index.isValid():
+            return None
+        model = self._index.model()
+        return model.index(self._index.row(), column, self._index.parent()).data(role)
+
+    def text(self, column: int) -> str:
+        return self.data(column) or ''
+
+
+class LibraryView(QTreeView):
+    """
+    QTreeView configured like PlaylistTree, for use with LibraryModel.
+
+    Uniform row heights let the view lay out tens of thousands of rows
+    without measuring each one.
+    """
+
+    positionActivated = Signal(int)  # Playlist position of a double-clicked track
+    groupActivated = Signal(object)  # Key of a double-clicked group
+    positionMoved = Signal(int, int)  # Track dragged from one playlist position onto another
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName('playlistTree')
+        self.setHeaderHidden(True)
+        self.setUniformRowHeights(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setWordWrap(False)
+        self.setTextElideMode(Qt.ElideRight)
+        self.setAlternatingRowColors(True)
+        self.setIndentation(20)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.doubleClicked.connect(self._on_double_clicked)
+
+    def setModel(self, model):
+        super().setModel(model)
+        header = self.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.Stretch)  # Title fills
+        header.setSectionResizeMode(1, QHeaderView.Fixed)    # Duration fixed
+        self.setColumnWidth(1, 70)
+
+    def _on_double_clicked(self, index):
+        data = index.sibling(index.row(), 0).data(Qt.UserRole)
+        if not isinstance(data, tuple):
+            return
+        if data[0] == 'current':
+            self.positionActivated.emit(data[1])
+        elif data[0] == 'group':
+            self.groupActivated.emit(data[1])
+            self.expand(index.sibling(index.row(), 0))
+
+    def dropEvent(self, event):
+        """
+        Reorder like PlaylistTree: the current track takes the place of the
+        track it is dropped on, within the same group. The model is not
+        touched here; the owner moves the playlist entry and the row.
+        """
+        target = self.indexAt(event.position().toPoint())
+        source = self.currentIndex()
+        if event.source() is not self or not target.isValid() or not source.isValid():
+            event.ignore()
+            return
+        src = source.sibling(source.row(), 0).data(Qt.UserRole)
+        dst = target.sibling(target.row(), 0).data(Qt.UserRole)
+        if (isinstance(src, tuple) and isinstance(dst, tuple) and src[0] == dst[0] == 'current'
+                and source.parent() == target.parent() and src[1] != dst[1]):
+            self.positionMoved.emit(src[1], dst[1])
+        event.setDropAction(Qt.IgnoreAction)  # Keep Qt from removing the source rows
+        event.accept()
+
+    def selectedItems(self) -> List[LibraryRow]:
+        """Selected rows, in the shape of QTreeWidget.selectedItems()"""
+        selection = self.selectionModel()
+        if selection is None:
+            return []
+        return [LibraryRow(index) for index in selection.selectedRows(0)]
+
+    def scroll_to_position(self, pos: int):
+        model = self.model()
+        if isinstance(model, LibraryModel):
+            index = model.index_for_position(pos)
+            if index.isValid():
+                self.scrollTo(index, QAbstractItemView.PositionAtCenter)
+
+    def expansion_state(self) -> Dict[Any, bool]:
+        """Group key -> expanded, in the format of _get_tree_expansion_state"""
+        state = {}
+        model = self.model()
+        if model is None:
+            return state
+        for row in range(model.rowCount()):
+            index = model.index(row, 0)
+            data = index.data(Qt.UserRole)
+            if isinstance(data, tuple) and data[0] == 'group':
+                state[data[1]] = self.isExpanded(index)
+        return state
+
+    def restore_expansion(self, state: Dict[Any, bool]):
+        model = self.model()
+        if model is None or not state:
+            return
+        for row in range(model.rowCount()):
+            index = model.index(row, 0)
+            data = index.data(Qt.UserRole)
+            if isinstance(data, tuple) and data[0] == 'group' and state.get(data[1]):
+                self.setExpanded(index, True)
+
+    def visible_positions(self) -> List[int]:
+        """Playlist positions of the rows currently in the viewport"""
+        positions = []
+        index = self.indexAt(self.viewport().rect().topLeft())
+        bottom = self.viewport().rect().bottom()
+        while index.isValid() and self.visualRect(index).top() <= bottom:
+            data = index.data(Qt.UserRole)
+            if isinstance(data, tuple) and data[0] == 'current':
+                positions.append(data[1])
+            index = self.indexBelow(index)
+        return positions
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Playlist Persistence for Silence Suzuka Player
+
+Coalesced, crash-safe JSON persistence. The GUI thread only marks data dirty
+and takes a cheap snapshot when a debounce window closes (or a maximum
+latency is reached); serialization and the atomic file replace run on a
+background writer thread that always writes the newest snapshot.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+
+def atomic_write_json(path: Path, data: Any, **dump_kwargs):
+    """Write JSON to path via a fsynced temporary file and an atomic replace"""
+    path = Path(path)
+    temp_file = path.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    temp_file.replace(path)
+
+    # Persist the rename itself where the platform allows it
+    if os.name != 'nt':
+        try:
+            dir_fd = os.open(str(path.parent), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+class BackgroundJsonWriter:
+    """
+    Single background thread that writes the latest submitted snapshot.
+
+    Snapshots submitted while a write is in progress replace each other, so a
+    burst of submissions costs at most one extra write.
+
+    on_written, if given, is called on the writer thread after every write
+    with the exception that made it fail, or None on success.
+    """
+
+    def __init__(self, path: Path, name: str = 'json-writer',
+                 on_written: Optional[Callable[[Optional[Exception]], None]] = None, **dump_kwargs):
+        self.path = Path(path)
+        self.on_written = on_written
+        self.dump_kwargs = dump_kwargs
+        self._cond = threading.Condition()
+        self._pending: Any = None
+        self._has_pending = False
+        self._writing = False
+        self._closed = False
+        self.writes = 0
+        self.last_error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, data: Any):
+        """Queue data for writing, replacing any snapshot not yet written"""
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = data
+            self._has_pending = True
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted snapshot is on disk. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._has_pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush outstanding data and stop the writer thread"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._has_pending and not self._closed:
+                    self._cond.wait()
+                if not self._has_pending and self._closed:
+                    return
+                data = self._pending
+                self._pending = None
+                self._has_pending = False
+                self._writing = True
+
+            error = None
+            try:
+                atomic_write_json(self.path, data, **self.dump_kwargs)
+                self.writes += 1
+            except Exception as e:
+                error = e
+                print(f"Persistence: Failed to write {self.path.name}: {e}")
+            self.last_error = error
+
+            try:
+                if self.on_written is not None:
+                    self.on_written(error)
+            except Exception as e:
+                print(f"Persistence: on_written callback failed: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+
+class DebouncedPersister(QObject):
+    """
+    Marks data dirty and saves it through a BackgroundJsonWriter.
+
+    A save happens debounce_ms after the last change, but never later than
+    max_latency_ms after the first unsaved change, so a steady stream of
+    updates (e.g. bulk title resolution) still reaches disk regularly.
+    """
+
+    def __init__(self, snapshot_fn: Callable[[], Any], writer: BackgroundJsonWriter,
+                 debounce_ms: int = 1500, max_latency_ms: int = 10000, parent=None):
+        super().__init__(parent)
+        self.snapshot_fn = snapshot_fn
+        self.writer = writer
+        self.debounce_ms = debounce_ms
+        self.max_latency_ms = max_latency_ms
+        self._dirty_since: Optional[float] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.save_now)
+
+    def mark_dirty(self):
+        """Record a change; the save is scheduled, not performed"""
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+
+        waited_ms = (now - self._dirty_since) * 1000
+        remaining_ms = max(0, int(self.max_latency_ms - waited_ms))
+        self._timer.start(min(self.debounce_ms, remaining_ms))
+
+    def is_dirty(self) -> bool:
+        return self._dirty_since is not None
+
+    def save_now(self):
+        """Snapshot on the calling (GUI) thread and hand off to the writer"""
+        self._timer.stop()
+        self._dirty_since = None
+        try:
+            self.writer.submit(self.snapshot_fn())
+        except Exception as e:
+            print(f"Persistence: Failed to snapshot: {e}")
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Save anything pending and wait for it to reach disk"""
+        if self.is_dirty():
+            self.save_now()
+        return self.writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        self.flush(timeout)
+        self.writer.close(timeout)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Playlist Reconciliation for Silence Suzuka Player
+
+Computes the minimal set of row operations that turns the library tree built
+for one playlist snapshot into the tree for another. Items are matched by
+stable ID (canonical media ID plus an occurrence number, so duplicates stay
+distinct). Within each container, a longest increasing subsequence of the
+surviving rows stays in place and only the remaining rows are moved. This
+keeps existing rows, with their expansion and selection, instead of
+rebuilding the tree.
+
+Nothing here touches Qt; the player applies the plans to its widget.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from metadata.ids import media_id_for_url
+
+
+MISC_GROUP_KEY = 'miscellaneous'
+
+
+def stable_keys(urls: Iterable[str], key_func: Callable[[str], str] = media_id_for_url) -> List[str]:
+    """Stable ID for each URL in order; the Nth duplicate of a media ID gets #N"""
+    seen: Dict[str, int] = {}
+    keys = []
+    for url in urls:
+        base = key_func(url or '')
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        keys.append(f"{base}#{occurrence}")
+    return keys
+
+
+def group_layout(playlist: List[Dict[str, Any]], group_singles: bool = False) -> List[Tuple[Hashable, str, List[int]]]:
+    """
+    Top-level layout of the library tree for a playlist.
+
+    Mirrors _refresh_playlist_widget_full: playlist groups in order of first
+    appearance, then either one Miscellaneous group or each single item.
+
+    Returns:
+        List of (group key, group title, playlist positions). Top-level
+        single items use a group key of None and a single position.
+    """
+    groups: Dict[Hashable, Tuple[str, List[int]]] = {}
+    singles: List[int] = []
+    for pos, item in enumerate(playlist):
+        if isinstance(item, dict) and (item.get('playlist') or item.get('playlist_key')):
+            key = item.get('playlist_key') or item.get('playlist')
+            if key not in groups:
+                groups[key] = (item.get('playlist') or str(key), [])
+            groups[key][1].append(pos)
+        else:
+            singles.append(pos)
+
+    layout = [(key, title, positions) for key, (title, positions) in groups.items()]
+    if singles:
+        if group_singles:
+            layout.append((MISC_GROUP_KEY, 'Miscellaneous', singles))
+        else:
+            layout.extend((None, '', [pos]) for pos in singles)
+    return layout
+
+
+def longest_increasing_subsequence(seq: List[int]) -> List[int]:
+    """Indices into seq of one longest strictly increasing subsequence (O(n log n))"""
+    tails: List[int] = []  # Smallest tail value of an increasing run of each length
+    tail_idx: List[int] = []
+    prev: List[Optional[int]] = [None] * len(seq)
+    for i, value in enumerate(seq):
+        j = bisect_left(tails, value)
+        if j == len(tails):
+            tails.append(value)
+            tail_idx.append(i)
+        else:
+            tails[j] = value
+            tail_idx[j] = i
+        prev[i] = tail_idx[j - 1] if j > 0 else None
+
+    result = []
+    i = tail_idx[-1] if tail_idx else None
+    while i is not None:
+        result.append(i)
+        i = prev[i]
+    result.reverse()
+    return result
+
+
+@dataclass
+class ChildPlan:
+    """Operations that turn one ordered list of row keys into another"""
+    removed: List[Hashable] = field(default_factory=list)   # Keys no longer in this container
+    moved: List[Hashable] = field(default_factory=list)     # Surviving keys that must change row
+    inserts: List[Tuple[int, Hashable]] = field(default_factory=list)  # (target row, key), ascending
+
+    @property
+    def is_noop(self) -> bool:
+        return not (self.removed or self.moved or self.inserts)
+
+
+def plan_children(old: List[Hashable], new: List[Hashable]) -> ChildPlan:
+    """
+    Plan the row operations for one container.
+
+    Apply by first taking out every removed and moved row (the rows left are
+    already in their final relative order), then inserting the moved and new
+    keys at their target rows in ascending order.
+    """
+    new_pos = {key: row for row, key in enumerate(new)}
+    old_set = set(old)
+    kept = [key for key in old if key in new_pos]
+    keep_rows = longest_increasing_subsequence([new_pos[key] for key in kept])
+    stay = {kept[i] for i in keep_rows}
+
+    plan = ChildPlan()
+    plan.removed = [key for key in old if key not in new_pos]
+    plan.moved = [key for key in kept if key not in stay]
+    moved = set(plan.moved)
+    plan.inserts = [(row, key) for row, key in enumerate(new) if key not in old_set or key in moved]
+    return plan
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Library Settings for Silence Suzuka Player
+
+Configuration for how the library is displayed, following the same pattern
+as VirtualPlaylistSettings.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class LibrarySettings:
+    """Library display configuration settings"""
+
+    # Show the library through LibraryModel/LibraryView instead of the
+    # QTreeWidget (context menu, selection actions and drag reordering
+    # included). Takes effect on the next start.
+    model_view_enabled: bool = False
+
+    # Build collapsed groups as a header only; children are created on first expand
+    lazy_group_children: bool = True
+    # Release the rows of a group collapsed this long (seconds, 0 = keep them)
+    release_collapsed_after_s: int = 0
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'model_view_enabled': self.model_view_enabled,
+            'lazy_group_children': self.lazy_group_children,
+            'release_collapsed_after_s': self.release_collapsed_after_s
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create from dictionary (JSON deserialization)"""
+        return cls(
+            model_view_enabled=data.get('model_view_enabled', False),
+            lazy_group_children=data.get('lazy_group_children', True),
+            release_collapsed_after_s=data.get('release_collapsed_after_s', 0)
+        )
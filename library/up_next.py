@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Up Next Queue for Silence Suzuka Player
+
+The Up Next panel shows the next few items of the playback order. Deriving
+that order means scanning the playlist for the current scope, so UpNextQueue
+caches it together with each index's position in it. Advancing the current
+index is then a dictionary lookup and a slice, and the panel can apply the
+difference between two windows instead of rebuilding its rows.
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+
+class UpNextQueue:
+    """
+    Cached playback order and the Up Next window derived from it.
+
+    The order is tagged with a signature (scope, playlist identity and size);
+    a different signature, or invalidate() after a reorder, makes the caller
+    recompute it.
+    """
+
+    def __init__(self, size: int = 5):
+        self.size = size
+        self.order: List[int] = []
+        self._position: Dict[int, int] = {}
+        self._signature: Optional[Hashable] = None
+        self.rebuilds = 0
+
+    def is_valid(self, signature: Hashable) -> bool:
+        return self._signature is not None and self._signature == signature
+
+    def set_order(self, order: Sequence[int], signature: Hashable):
+        """Cache a freshly computed playback order"""
+        self.order = list(order)
+        self._position = {idx: pos for pos, idx in enumerate(self.order)}
+        self._signature = signature
+        self.rebuilds += 1
+
+    def invalidate(self):
+        """Forget the order (the playlist or scope changed)"""
+        self._signature = None
+
+    def window(self, current_index: int, skip: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """
+        The next `size` indices after current_index in the playback order
+        (the start of the order if current_index is not in it). Indices for
+        which skip returns True are dropped after slicing.
+        """
+        pos = self._position.get(current_index)
+        start = pos + 1 if pos is not None else 0
+        upcoming = self.order[start:start + self.size]
+        if skip is not None:
+            upcoming = [i for i in upcoming if not skip(i)]
+        return upcoming
@@ -0,0 +1,23 @@
+"""
+Metadata Module for Silence Suzuka Player
+
+Provides library-wide metadata management: canonical media IDs, a
+persistent title cache, a resumable backfill job for durations, titles and
+thumbnails, lightweight per-site metadata lookups, a single-flight broker
+that shares one combined request per URL, an in-process streaming
+flat playlist fetcher and a TTL cache of flat playlist listings.
+"""
+
+from .settings import MetadataSettings
+from .ids import media_id_for_url, media_kind_for_url, playlist_id_for_url
+from .cache import MetadataCache, MetadataEntry
+from .backfill import BackfillJob, BackfillTask
+from .lightweight import fetch_lightweight_metadata
+from .broker import MetadataBroker
+from .flat_fetch import FlatPlaylistFetcher, flat_entry_to_item, iter_lazy_entries
+from .playlist_cache import PlaylistResponseCache
+
+__all__ = ['MetadataSettings', 'media_id_for_url', 'media_kind_for_url', 'playlist_id_for_url',
+           'MetadataCache', 'MetadataEntry', 'BackfillJob', 'BackfillTask', 'fetch_lightweight_metadata',
+           'MetadataBroker', 'FlatPlaylistFetcher', 'flat_entry_to_item', 'iter_lazy_entries',
+           'PlaylistResponseCache']
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Metadata Backfill Job for Silence Suzuka Player
+
+Persistent, resumable job that fills in missing durations, titles and
+thumbnails across the whole library. The job only schedules work; the player
+dispatches each task to the matching fetcher and reports results back.
+Progress is checkpointed to disk so a restart resumes where it left off.
+"""
+
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from .ids import media_id_for_url
+
+
+BACKFILL_FIELDS = ('duration', 'title', 'thumbnail')
+
+
+@dataclass
+class BackfillTask:
+    """A single field to fill in for one media item"""
+    field: str  # 'duration', 'title' or 'thumbnail'
+    url: str
+    kind: str  # 'youtube', 'bilibili' or 'local'
+    attempts: int = 0
+    dispatched_at: float = 0.0  # 0 while pending
+
+    @property
+    def key(self) -> str:
+        return f"{self.field}|{media_id_for_url(self.url)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'field': self.field,
+            'url': self.url,
+            'kind': self.kind,
+            'attempts': self.attempts
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BackfillTask':
+        return cls(
+            field=str(data.get('field', '')),
+            url=str(data.get('url', '')),
+            kind=str(data.get('kind', '')),
+            attempts=int(data.get('attempts', 0))
+        )
+
+
+class BackfillJob:
+    """
+    Checkpointed queue of metadata backfill tasks.
+
+    Features:
+    - One task per (field, media ID), so re-seeding never duplicates work
+    - Rolling per-minute rate limit and an in-flight cap
+    - Stale in-flight tasks are requeued, then dropped after max attempts
+    - ETA from measured completion throughput
+    - Atomic JSON checkpoints
+    """
+
+    # Completions older than this are ignored when measuring throughput
+    THROUGHPUT_WINDOW_S = 600
+    THROUGHPUT_SAMPLES = 50
+
+    def __init__(self, config_dir: Path, settings: Any = None):
+        self.config_dir = Path(config_dir)
+        self.state_file = self.config_dir / 'metadata_backfill.json'
+        self.settings = settings
+
+        self._pending: 'OrderedDict[str, BackfillTask]' = OrderedDict()
+        self._in_flight: Dict[str, BackfillTask] = {}
+
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.manual = False  # User-started runs ignore the idle-only rule
+
+        self._dispatch_times: Deque[float] = deque()
+        self._completion_times: Deque[float] = deque(maxlen=self.THROUGHPUT_SAMPLES)
+        self._dirty = False
+        self._last_checkpoint = time.time()
+
+        self.load()
+
+    # --- Queue management ---
+
+    def add(self, field: str, url: str, kind: str) -> bool:
+        """Queue a field for backfill. Returns False if already queued."""
+        if field not in BACKFILL_FIELDS or not url:
+            return False
+        task = BackfillTask(field=field, url=url, kind=kind or '')
+        key = task.key
+        if key in self._pending or key in self._in_flight:
+            return False
+        self._pending[key] = task
+        self.total += 1
+        self._dirty = True
+        return True
+
+    def next_batch(self, limit: Optional[int] = None, now: Optional[float] = None) -> List[BackfillTask]:
+        """
+        Pop the next tasks to dispatch, honouring the rate limit and in-flight cap.
+        Returned tasks are moved to the in-flight set.
+        """
+        now = now if now is not None else time.time()
+
+        # Drop dispatch timestamps outside the rolling minute
+        while self._dispatch_times and now - self._dispatch_times[0] > 60:
+            self._dispatch_times.popleft()
+
+        rate = max(1, int(getattr(self.settings, 'backfill_rate_per_minute', 30)))
+        max_in_flight = max(1, int(getattr(self.settings, 'backfill_max_in_flight', 4)))
+
+        budget = min(rate - len(self._dispatch_times), max_in_flight - len(self._in_flight))
+        if limit is not None:
+            budget = min(budget, limit)
+
+        batch = []
+        while budget > 0 and self._pending:
+            key, task = self._pending.popitem(last=False)
+            task.dispatched_at = now
+            task.attempts += 1
+            self._in_flight[key] = task
+            self._dispatch_times.append(now)
+            batch.append(task)
+            budget -= 1
+
+        if batch:
+            self._dirty = True
+        return batch
+
+    def mark_done(self, field: str, url: str, success: bool = True, now: Optional[float] = None) -> bool:
+        """
+        Record the outcome of a task. Unknown tasks are ignored so callers can
+        report every result without checking whether the job asked for it.
+        """
+        key = f"{field}|{media_id_for_url(url)}"
+        task = self._in_flight.pop(key, None)
+        if task is None:
+            # Satisfied by someone else before we dispatched it
+            task = self._pending.pop(key, None)
+            if task is None:
+                return False
+
+        now = now if now is not None else time.time()
+        if success:
+            self.completed += 1
+            self._completion_times.append(now)
+        else:
+            max_attempts = max(1, int(getattr(self.settings, 'backfill_max_attempts', 3)))
+            if task.attempts < max_attempts:
+                task.dispatched_at = 0.0
+                self._pending[key] = task  # Retry at the back of the queue
+            else:
+                self.failed += 1
+
+        self._dirty = True
+        self._maybe_finish()
+        return True
+
+    def requeue_stale(self, now: Optional[float] = None) -> int:
+        """Return in-flight tasks that never reported back to the queue"""
+        now = now if now is not None else time.time()
+        timeout = max(10, int(getattr(self.settings, 'backfill_task_timeout_s', 120)))
+        stale = [t for t in self._in_flight.values() if now - t.dispatched_at > timeout]
+        for task in stale:
+            self.mark_done(task.field, task.url, success=False, now=now)
+        return len(stale)
+
+    def discard(self, url: str):
+        """Forget every task for a URL (e.g. the item was removed)"""
+        for field in BACKFILL_FIELDS:
+            key = f"{field}|{media_id_for_url(url)}"
+            if self._pending.pop(key, None) or self._in_flight.pop(key, None):
+                self.total = max(0, self.total - 1)
+                self._dirty = True
+        self._maybe_finish()
+
+    def clear(self):
+        """Cancel the job and remove its checkpoint"""
+        self._pending.clear()
+        self._in_flight.clear()
+        self.total = self.completed = self.failed = 0
+        self.manual = False
+        self._completion_times.clear()
+        self._dirty = False
+        try:
+            if self.state_file.exists():
+                self.state_file.unlink()
+        except Exception as e:
+            print(f"Metadata Backfill: Failed to remove checkpoint: {e}")
+
+    def _maybe_finish(self):
+        if not self._pending and not self._in_flight:
+            self.manual = False
+
+    # --- Progress reporting ---
+
+    def is_active(self) -> bool:
+        return bool(self._pending or self._in_flight)
+
+    def remaining(self) -> int:
+        return len(self._pending) + len(self._in_flight)
+
+    def throughput(self, now: Optional[float] = None) -> float:
+        """Measured completions per second over the recent window"""
+        now = now if now is not None else time.time()
+        samples = [t for t in self._completion_times if now - t <= self.THROUGHPUT_WINDOW_S]
+        if len(samples) < 2:
+            return 0.0
+        span = samples[-1] - samples[0]
+        if span <= 0:
+            return 0.0
+        return (len(samples) - 1) / span
+
+    def eta_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """Estimated seconds to completion, or None until throughput is known"""
+        rate = self.throughput(now)
+        if rate <= 0:
+            return None
+        return self.remaining() / rate
+
+    def progress(self) -> Dict[str, Any]:
+        by_field = {field: 0 for field in BACKFILL_FIELDS}
+        for task in list(self._pending.values()) + list(self._in_flight.values()):
+            by_field[task.field] = by_field.get(task.field, 0) + 1
+        return {
+            'total': self.total,
+            'completed': self.completed,
+            'failed': self.failed,
+            'remaining': self.remaining(),
+            'in_flight': len(self._in_flight),
+            'remaining_by_field': by_field,
+            'throughput': self.throughput(),
+            'eta_seconds': self.eta_seconds(),
+            'manual': self.manual
+        }
+
+    # --- Persistence ---
+
+    def load(self):
+        """Restore the job from its checkpoint. In-flight work is requeued."""
+        if not self.state_file.exists():
+            return
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            for entry in data.get('tasks', []):
+                try:
+                    task = BackfillTask.from_dict(entry)
+                except Exception:
+                    continue  # Skip corrupted entries
+                if task.field in BACKFILL_FIELDS and task.url:
+                    self._pending[task.key] = task
+
+            self.total = int(data.get('total', len(self._pending)))
+            self.completed = int(data.get('completed', 0))
+            self.failed = int(data.get('failed', 0))
+            # A restored job always resumes as automatic, low-priority work
+            self.manual = False
+
+        except Exception as e:
+            print(f"Metadata Backfill: Failed to load checkpoint: {e}")
+            self._pending.clear()
+
+    def checkpoint(self, force: bool = False):
+        """Persist unfinished tasks if anything changed since the last checkpoint"""
+        if not force and not self._dirty:
+            return
+
+        if not self.is_active():
+            # Nothing left to resume
+            if self.state_file.exists():
+                try:
+                    self.state_file.unlink()
+                except Exception:
+                    pass
+            self._dirty = False
+            return
+
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+
+            tasks = [t.to_dict() for t in self._in_flight.values()]
+            tasks.extend(t.to_dict() for t in self._pending.values())
+
+            data = {
+                'tasks': tasks,
+                'total': self.total,
+                'completed': self.completed,
+                'failed': self.failed,
+                'last_updated': time.time(),
+                'version': '1.0'
+            }
+
+            # Atomic write using temporary file
+            temp_file = self.state_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            temp_file.replace(self.state_file)
+
+            self._dirty = False
+            self._last_checkpoint = time.time()
+
+        except Exception as e:
+            print(f"Metadata Backfill: Failed to save checkpoint: {e}")
+
+    def maybe_checkpoint(self, now: Optional[float] = None):
+        """Checkpoint if the configured interval has elapsed"""
+        now = now if now is not None else time.time()
+        interval = max(5, int(getattr(self.settings, 'backfill_checkpoint_interval_s', 30)))
+        if self._dirty and now - self._last_checkpoint >= interval:
+            self.checkpoint()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Metadata Broker for Silence Suzuka Player
+
+One combined metadata request per URL (title, duration, thumbnail URL and
+uploader), shared by every consumer. Concurrent requests for the same media
+ID wait on the request already in flight instead of extracting again, and
+recent results are kept briefly so consumers asking one after another
+(title worker, duration worker, thumbnail fetcher) reuse them.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from .ids import media_id_for_url, media_kind_for_url
+from .lightweight import fetch_lightweight_metadata
+
+
+METADATA_FIELDS = ('title', 'duration', 'thumbnail', 'uploader')
+
+
+class _Flight:
+    """A request in progress for one media ID"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+def _covers(meta: Optional[Dict[str, Any]], need: Iterable[str]) -> bool:
+    return bool(meta) and all(meta.get(f) for f in need)
+
+
+class MetadataBroker(QObject):
+    """
+    Single-flight metadata fetcher keyed by canonical media ID.
+
+    Features:
+    - Site shortcuts when they cover the requested fields, else one
+      unprocessed yt-dlp extraction that yields every field at once
+    - Concurrent callers for the same ID share one request
+    - Short-lived memo of recent results
+    - metadataReady fans each fetched result out to listeners
+    """
+
+    metadataReady = Signal(str, object)  # url, {'title', 'duration', 'thumbnail', 'uploader'}
+
+    RECENT_TTL_S = 600
+    RECENT_MAX = 500
+
+    def __init__(self, cookie_files: Optional[Dict[str, str]] = None, socket_timeout: int = 30,
+                 wait_timeout: float = 60, parent=None):
+        super().__init__(parent)
+        self.cookie_files = cookie_files or {}
+        self.socket_timeout = socket_timeout
+        self.wait_timeout = wait_timeout
+
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._recent: 'OrderedDict[str, tuple]' = OrderedDict()  # media_id -> (timestamp, meta)
+        self._idle: Dict[str, List[Any]] = {}  # kind -> YoutubeDL instances not in use
+        self._stats = {
+            'fetches': 0,
+            'shared': 0,
+            'recent_hits': 0
+        }
+
+    def fetch(self, url: str, kind: Optional[str] = None, need: Iterable[str] = METADATA_FIELDS) -> Optional[Dict[str, Any]]:
+        """
+        Return metadata for url covering the fields in need, fetching at most
+        once per media ID. Blocks; call from worker threads only.
+        """
+        if not url:
+            return None
+        kind = kind or media_kind_for_url(url)
+        need = tuple(need)
+        key = media_id_for_url(url)
+
+        with self._lock:
+            recent = self._get_recent(key)
+            if _covers(recent, need):
+                self._stats['recent_hits'] += 1
+                return dict(recent)
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait(self.wait_timeout)
+            if _covers(flight.result, need):
+                with self._lock:
+                    self._stats['shared'] += 1
+                return dict(flight.result)
+            # The shared request didn't cover what we need; fetch on our own
+            return self._fetch(url, kind, need, recent)
+
+        result = None
+        try:
+            result = self._fetch(url, kind, need, recent)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if result:
+                    self._recent[key] = (time.time(), result)
+                    self._recent.move_to_end(key)
+                    while len(self._recent) > self.RECENT_MAX:
+                        self._recent.popitem(last=False)
+            flight.result = result
+            flight.event.set()
+
+        if result:
+            self.metadataReady.emit(url, dict(result))
+        return dict(result) if result else None
+
+    def _get_recent(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recent result for key, if still fresh (lock held)"""
+        entry = self._recent.get(key)
+        if not entry:
+            return None
+        timestamp, meta = entry
+        if time.time() - timestamp > self.RECENT_TTL_S:
+            del self._recent[key]
+            return None
+        return meta
+
+    def _fetch(self, url: str, kind: str, need: tuple, known: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._stats['fetches'] += 1
+
+        meta = dict(known or {})
+        shortcut = fetch_lightweight_metadata(url, kind)
+        if shortcut:
+            meta.update({k: v for k, v in shortcut.items() if v})
+        if _covers(meta, need):
+            return meta
+
+        # process=False runs the extractor (page + API data) but skips format
+        # selection, which is enough for every metadata field we use
+        ydl = self._acquire_ydl(kind)
+        try:
+            info = ydl.extract_info(url, download=False, process=False)
+        finally:
+            self._release_ydl(kind, ydl)
+        if not isinstance(info, dict):
+            return meta or None
+
+        thumb = info.get('thumbnail')
+        if not thumb and info.get('thumbnails'):
+            thumb = (info['thumbnails'][-1] or {}).get('url')
+        extracted = {
+            'title': info.get('title'),
+            'duration': int(info.get('duration') or 0) or None,
+            'thumbnail': thumb,
+            'uploader': info.get('uploader'),
+        }
+        meta.update({k: v for k, v in extracted.items() if v})
+        return meta or None
+
+    def _acquire_ydl(self, kind: str):
+        """
+        Take an idle YoutubeDL for kind (or create one); hand it back with
+        _release_ydl. Each instance is used by one thread at a time, but the
+        pool outlives the worker threads, so retired workers don't take warm
+        extractors with them.
+        """
+        with self._lock:
+            idle = self._idle.get(kind)
+            if idle:
+                return idle.pop()
+
+        import yt_dlp
+        opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'socket_timeout': self.socket_timeout,
+            'retries': 2,
+            'extract_flat': 'in_playlist',
+        }
+        if self.cookie_files.get(kind):
+            opts['cookiefile'] = str(self.cookie_files[kind])
+        return yt_dlp.YoutubeDL(opts)
+
+    def _release_ydl(self, kind: str, ydl):
+        with self._lock:
+            self._idle.setdefault(kind, []).append(ydl)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._flights), recent=len(self._recent))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Metadata Cache for Silence Suzuka Player
+
+Persistent cache of titles, uploaders and thumbnail URLs keyed by canonical
+media ID, so items that are removed and re-added, restored from saved
+playlists or delivered by subscriptions never trigger a second lookup.
+"""
+
+import json
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Any
+from dataclasses import dataclass
+
+from library.persistence import BackgroundJsonWriter
+
+from .ids import media_id_for_url
+
+
+@dataclass
+class MetadataEntry:
+    """Cached metadata for one media item"""
+    title: Optional[str] = None
+    uploader: Optional[str] = None
+    thumbnail: Optional[str] = None
+    fetched_at: float = 0.0  # When last updated (Unix timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'title': self.title,
+            'uploader': self.uploader,
+            'thumbnail': self.thumbnail,
+            'fetched_at': self.fetched_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetadataEntry':
+        return cls(
+            title=data.get('title'),
+            uploader=data.get('uploader'),
+            thumbnail=data.get('thumbnail'),
+            fetched_at=float(data.get('fetched_at', 0))
+        )
+
+
+class MetadataCache:
+    """
+    Persistent metadata cache keyed by canonical media ID.
+
+    Features:
+    - Media ID keys, so URL variants of one video share an entry
+    - Partial updates merge into the existing entry
+    - Automatic expiration and size limits (oldest first)
+    - Entries kept in fetched_at order, so eviction pops from the front
+    - Writes happen on a background writer thread
+    - Thread-safe operations
+    - Statistics tracking
+    """
+
+    # Write to disk after this many changes; save() flushes the rest
+    SAVE_EVERY = 25
+
+    def __init__(self, config_dir: Path, settings: Any = None):
+        self.config_dir = Path(config_dir)
+        self.cache_file = self.config_dir / 'metadata_cache.json'
+        self.settings = settings
+        # Ordered oldest fetched_at first; set() moves updated entries to the end
+        self._cache: 'OrderedDict[str, MetadataEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._writer = BackgroundJsonWriter(self.cache_file, name='metadata-cache-writer')
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evicted': 0
+        }
+        self._load_cache()
+
+    def _enabled(self) -> bool:
+        return bool(self.settings and self.settings.cache_enabled)
+
+    def _is_expired(self, entry: MetadataEntry, now: float) -> bool:
+        max_age_days = self.settings.cache_max_age_days if self.settings else 0
+        return max_age_days > 0 and now - entry.fetched_at > max_age_days * 24 * 3600
+
+    def _load_cache(self):
+        """Load cache from persistent storage"""
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            now = time.time()
+            entries = []
+            for key, entry_data in data.get('cache', {}).items():
+                try:
+                    entry = MetadataEntry.from_dict(entry_data)
+                except Exception:
+                    # Skip corrupted entries
+                    continue
+                if self._is_expired(entry, now):
+                    self._stats['expired'] += 1
+                    continue
+                entries.append((key, entry))
+            entries.sort(key=lambda x: x[1].fetched_at)
+            self._cache = OrderedDict(entries)
+
+            self._stats.update(data.get('stats', {}))
+
+        except Exception as e:
+            print(f"Metadata Cache: Failed to load cache: {e}")
+            self._cache = OrderedDict()
+
+    def _save_cache(self):
+        """Snapshot the cache and hand it to the background writer"""
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+
+            with self._lock:
+                data = {
+                    'cache': {key: entry.to_dict() for key, entry in self._cache.items()},
+                    'stats': dict(self._stats),
+                    'last_updated': time.time(),
+                    'version': '1.0'
+                }
+                self._unsaved = 0
+
+            self._writer.submit(data)
+
+        except Exception as e:
+            print(f"Metadata Cache: Failed to save cache: {e}")
+
+    def _enforce_size_limit(self):
+        """Drop the oldest entries beyond the configured maximum (lock held)"""
+        max_entries = self.settings.cache_max_entries if self.settings else 0
+        while max_entries > 0 and len(self._cache) > max_entries:
+            self._cache.popitem(last=False)
+            self._stats['evicted'] += 1
+
+    def get(self, url: str) -> Optional[MetadataEntry]:
+        """
+        Get cached metadata for URL.
+
+        Returns:
+            MetadataEntry, or None if not cached or expired
+        """
+        if not url or not self._enabled():
+            return None
+
+        key = media_id_for_url(url)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if self._is_expired(entry, time.time()):
+                del self._cache[key]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            return entry
+
+    def get_title(self, url: str) -> Optional[str]:
+        entry = self.get(url)
+        return entry.title if entry else None
+
+    def set(self, url: str, title: Optional[str] = None, uploader: Optional[str] = None,
+            thumbnail: Optional[str] = None):
+        """
+        Cache metadata for URL. Fields left as None keep their cached value.
+        """
+        if not url or not self._enabled():
+            return
+
+        key = media_id_for_url(url)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and all(
+                    value is None or value == current
+                    for value, current in ((title or None, entry.title),
+                                           (uploader or None, entry.uploader),
+                                           (thumbnail or None, entry.thumbnail))):
+                # Nothing new (e.g. a title that came from this cache); keep
+                # the entry's age and don't schedule a write
+                return
+            entry = entry or MetadataEntry()
+            if title:
+                entry.title = title
+            if uploader:
+                entry.uploader = uploader
+            if thumbnail:
+                entry.thumbnail = thumbnail
+            entry.fetched_at = time.time()
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            self._enforce_size_limit()
+            self._unsaved += 1
+            should_save = self._unsaved >= self.SAVE_EVERY
+
+        if should_save:
+            self._save_cache()
+
+    def remove(self, url: str):
+        """Remove URL from cache"""
+        if not url:
+            return
+        with self._lock:
+            self._cache.pop(media_id_for_url(url), None)
+
+    def clear(self):
+        """Clear all cache entries"""
+        with self._lock:
+            self._cache.clear()
+            self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+        self._save_cache()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total_requests = self._stats['hits'] + self._stats['misses']
+        hit_rate = (self._stats['hits'] / total_requests) if total_requests > 0 else 0
+
+        return {
+            'entries': len(self._cache),
+            'hits': self._stats['hits'],
+            'misses': self._stats['misses'],
+            'hit_rate': hit_rate,
+            'expired': self._stats['expired'],
+            'evicted': self._stats['evicted'],
+            'cache_file_exists': self.cache_file.exists()
+        }
+
+    def save(self, timeout: Optional[float] = 5.0):
+        """Explicitly save cache to disk, waiting for the write to finish"""
+        if self._unsaved:
+            self._save_cache()
+        self._writer.flush(timeout)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Flat Playlist Fetching for Silence Suzuka Player
+
+In-process replacement for running `yt-dlp --flat-playlist --dump-single-json`
+as a subprocess. Extractor instances are kept in a shared pool and reused by
+whichever thread fetches next, entries are consumed lazily as the extractor pages through the playlist, and
+callers can stop early (e.g. once a subscription check reaches videos it has
+already seen).
+"""
+
+import time
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .ids import media_kind_for_url
+
+
+def iter_lazy_entries(entries, page_size: int = 100) -> Iterator[Any]:
+    """Iterate playlist entries lazily, whichever container the extractor returned"""
+    if entries is None:
+        return
+    if hasattr(entries, 'getslice'):
+        # PagedList: fetch page by page instead of materializing the whole list
+        start = 0
+        while True:
+            page = entries.getslice(start, start + page_size)
+            if not page:
+                return
+            yield from page
+            if len(page) < page_size:
+                return
+            start += page_size
+    else:
+        yield from entries
+
+
+def flat_entry_to_item(entry: Dict[str, Any], kind: str, playlist_title: str,
+                       playlist_key: str, playlist_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Convert one flat playlist entry into a playlist item.
+
+    Returns:
+        Item dict with 'title', 'url', 'type', 'playlist', 'playlist_key',
+        'playlist_url', 'needs_title' and, when the entry reports them,
+        'duration' and 'uploader'; None when the entry has no usable URL.
+    """
+    video_id = entry.get('id') or ''
+    video_url = entry.get('url') or entry.get('webpage_url') or ''
+
+    # Build proper URLs (some extractors put the bare ID in 'url')
+    if kind == 'youtube' and not video_url.startswith('http'):
+        bare_id = video_id or video_url
+        video_url = f"https://www.youtube.com/watch?v={bare_id}" if bare_id else ''
+    elif kind == 'bilibili' and not video_url.startswith('http'):
+        bare_id = video_id or video_url
+        video_url = f"https://www.bilibili.com/video/{bare_id}" if bare_id else ''
+
+    if not video_url:
+        return None
+
+    title = entry.get('title') or entry.get('alt_title') or 'Unknown'
+    if kind == 'bilibili':
+        # Check for various "no title" indicators
+        if title in ('Unknown', 'NO TITLE', video_id) or title.lower() in ('unknown', 'no title'):
+            # Create a loading title that will trigger resolution
+            title = f"[Loading Title...] {video_id or video_url}"
+
+    item = {
+        'title': title,
+        'url': video_url,
+        'type': kind,
+        'playlist': playlist_title,
+        'playlist_key': playlist_key,
+        'playlist_url': playlist_url,
+        'needs_title': title.startswith('[Loading Title...]') or title == 'Unknown'
+    }
+
+    try:
+        duration = int(entry.get('duration') or 0)
+    except (TypeError, ValueError):
+        duration = 0
+    if duration > 0:
+        item['duration'] = duration
+    uploader = entry.get('uploader') or entry.get('channel')
+    if uploader:
+        item['uploader'] = uploader
+    return item
+
+
+class FlatPlaylistFetcher:
+    """
+    Streams flat playlist entries with pooled, reused yt-dlp instances.
+
+    Features:
+    - No interpreter startup or JSON round trip per call
+    - Idle YoutubeDL instances are shared between threads; each is used by
+      one fetch at a time
+    - Entries are yielded while later pages are still being fetched
+    - Early termination via stop_when / should_stop / limit
+    - Keeps duration and uploader from flat entries
+    """
+
+    # url/url_transparent results followed before giving up on a listing
+    MAX_REDIRECTS = 3
+
+    def __init__(self, cookie_files: Optional[Dict[str, Any]] = None, socket_timeout: int = 30):
+        self.cookie_files = cookie_files or {}
+        self.socket_timeout = socket_timeout
+        self._idle: Dict[str, List[Any]] = {}  # kind -> YoutubeDL instances not in use
+        self._lock = threading.Lock()
+
+    def _acquire_ydl(self, kind: str):
+        """Take an idle YoutubeDL for kind (or create one); hand it back with _release_ydl"""
+        with self._lock:
+            idle = self._idle.get(kind)
+            if idle:
+                return idle.pop()
+
+        import yt_dlp
+        opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'extract_flat': 'in_playlist',
+            'socket_timeout': self.socket_timeout,
+            'retries': 2,
+            'ignoreerrors': True,
+        }
+        cookie_file = self.cookie_files.get(kind)
+        if cookie_file and Path(cookie_file).exists():
+            opts['cookiefile'] = str(cookie_file)
+        return yt_dlp.YoutubeDL(opts)
+
+    def _release_ydl(self, kind: str, ydl):
+        with self._lock:
+            self._idle.setdefault(kind, []).append(ydl)
+
+    def iter_items(self, url: str, kind: Optional[str] = None,
+                   stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                   should_stop: Optional[Callable[[], bool]] = None,
+                   limit: Optional[int] = None,
+                   timeout: Optional[float] = None,
+                   info_out: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield playlist items in playlist order.
+
+        Args:
+            stop_when: Called with each item; iteration ends (without yielding
+                that item) as soon as it returns True.
+            should_stop: Polled between entries for cooperative cancellation.
+            limit: Maximum number of items to yield.
+            timeout: Stop yielding once this many seconds have passed.
+            info_out: Receives 'playlist_count' (when the site reports it)
+                and 'complete', True only if the listing was read to the end.
+
+        Raises:
+            Whatever the extractor raises for the playlist page itself, or
+            RuntimeError when it returns nothing for it or a result without
+            entries (after following url/url_transparent redirects).
+        """
+        kind = kind or media_kind_for_url(url)
+        if kind not in ('youtube', 'bilibili'):
+            kind = 'youtube'
+        started = time.monotonic()
+
+        # The instance stays checked out until the generator finishes, since
+        # later pages are fetched through it while entries are consumed
+        ydl = self._acquire_ydl(kind)
+        try:
+            yield from self._iter_with(ydl, url, kind, started, stop_when, should_stop, limit, timeout, info_out)
+        finally:
+            self._release_ydl(kind, ydl)
+
+    def _iter_with(self, ydl, url, kind, started, stop_when, should_stop, limit, timeout, info_out):
+        info = ydl.extract_info(url, download=False, process=False)
+        outer_title = None
+        # Without processing, channel/handle redirects and youtu.be links
+        # with a list come back as url results; resolve them ourselves
+        for _ in range(self.MAX_REDIRECTS):
+            if not isinstance(info, dict) or info.get('_type') not in ('url', 'url_transparent'):
+                break
+            if not info.get('url'):
+                break
+            if info.get('_type') == 'url_transparent':
+                outer_title = outer_title or info.get('title')
+            info = ydl.extract_info(info['url'], download=False, process=False, ie_key=info.get('ie_key'))
+        if info is None:
+            # ignoreerrors turns a failed playlist page into None; that is an
+            # error for the caller, not an empty listing
+            raise RuntimeError(f"No playlist data for {url}")
+        if not isinstance(info, dict) or info.get('entries') is None:
+            # A single video or an unresolved redirect is not a (complete) listing
+            raise RuntimeError(f"No playlist entries for {url}")
+
+        playlist_title = info.get('title') or outer_title or 'Unknown Playlist'
+        playlist_key = info.get('id', url)
+        if info_out is not None:
+            info_out['playlist_count'] = info.get('playlist_count')
+            info_out['complete'] = False
+        count = 0
+        for entry in iter_lazy_entries(info.get('entries')):
+            if should_stop and should_stop():
+                return
+            if timeout is not None and time.monotonic() - started > timeout:
+                print(f"[BatchFetch] Timeout for {url} after {count} entries")
+                return
+            if not isinstance(entry, dict):
+                continue
+            try:
+                item = flat_entry_to_item(entry, kind, playlist_title, playlist_key, url)
+            except Exception:
+                continue  # Skip bad entries
+            if not item:
+                continue
+            if stop_when and stop_when(item):
+                return
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+        if info_out is not None:
+            info_out['complete'] = True
+
+    def fetch(self, url: str, kind: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        """Collect iter_items() into a list; extractor errors propagate to the caller"""
+        return list(self.iter_items(url, kind, **kwargs))
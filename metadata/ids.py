@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Media ID helpers for Silence Suzuka Player
+
+Canonical media IDs give every metadata consumer (backfill job, caches,
+lookups) the same key for a video regardless of which URL variant was added.
+"""
+
+import os
+import re
+from urllib.parse import urlparse, parse_qs, unquote
+
+
+_BILIBILI_ID_RE = re.compile(r'/video/((?:BV|bv)[0-9A-Za-z]+|av\d+)')
+
+
+def media_kind_for_url(url: str) -> str:
+    """Return 'youtube', 'bilibili' or 'local' for a playlist URL"""
+    lo = (url or '').lower()
+    if 'youtube.com' in lo or 'youtu.be' in lo:
+        return 'youtube'
+    if 'bilibili.com' in lo or 'b23.tv' in lo:
+        return 'bilibili'
+    return 'local'
+
+
+def media_id_for_url(url: str) -> str:
+    """
+    Return a canonical media ID such as 'youtube:dQw4w9WgXcQ',
+    'bilibili:BV1xx411c7mD' or 'local:/abs/path.mp4'.
+
+    Falls back to the stripped URL when no ID can be extracted.
+    """
+    if not url:
+        return ''
+
+    try:
+        kind = media_kind_for_url(url)
+
+        if kind == 'youtube':
+            parsed = urlparse(url)
+            if 'youtu.be' in url.lower():
+                video_id = parsed.path.strip('/').split('/')[0]
+            elif parsed.path.startswith('/shorts/'):
+                video_id = parsed.path.split('/')[2] if len(parsed.path.split('/')) > 2 else ''
+            else:
+                video_id = (parse_qs(parsed.query).get('v') or [''])[0]
+            if video_id:
+                return f"youtube:{video_id}"
+
+        elif kind == 'bilibili':
+            m = _BILIBILI_ID_RE.search(url)
+            if m:
+                video_id = m.group(1)
+                if video_id.lower().startswith('bv'):
+                    video_id = 'BV' + video_id[2:]
+                # Multi-part videos are distinct items
+                page = (parse_qs(urlparse(url).query).get('p') or [''])[0]
+                if page and page != '1':
+                    return f"bilibili:{video_id}?p={page}"
+                return f"bilibili:{video_id}"
+
+        else:
+            path = url
+            if url.startswith('file://'):
+                path = unquote(urlparse(url).path)
+                # Windows path fix
+                if os.name == 'nt' and path.startswith('/'):
+                    path = path[1:]
+            try:
+                path = os.path.normcase(os.path.abspath(path))
+            except Exception:
+                pass
+            return f"local:{path}"
+
+        return url.strip().rstrip('/')
+
+    except Exception:
+        return url
+
+
+_BILIBILI_SPACE_RE = re.compile(r'space\.bilibili\.com/(\d+)(/[^?#]*)?', re.I)
+
+
+def playlist_id_for_url(url: str) -> str:
+    """
+    Return a canonical playlist/channel ID such as 'youtube:list:PLxxxx',
+    'youtube:channel:@name/videos' or 'bilibili:space:123/favlist?fid=1'.
+
+    Falls back to the URL without scheme, 'www.' and trailing slash.
+    """
+    if not url:
+        return ''
+
+    try:
+        parsed = urlparse(url.strip())
+        query = parse_qs(parsed.query)
+        kind = media_kind_for_url(url)
+
+        if kind == 'youtube':
+            list_id = (query.get('list') or [''])[0]
+            if list_id:
+                return f"youtube:list:{list_id}"
+            path = parsed.path.rstrip('/')
+            if path:
+                return f"youtube:channel:{path.lstrip('/')}"
+
+        elif kind == 'bilibili':
+            m = _BILIBILI_SPACE_RE.search(url)
+            if m:
+                sub_path = (m.group(2) or '').rstrip('/')
+                # Favourite lists and series are selected by query parameters
+                selectors = '&'.join(f"{k}={query[k][0]}" for k in sorted(query)
+                                     if k in ('fid', 'sid', 'series_id', 'season_id'))
+                key = f"bilibili:space:{m.group(1)}{sub_path}"
+                return f"{key}?{selectors}" if selectors else key
+            list_id = (query.get('list') or [''])[0]
+            if list_id:
+                return f"bilibili:list:{list_id}"
+
+        host = parsed.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        rest = parsed.path.rstrip('/') + (f"?{parsed.query}" if parsed.query else '')
+        return f"{host}{rest}" if host else url.strip().rstrip('/')
+
+    except Exception:
+        return url
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Lightweight metadata lookups for Silence Suzuka Player
+
+Site-level shortcuts that return title, uploader and thumbnail for a single
+video with one small JSON request instead of a full yt-dlp extraction
+(watch page, player JS and format resolution). Callers fall back to yt-dlp
+when a shortcut returns None.
+"""
+
+import json
+import urllib.request
+from urllib.parse import urlencode, urlparse, parse_qs
+from typing import Any, Dict, Optional
+
+from .ids import media_id_for_url, media_kind_for_url
+
+
+_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+               '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+
+def _get_json(url: str, timeout: float, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    req = urllib.request.Request(url, headers={'User-Agent': _USER_AGENT, **(headers or {})})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        if resp.status != 200:
+            return None
+        return json.loads(resp.read().decode('utf-8'))
+
+
+def _youtube_oembed(url: str, timeout: float) -> Optional[Dict[str, Any]]:
+    media_id = media_id_for_url(url)
+    if not media_id.startswith('youtube:'):
+        return None
+    video_id = media_id.split(':', 1)[1]
+    canonical = f"https://www.youtube.com/watch?v={video_id}"
+    data = _get_json(f"https://www.youtube.com/oembed?{urlencode({'url': canonical, 'format': 'json'})}", timeout)
+    if not data or not data.get('title'):
+        return None
+    return {
+        'title': data.get('title'),
+        'uploader': data.get('author_name'),
+        # oEmbed thumbnails are the small hqdefault variant, which is all the UI needs
+        'thumbnail': data.get('thumbnail_url') or f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+    }
+
+
+def _bilibili_view(url: str, timeout: float) -> Optional[Dict[str, Any]]:
+    media_id = media_id_for_url(url)
+    if not media_id.startswith('bilibili:') or '?p=' in media_id:
+        # Multi-part titles are composed by yt-dlp; leave those to the full path
+        return None
+    video_id = media_id.split(':', 1)[1]
+    if video_id.startswith('BV'):
+        query = {'bvid': video_id}
+    elif video_id.startswith('av'):
+        query = {'aid': video_id[2:]}
+    else:
+        return None
+
+    data = _get_json(
+        f"https://api.bilibili.com/x/web-interface/view?{urlencode(query)}",
+        timeout,
+        headers={'Referer': 'https://www.bilibili.com/'}
+    )
+    if not data or data.get('code') != 0:
+        return None
+    view = data.get('data') or {}
+    if not view.get('title'):
+        return None
+    return {
+        'title': view.get('title'),
+        'uploader': (view.get('owner') or {}).get('name'),
+        'thumbnail': view.get('pic'),
+        'duration': int(view.get('duration') or 0) or None,
+    }
+
+
+def fetch_lightweight_metadata(url: str, kind: Optional[str] = None, timeout: float = 10) -> Optional[Dict[str, Any]]:
+    """
+    Resolve basic metadata for a single video without a full extraction.
+
+    Returns:
+        Dict with 'title', 'uploader', 'thumbnail' (and 'duration' where the
+        site reports it), or None when no shortcut applies or the lookup failed.
+    """
+    if not url:
+        return None
+
+    kind = kind or media_kind_for_url(url)
+    try:
+        if kind == 'youtube':
+            # Playlist-only URLs have no single video to describe
+            parsed = urlparse(url)
+            if 'list' in parse_qs(parsed.query) and 'v' not in parse_qs(parsed.query):
+                return None
+            return _youtube_oembed(url, timeout)
+        if kind == 'bilibili':
+            return _bilibili_view(url, timeout)
+    except Exception:
+        # Any network or parse problem means "use the full path"
+        return None
+    return None
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Playlist Response Cache for Silence Suzuka Player
+
+Local cache of flat playlist and channel listings keyed by canonical
+playlist ID, so re-adding a playlist, opening a channel twice or checking a
+subscription right after adding it reuses the previous listing. Entries are
+fresh for a configurable TTL; after that a caller can revalidate one by
+fetching only the first page and comparing it (and the reported entry count)
+with what was cached.
+"""
+
+import json
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from library.persistence import BackgroundJsonWriter
+
+from .ids import media_id_for_url, playlist_id_for_url
+
+
+class PlaylistResponseCache:
+    """
+    Size-bounded TTL cache of flat playlist listings.
+
+    Features:
+    - Canonical playlist ID keys (URL variants share an entry)
+    - LRU eviction by entry count and by total cached items
+    - Conditional revalidation from the first page of a stale listing
+    - Coalesced background writes and hit/miss statistics
+    """
+
+    def __init__(self, config_dir: Path, settings: Any = None):
+        self.config_dir = Path(config_dir)
+        self.cache_file = self.config_dir / 'playlist_cache.json'
+        self.settings = settings
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = False
+        self._writer = BackgroundJsonWriter(self.cache_file, name='playlist-cache-writer')
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'changed': 0,
+            'evicted': 0
+        }
+        self._load_cache()
+
+    # --- Settings ---
+
+    def enabled(self) -> bool:
+        return bool(self.settings and self.settings.playlist_cache_enabled)
+
+    @property
+    def ttl_s(self) -> float:
+        return self.settings.playlist_cache_ttl_s if self.settings else 0
+
+    @property
+    def revalidate_depth(self) -> int:
+        return self.settings.playlist_cache_revalidate_depth if self.settings else 20
+
+    # --- Persistence ---
+
+    def _load_cache(self):
+        """Load cache from persistent storage"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = data.get('cache', {})
+            # Stored oldest-used first, which is the LRU order
+            for key, entry in entries.items():
+                if isinstance(entry, dict) and isinstance(entry.get('items'), list):
+                    self._cache[key] = entry
+            self._stats.update(data.get('stats', {}))
+        except Exception as e:
+            print(f"Playlist Cache: Failed to load cache: {e}")
+            self._cache = OrderedDict()
+
+    def _save_cache(self):
+        """Snapshot the cache and hand it to the background writer"""
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                # Entries are replaced, never mutated, so a shallow copy is a
+                # consistent snapshot; the writer serializes only the newest one
+                data = {
+                    'cache': dict(self._cache),
+                    'stats': dict(self._stats),
+                    'last_updated': time.time(),
+                    'version': '1.0'
+                }
+                self._unsaved = False
+            self._writer.submit(data)
+        except Exception as e:
+            print(f"Playlist Cache: Failed to save cache: {e}")
+
+    def save(self, timeout: Optional[float] = 5.0):
+        """Write any unsaved change and wait for the write to finish"""
+        if self._unsaved:
+            self._save_cache()
+        self._writer.flush(timeout)
+
+    def _enforce_limits(self):
+        """Evict least recently used listings beyond the limits (lock held)"""
+        max_entries = self.settings.playlist_cache_max_entries if self.settings else 0
+        max_items = self.settings.playlist_cache_max_items if self.settings else 0
+        total_items = sum(len(e['items']) for e in self._cache.values())
+        while self._cache and ((max_entries > 0 and len(self._cache) > max_entries) or
+                               (max_items > 0 and total_items > max_items)):
+            _, entry = self._cache.popitem(last=False)
+            total_items -= len(entry['items'])
+            self._stats['evicted'] += 1
+
+    # --- Lookups ---
+
+    def get(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached items for url if the listing is within its TTL, else None"""
+        if not url or not self.enabled():
+            return None
+        key = playlist_id_for_url(url)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or time.time() - entry['fetched_at'] > self.ttl_s:
+                self._stats['misses'] += 1
+                return None
+            self._cache.move_to_end(key)
+            self._stats['hits'] += 1
+            return [dict(it) for it in entry['items']]
+
+    def is_stale(self, url: str) -> bool:
+        """True when a listing is cached but past its TTL (worth revalidating)"""
+        if not url or not self.enabled():
+            return False
+        with self._lock:
+            entry = self._cache.get(playlist_id_for_url(url))
+            return entry is not None and time.time() - entry['fetched_at'] > self.ttl_s
+
+    def revalidate(self, url: str, first_page: List[Dict[str, Any]], count: Optional[int] = None) -> bool:
+        """
+        Compare a freshly fetched first page with the cached listing.
+
+        Returns True (and renews the entry) when the listing is unchanged.
+        The reported entry count catches additions at the end of playlists
+        whose first page stays the same.
+        """
+        if not url or not first_page or not self.enabled():
+            return False
+        key = playlist_id_for_url(url)
+        head = [media_id_for_url(it.get('url', '')) for it in first_page]
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False
+            unchanged = (entry.get('head', [])[:len(head)] == head and
+                         (not count or not entry.get('count') or int(count) == int(entry['count'])))
+            if not unchanged:
+                self._stats['changed'] += 1
+                return False
+            self._cache[key] = dict(entry, fetched_at=time.time())
+            self._cache.move_to_end(key)
+            self._stats['revalidated'] += 1
+        self._save_cache()
+        return True
+
+    def put(self, url: str, items: List[Dict[str, Any]], count: Optional[int] = None):
+        """Store a complete listing for url"""
+        if not url or not self.enabled():
+            return
+        key = playlist_id_for_url(url)
+        entry = {
+            'items': [dict(it) for it in items],
+            'head': [media_id_for_url(it.get('url', '')) for it in items[:max(1, self.revalidate_depth)]],
+            'count': int(count) if count else len(items),
+            'fetched_at': time.time()
+        }
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            self._enforce_limits()
+        self._save_cache()
+
+    def invalidate(self, url: str):
+        with self._lock:
+            if self._cache.pop(playlist_id_for_url(url), None) is not None:
+                self._unsaved = True
+
+    def clear(self):
+        """Clear all cache entries"""
+        with self._lock:
+            self._cache.clear()
+            self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'changed': 0, 'evicted': 0}
+        self._save_cache()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'entries': len(self._cache),
+                'items': sum(len(e['items']) for e in self._cache.values()),
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': (self._stats['hits'] / lookups) if lookups > 0 else 0,
+                'revalidated': self._stats['revalidated'],
+                'changed': self._stats['changed'],
+                'evicted': self._stats['evicted'],
+                'cache_file_exists': self.cache_file.exists()
+            }
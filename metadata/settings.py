@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Metadata Settings for Silence Suzuka Player
+
+Configuration for library-wide metadata work (backfill of durations, titles
+and thumbnails, and the title cache) following the same pattern as
+DurationFetchSettings.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class MetadataSettings:
+    """Metadata configuration settings"""
+
+    # Backfill job
+    backfill_enabled: bool = True
+    backfill_idle_only: bool = True  # Only resume automatically while the player is idle/silent
+    backfill_rate_per_minute: int = 30  # Max dispatches per rolling minute
+    backfill_max_in_flight: int = 4
+    backfill_task_timeout_s: int = 120  # Requeue dispatched tasks that never reported back
+    backfill_max_attempts: int = 3
+    backfill_checkpoint_interval_s: int = 30
+
+    # Title/metadata cache
+    cache_enabled: bool = True
+    cache_max_entries: int = 20000
+    cache_max_age_days: int = 180  # Titles rarely change; 0 keeps entries forever
+
+    # Flat playlist/channel listing cache
+    playlist_cache_enabled: bool = True
+    playlist_cache_ttl_s: int = 1800  # Fresh listings are reused without any request
+    playlist_cache_revalidate_depth: int = 20  # First-page entries compared when revalidating
+    playlist_cache_max_entries: int = 200
+    playlist_cache_max_items: int = 100000  # Across all cached listings
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'backfill_enabled': self.backfill_enabled,
+            'backfill_idle_only': self.backfill_idle_only,
+            'backfill_rate_per_minute': self.backfill_rate_per_minute,
+            'backfill_max_in_flight': self.backfill_max_in_flight,
+            'backfill_task_timeout_s': self.backfill_task_timeout_s,
+            'backfill_max_attempts': self.backfill_max_attempts,
+            'backfill_checkpoint_interval_s': self.backfill_checkpoint_interval_s,
+            'cache_enabled': self.cache_enabled,
+            'cache_max_entries': self.cache_max_entries,
+            'cache_max_age_days': self.cache_max_age_days,
+            'playlist_cache_enabled': self.playlist_cache_enabled,
+            'playlist_cache_ttl_s': self.playlist_cache_ttl_s,
+            'playlist_cache_revalidate_depth': self.playlist_cache_revalidate_depth,
+            'playlist_cache_max_entries': self.playlist_cache_max_entries,
+            'playlist_cache_max_items': self.playlist_cache_max_items
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create from dictionary (JSON deserialization)"""
+        return cls(
+            backfill_enabled=data.get('backfill_enabled', True),
+            backfill_idle_only=data.get('backfill_idle_only', True),
+            backfill_rate_per_minute=data.get('backfill_rate_per_minute', 30),
+            backfill_max_in_flight=data.get('backfill_max_in_flight', 4),
+            backfill_task_timeout_s=data.get('backfill_task_timeout_s', 120),
+            backfill_max_attempts=data.get('backfill_max_attempts', 3),
+            backfill_checkpoint_interval_s=data.get('backfill_checkpoint_interval_s', 30),
+            cache_enabled=data.get('cache_enabled', True),
+            cache_max_entries=data.get('cache_max_entries', 20000),
+            cache_max_age_days=data.get('cache_max_age_days', 180),
+            playlist_cache_enabled=data.get('playlist_cache_enabled', True),
+            playlist_cache_ttl_s=data.get('playlist_cache_ttl_s', 1800),
+            playlist_cache_revalidate_depth=data.get('playlist_cache_revalidate_depth', 20),
+            playlist_cache_max_entries=data.get('playlist_cache_max_entries', 200),
+            playlist_cache_max_items=data.get('playlist_cache_max_items', 100000)
+        )
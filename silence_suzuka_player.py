@@ -21,7 +21,9 @@ import queue
 import warnings
 import subprocess
 import io
+import math
 import threading
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timedelta
 from enum import Enum
@@ -34,7 +36,7 @@ import qtawesome as qta
 # PySide6 Core imports
 from PySide6.QtCore import (
     Qt, QTimer, Signal, QThread, QSize, QRectF, QByteArray, QPoint, 
-    QEvent, QRect, QBuffer
+    QEvent, QRect, QBuffer, QPointF, QObject
 )
 
 # PySide6 GUI imports  
@@ -95,6 +97,22 @@ from virtual_playlist import VirtualPlaylistSettings, VirtualPlaylistWidget, Vir
 # Error Handling imports
 from error_handling import ErrorHandlingSettings, PlaybackErrorHandler
 
+# Metadata imports
+from metadata import (MetadataSettings, MetadataCache, MetadataBroker, BackfillJob, media_id_for_url,
+                      fetch_lightweight_metadata, FlatPlaylistFetcher, flat_entry_to_item, iter_lazy_entries,
+                      PlaylistResponseCache)
+
+# Library imports
+from library import PlaylistIndex, BackgroundJsonWriter, DebouncedPersister, LibrarySettings, LibraryModel, LibraryView, LazyGroupStore, GroupAggregates, UpNextQueue
+from library.reconcile import stable_keys, group_layout, plan_children
+from library.aggregates import GroupTotals, group_key_of
+from ui.resource_cache import get_resource_cache
+from ui.text_cache import TextLayoutCache
+
+# Subscription imports
+from subscriptions import (SubscriptionSettings, SubscriptionHistory, SubscriptionChecker, PollSchedule,
+                           check_incremental, history_lock)
+
 
 class MediaType(Enum):
     """Enumeration for media source types."""
@@ -225,94 +243,75 @@ class NetworkErrorHandler:
         if 'timeout' in error_str:
             QMessageBox.warning(None, "Timeout", 
                 f"Operation timed out for {operation}:\n{url[:60]}...\n\nTry again later.")
-def fetch_playlist_flat(url):
-    """
-    Fetch playlist entries safely without crashing on network errors
-    """
-    try:
-        url_lower = url.lower()
-        kind = 'bilibili' if 'bilibili.com' in url_lower else 'youtube'
-
-        # Run yt-dlp with timeout and error handling
-        try:
-            result = subprocess.run(
-                ["yt-dlp", "--flat-playlist", "--dump-single-json", url],
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                encoding="utf-8", 
-                timeout=30,  
-                check=True
-            )
-        except subprocess.TimeoutExpired:
-            print(f"[BatchFetch] Timeout for {url}")
-            return []
-        except subprocess.CalledProcessError as e:
-            # Log but don't crash
-            print(f"[BatchFetch] Failed for {url}: Network/availability error")
-            return []
-        except Exception as e:
-            print(f"[BatchFetch] Unexpected error for {url}: {e}")
-            return []
+_flat_fetcher = None
+_flat_fetcher_lock = threading.Lock()
 
-        if not result.stdout.strip():
-            return []
-            
-        try:
-            data = json.loads(result.stdout)
-        except json.JSONDecodeError:
-            print(f"[BatchFetch] Invalid JSON response for {url}")
-            return []
-        
-        playlist_title = data.get("title", "Unknown Playlist")
-        playlist_key = data.get("id", url)
-        entries = data.get("entries", [])
-        
-        items = []
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-                
-            try:
-                video_url = entry.get("url", "")
-                title = entry.get("title", "Unknown")
-                video_id = entry.get("id", "")
-                
-                # Build proper URLs
-                if kind == 'youtube' and not video_url.startswith('http'):
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                elif kind == 'bilibili' and not video_url.startswith('http'):
-                    video_url = f"https://www.bilibili.com/video/{video_id}"
 
-                if not video_url:
-                    continue
+def get_flat_fetcher() -> FlatPlaylistFetcher:
+    """Shared in-process flat playlist fetcher (extractors stay warm between calls)"""
+    global _flat_fetcher
+    with _flat_fetcher_lock:
+        if _flat_fetcher is None:
+            _flat_fetcher = FlatPlaylistFetcher(cookie_files={'bilibili': COOKIES_BILI})
+        return _flat_fetcher
 
-                # FIXED: Better title handling for Bilibili
-                if kind == 'bilibili':
-                    # Check for various "no title" indicators
-                    if (not title or 
-                        title in ("Unknown", "NO TITLE", video_id) or 
-                        title.lower() in ("unknown", "no title")):
-                        # Create a loading title that will trigger resolution
-                        title = f"[Loading Title...] {video_id}"
-                    elif title == video_id:
-                        # If title is just the video ID, mark for loading
-                        title = f"[Loading Title...] {video_id}"
-
-                items.append({
-                    "title": title,
-                    "url": video_url,
-                    "type": kind,
-                    "playlist": playlist_title,
-                    "playlist_key": playlist_key
-                })
-            except Exception:
-                continue  # Skip bad entries
-                
-        return items
-        
-    except Exception as e:
-        print(f"[BatchFetch] Fatal error for {url}: {e}")
-        return []
+
+# Flat listing cache, installed by the player once its settings are loaded
+_playlist_response_cache = None
+
+
+def set_playlist_cache(cache):
+    global _playlist_response_cache
+    _playlist_response_cache = cache
+
+
+def get_playlist_cache():
+    return _playlist_response_cache
+
+
+def _limit_cached_items(items, stop_when=None, limit=None):
+    """Apply fetch_playlist_flat's early-stop rules to a cached listing"""
+    out = []
+    for item in items:
+        if stop_when and stop_when(item):
+            break
+        out.append(item)
+        if limit is not None and len(out) >= limit:
+            break
+    return out
+
+
+def fetch_playlist_flat(url, stop_when=None, should_stop=None, limit=None):
+    """
+    Fetch playlist entries in-process.
+
+    Stops early when stop_when(item) returns True, should_stop() returns True
+    or limit items have been collected. Fresh listings come from the playlist
+    response cache; stale ones are revalidated from their first page before a
+    full fetch. Extractor errors are raised, so callers can tell a failed
+    fetch from an empty listing.
+    """
+    kind = 'bilibili' if 'bilibili.com' in url.lower() else 'youtube'
+    fetcher = get_flat_fetcher()
+    cache = get_playlist_cache()
+
+    if cache is not None and cache.enabled():
+        cached = cache.get(url)
+        partial = stop_when is not None or limit is not None
+        if cached is None and not partial and cache.is_stale(url):
+            info = {}
+            head = fetcher.fetch(url, kind, limit=cache.revalidate_depth, should_stop=should_stop, info_out=info)
+            if cache.revalidate(url, head, info.get('playlist_count')):
+                cached = cache.get(url)
+        if cached is not None:
+            return _limit_cached_items(cached, stop_when, limit)
+
+    info = {}
+    items = fetcher.fetch(url, kind, stop_when=stop_when, should_stop=should_stop,
+                          limit=limit, timeout=120, info_out=info)
+    if cache is not None and info.get('complete'):
+        cache.put(url, items, info.get('playlist_count'))
+    return items
     
 class PlaylistFetchThread(QThread):
     """
@@ -328,20 +327,28 @@ class PlaylistFetchThread(QThread):
         super().__init__(parent)
         self.url = url
         self.chunk_size = chunk_size
+        self._should_stop = False
+
+    def stop(self):
+        self._should_stop = True
 
     def run(self):
         try:
-            items = fetch_playlist_flat(self.url)
-            if not items:
-                self.finished.emit()
-                return
-            total = len(items)
+            kind = 'bilibili' if 'bilibili.com' in self.url.lower() else 'youtube'
+            chunk = []
             count = 0
-            for i in range(0, total, self.chunk_size):
-                chunk = items[i:i + self.chunk_size]
-                count += len(chunk)
+            # Chunks go out while the extractor is still paging through the playlist
+            for item in get_flat_fetcher().iter_items(self.url, kind,
+                                                      should_stop=lambda: self._should_stop):
+                chunk.append(item)
+                count += 1
+                if len(chunk) >= self.chunk_size:
+                    self.chunkReady.emit(chunk)
+                    self.progress.emit(count)
+                    chunk = []
+            if chunk and not self._should_stop:
                 self.chunkReady.emit(chunk)
-                self.progress.emit(min(count, total))
+                self.progress.emit(count)
             self.finished.emit()
         except Exception as ex:
             # emit the error message instead of showing a dialog here
@@ -363,6 +370,8 @@ def fetch_playlist_with_progress(player, url: str, title: str = "Fetching playli
     all_items = []
 
     def on_chunk(chunk):
+        if thread._should_stop:
+            return  # Cancelled; the worker is winding down
         all_items.extend(chunk)
         # Since we don’t know the total at the start, just increment the bar
         progress_dialog.setValue(progress_dialog.value() + len(chunk))
@@ -379,7 +388,9 @@ def fetch_playlist_with_progress(player, url: str, title: str = "Fetching playli
     thread.chunkReady.connect(on_chunk)
     thread.error.connect(on_error)
     thread.finished.connect(on_finished)
-    progress_dialog.canceled.connect(lambda: thread.terminate() or thread.wait())
+    thread.finished.connect(thread.deleteLater)
+    # Don't block the GUI waiting for the extractor; finished cleans up
+    progress_dialog.canceled.connect(thread.stop)
 
     thread.start()
     progress_dialog.exec()
@@ -2423,6 +2434,8 @@ class PlayingItemDelegate(QStyledItemDelegate):
     def __init__(self, player, parent=None):
         super().__init__(parent)
         self.player = player
+        # Elided, prepared row text; rows scrolled back into view skip text layout
+        self.text_cache = TextLayoutCache()
 
     def paint(self, painter, option, index):
         # Get a direct reference to the tree widget
@@ -2462,12 +2475,27 @@ class PlayingItemDelegate(QStyledItemDelegate):
         # --- Step 5: Calculate the final rectangle available for the text ---
         text_rect = cell_rect.adjusted(icon_space_used, 0, -right_padding, 0)
 
-        # --- Step 6: Elide the text to fit our calculated rectangle ---
-        fm = QFontMetrics(option.font)
-        elided_text = fm.elidedText(text, Qt.ElideRight, text_rect.width())
+        # --- Step 6: Elide the text to fit our calculated rectangle (cached) ---
+        # A resize changes every row's width, so the cache starts over
+        self.text_cache.set_viewport_width(tree_widget.viewport().width())
+        if text:
+            static = self.text_cache.get(str(text), option.font, text_rect.width(), Qt.ElideRight)
 
-        # --- Step 7: Draw our perfectly elided text ---
-        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, elided_text)
+            # --- Step 7: Draw our perfectly elided text ---
+            size = static.size()
+            x = text_rect.left()
+            alignment = index.model().data(index, Qt.TextAlignmentRole)
+            try:
+                align = int(getattr(alignment, 'value', alignment) or 0)
+                if align & int(getattr(Qt.AlignRight, 'value', Qt.AlignRight)):
+                    x = text_rect.right() - size.width()
+            except (TypeError, ValueError):
+                pass
+            y = text_rect.top() + (text_rect.height() - size.height()) / 2
+            painter.save()
+            painter.setFont(option.font)
+            painter.drawStaticText(QPointF(x, y), static)
+            painter.restore()
 
         # --- Step 8: Draw the 'now playing' background overlay if needed ---
         item = tree_widget.itemFromIndex(index)
@@ -2581,25 +2609,51 @@ def _render_svg_tinted(svg_path, size: QSize, color: str) -> QPixmap:
     except Exception:
         return QPixmap() # Return an empty pixmap on error
 
+def make_chevron_pixmap_svg(px_size=20, stroke_color="#f3f3f3"):
+    """Right-pointing chevron for group rows, rendered once per size/color/DPR."""
+    cache = get_resource_cache()
+
+    def _render():
+        svg_data = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" '
+            f'stroke="{stroke_color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">'
+            f'<path d="M9 6l6 6l-6 6"/></svg>'
+        )
+        renderer = QSvgRenderer(QByteArray(svg_data.encode('utf-8')))
+        pixmap = QPixmap(int(px_size * cache.dpr), int(px_size * cache.dpr))
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        renderer.render(painter)
+        painter.end()
+        pixmap.setDevicePixelRatio(cache.dpr)
+        return pixmap
+
+    return cache.pixmap(('chevron', px_size, stroke_color), _render)
+
 def playlist_icon_for_type(item_type):
     # Standardized to 28x28 for better visibility
     icon_size = QSize(28, 28)
     if item_type == 'youtube':
-        return load_svg_icon(str(APP_DIR / 'icons/youtube-fa7.svg'), icon_size)
+        icon_path = 'icons/youtube-fa7.svg'
     elif item_type == 'bilibili':
-        return load_svg_icon(str(APP_DIR / 'icons/bilibili-fa7.svg'), icon_size)
+        icon_path = 'icons/bilibili-fa7.svg'
     elif item_type == 'local':
         return "🎬"
     else:
         return "🎵"
+    cache = get_resource_cache()
+    return cache.icon(('type', item_type, icon_size.width()),
+                      lambda: load_svg_icon(str(APP_DIR / icon_path), icon_size, dpr=cache.dpr))
         
-def load_svg_icon(path, size=QSize(18, 18)):
+def load_svg_icon(path, size=QSize(18, 18), dpr=1.0):
     renderer = QSvgRenderer(path)
-    pixmap = QPixmap(size)
+    pixmap = QPixmap(int(size.width() * dpr), int(size.height() * dpr))
     pixmap.fill(Qt.transparent)
     painter = QPainter(pixmap)
-    renderer.render(painter, QRectF(0, 0, size.width(), size.height()))
+    renderer.render(painter, QRectF(0, 0, pixmap.width(), pixmap.height()))
     painter.end()
+    pixmap.setDevicePixelRatio(dpr)
     return QIcon(pixmap)        
 
 # Initialize logging
@@ -3034,9 +3088,10 @@ class AFKMonitor(QThread):
 class ThumbnailFetcher(QThread):
     thumbnailReady = Signal(bytes)
 
-    def __init__(self, item_data, parent=None):
+    def __init__(self, item_data, parent=None, broker=None):
         super().__init__(parent)
         self.item_data = item_data
+        self.broker = broker
 
     def run(self):
         if not self.item_data:
@@ -3052,11 +3107,15 @@ class ThumbnailFetcher(QThread):
                 thumb_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
             
             elif item_type == 'bilibili':
-                import yt_dlp
-                ydl_opts = {'quiet': True, 'skip_download': True, 'no_warnings': True}
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    thumb_url = info.get('thumbnail')
+                thumb_url = self.item_data.get('thumbnail')
+                if not thumb_url and self.broker is not None:
+                    thumb_url = (self.broker.fetch(url, item_type, need=('thumbnail',)) or {}).get('thumbnail')
+                elif not thumb_url:
+                    import yt_dlp
+                    ydl_opts = {'quiet': True, 'skip_download': True, 'no_warnings': True}
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        info = ydl.extract_info(url, download=False)
+                        thumb_url = info.get('thumbnail')
 
             # --- NEW: Logic for Local Files ---
             elif item_type == 'local' and HAVE_REQUESTS:
@@ -3085,7 +3144,12 @@ class ThumbnailFetcher(QThread):
 class PlaylistLoaderThread(QThread):
     itemsReady = Signal(list)
     error = Signal(str)
-    progressUpdate = Signal(int, int)  # Add progress signal
+    progressUpdate = Signal(int, int)  # loaded, total (0 when the site doesn't report one)
+
+    # Flush a chunk when it reaches CHUNK_SIZE items or has waited FLUSH_INTERVAL_S,
+    # so the first page shows up as soon as it is parsed
+    CHUNK_SIZE = 50
+    FLUSH_INTERVAL_S = 0.3
 
     def __init__(self, url: str, kind: str, parent=None):
         super().__init__(parent)
@@ -3098,7 +3162,7 @@ class PlaylistLoaderThread(QThread):
         self._should_stop = True
 
     def run(self):
-        """Load playlist items with cancellation support"""
+        """Stream playlist items to the UI as pages arrive, with cancellation support"""
         try:
             import yt_dlp
         except Exception as e:
@@ -3108,11 +3172,12 @@ class PlaylistLoaderThread(QThread):
         if self._should_stop:
             return
 
-        # Simple, crash-proof yt-dlp options
+        # Simple, crash-proof yt-dlp options. extract_flat='in_playlist' with
+        # process=False below leaves 'entries' as the extractor's lazy iterator.
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
-            'extract_flat': True,
+            'extract_flat': 'in_playlist',
             'skip_download': True,
             'socket_timeout': 15,
             'retries': 1,
@@ -3139,12 +3204,43 @@ class PlaylistLoaderThread(QThread):
         if self._should_stop:
             return
 
-        # CRASH-PROOF extraction
-        info = None
+        # Re-adding a playlist that was just listed needs no request at all
+        cache = get_playlist_cache()
+        cached = cache.get(target_url) if cache is not None else None
+        if cached:
+            for start in range(0, len(cached), self.CHUNK_SIZE):
+                if self._should_stop:
+                    return
+                self.itemsReady.emit(cached[start:start + self.CHUNK_SIZE])
+            self.progressUpdate.emit(len(cached), len(cached))
+            return
+
+        # CRASH-PROOF extraction. Entries are consumed inside the YoutubeDL
+        # context because later pages are fetched while iterating.
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(target_url, download=False)
-                
+                info = ydl.extract_info(target_url, download=False, process=False)
+
+                if self._should_stop:
+                    return
+                if not info:
+                    self.error.emit("No playlist data received")
+                    return
+
+                if isinstance(info, dict) and info.get('entries') is not None:
+                    self._stream_entries(info, target_url)
+                else:
+                    # Single video fallback
+                    title = info.get('title', target_url) if isinstance(info, dict) else target_url
+                    single_item = {
+                        'title': title,
+                        'url': target_url,
+                        'type': self.kind,
+                        'needs_title': title == target_url
+                    }
+                    if not self._should_stop:
+                        self.itemsReady.emit([single_item])
+
         except Exception as e:
             if self._should_stop:
                 return
@@ -3159,117 +3255,183 @@ class PlaylistLoaderThread(QThread):
                 self.error.emit(f"Network error loading playlist. Check your connection.")
             else:
                 self.error.emit(f"Could not load playlist: {str(e)[:100]}...")
-            
-            return
 
-        if self._should_stop:
-            return
+    def _stream_entries(self, info: dict, target_url: str):
+        """Emit entries in small chunks while the extractor is still paging"""
+        playlist_title = info.get('title', 'Unknown Playlist')
+        playlist_key = info.get('id', target_url)
+        entries = info.get('entries')
 
-        # Process results safely with progress updates
-        try:
-            if not info:
-                self.error.emit("No playlist data received")
+        total = info.get('playlist_count') or 0
+        if not total and isinstance(entries, (list, tuple)):
+            total = len(entries)
+
+        chunk = []
+        loaded = 0
+        last_flush = time.monotonic()
+        emitted_any = False
+        collected = []  # Full listing, stored in the response cache once complete
+
+        for entry in iter_lazy_entries(entries):
+            if self._should_stop:
                 return
+            if not isinstance(entry, dict):
+                continue
 
-            if isinstance(info, dict) and info.get('entries'):
-                playlist_title = info.get('title', 'Unknown Playlist')
-                entries = list(info.get('entries') or [])
-                total_entries = len(entries)
-                
-                if self._should_stop:
-                    return
+            try:
+                item = flat_entry_to_item(entry, self.kind, playlist_title, playlist_key, target_url)
+            except Exception:
+                continue
+            if not item:
+                continue
 
+            chunk.append(item)
+            collected.append(item)
+            loaded += 1
+
+            now = time.monotonic()
+            if len(chunk) >= self.CHUNK_SIZE or now - last_flush >= self.FLUSH_INTERVAL_S:
+                self.itemsReady.emit(chunk)
+                self.progressUpdate.emit(loaded, max(total, loaded) if total else 0)
+                emitted_any = True
                 chunk = []
-                for i, entry in enumerate(entries):
-                    if self._should_stop:
-                        return
-                        
-                    if not isinstance(entry, dict):
-                        continue
-                        
-                    try:
-                        idv = entry.get('id', '')
-                        u = entry.get('webpage_url') or entry.get('url') or idv
-                        
-                        if not u:
-                            continue
+                last_flush = now
 
-                        # Build proper URLs
-                        if self.kind == 'bilibili' and not u.startswith('http'):
-                            u = f"https://www.bilibili.com/video/{idv or u}"
-                        elif self.kind == 'youtube' and not u.startswith('http'):
-                            u = f"https://www.youtube.com/watch?v={idv or u}"
-
-                        # Title extraction
-                        if self.kind == 'bilibili':
-                            title = (
-                                entry.get('title') or
-                                entry.get('alt_title') or
-                                entry.get('description', '')[:50] or
-                                f"Bilibili Video {idv or u[-8:]}"
-                            )
-                        else:
-                            title = entry.get('title') or f"Video {idv or u}"
-                        
-                        item = {
-                            'title': title,
-                            'url': u,
-                            'type': self.kind,
-                            'playlist': playlist_title,
-                            'playlist_key': info.get('id', target_url)
-                        }
-                        
-                        chunk.append(item)
-                        
-                        # Emit progress update
-                        self.progressUpdate.emit(i + 1, total_entries)
-                        
-                        # Emit in smaller chunks to avoid overwhelming UI
-                        if len(chunk) >= 20:
-                            self.itemsReady.emit(chunk)
-                            chunk = []
-                            
-                    except Exception as e:
-                        continue
-                
-                # Emit remaining items
-                if chunk and not self._should_stop:
-                    self.itemsReady.emit(chunk)
-                    
-            else:
-                # Single video fallback
-                title = info.get('title', target_url) if isinstance(info, dict) else target_url
-                single_item = {
-                    'title': title,
-                    'url': target_url,
-                    'type': self.kind
-                }
-                if not self._should_stop:
-                    self.itemsReady.emit([single_item])
-                
-        except Exception as e:
-            if not self._should_stop:
-                self.error.emit(f"Error processing playlist data: {e}")
+        if self._should_stop:
+            return
+        if chunk or not emitted_any:
+            # An empty emit tells the UI the playlist had no usable entries
+            self.itemsReady.emit(chunk)
+        self.progressUpdate.emit(loaded, loaded)
+
+        cache = get_playlist_cache()
+        if cache is not None and collected:
+            cache.put(target_url, [dict(it) for it in collected], info.get('playlist_count'))
 
 
 class YtdlManager(QThread):
     titleResolved = Signal(str, str)
+    thumbnailResolved = Signal(str, str)  # url, thumbnail url
+    metadataResolved = Signal(str, object)  # url, {'title', 'uploader', 'thumbnail'}
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, broker=None, pool=None):
         super().__init__(parent)
         self._queue = queue.Queue()
         self._should_stop = False
         self._ydl_cache = {}
         self._lock = threading.Lock()  # Add thread lock
+        self.broker = broker  # Shared single-flight metadata requests, if available
+        self.pool = pool  # Shared work queue; None means this worker owns its queue
 
-    def resolve(self, url: str, kind: str):
+    def resolve(self, url: str, kind: str, need_duration: bool = False):
         """Thread-safe method to queue title resolution"""
+        if self.pool is not None:
+            self.pool.resolve(url, kind, need_duration)
+            return
         if url and kind and not self._should_stop:
             try:
-                self._queue.put({'url': url, 'kind': kind}, timeout=1.0)
+                self._queue.put({'url': url, 'kind': kind, 'need_duration': need_duration}, timeout=1.0)
             except queue.Full:
                 logger.warning(f"Title resolution queue full, dropping: {url}")
 
+    def resolve_playlist(self, playlist_url: str, kind: str, urls):
+        """Queue title resolution for many items of one playlist with a single flat request"""
+        if self.pool is not None:
+            self.pool.resolve_playlist(playlist_url, kind, urls)
+            return
+        if playlist_url and kind and urls and not self._should_stop:
+            try:
+                self._queue.put({'playlist_url': playlist_url, 'kind': kind, 'urls': list(urls)}, timeout=1.0)
+            except queue.Full:
+                logger.warning(f"Title resolution queue full, dropping playlist: {playlist_url}")
+
+    def _get_ydl(self, kind: str):
+        with self._lock:  # Thread-safe access to cache
+            # Get or create yt-dlp instance
+            if kind not in self._ydl_cache:
+                opts = {
+                    'quiet': True,
+                    'no_warnings': True,
+                    'skip_download': True,
+                    'socket_timeout': 30,
+                    'retries': 2,
+                    # Metadata only: never expand playlist entries into full extractions
+                    'extract_flat': 'in_playlist',
+                }
+                if kind == 'bilibili':
+                    opts['cookiefile'] = str(COOKIES_BILI)
+                
+                import yt_dlp
+                self._ydl_cache[kind] = yt_dlp.YoutubeDL(opts)
+
+            return self._ydl_cache[kind]
+
+    def _resolve_single(self, url: str, kind: str, need_duration: bool = False):
+        """Resolve one URL: site shortcut first, then an unprocessed yt-dlp extraction"""
+        if self.broker is not None:
+            # One combined request; the broker fans duration etc. out to the player
+            need = ('title', 'duration') if need_duration else ('title',)
+            meta = self.broker.fetch(url, kind, need=need)
+            if not meta:
+                return
+        else:
+            meta = fetch_lightweight_metadata(url, kind)
+
+        if meta:
+            title = meta.get('title')
+            thumb = meta.get('thumbnail')
+            uploader = meta.get('uploader')
+        else:
+            # process=False still runs the site extractor (for YouTube the
+            # watch page and player responses) but skips yt-dlp's format
+            # selection and post-processing; its metadata is all we need
+            info = self._get_ydl(kind).extract_info(url, download=False, process=False)
+            if not isinstance(info, dict):
+                return
+            title = info.get('title')
+            thumb = info.get('thumbnail')
+            if not thumb and info.get('thumbnails'):
+                thumb = (info['thumbnails'][-1] or {}).get('url')
+            uploader = info.get('uploader')
+
+        if self._should_stop:
+            return
+        self.metadataResolved.emit(url, {'title': title, 'uploader': uploader, 'thumbnail': thumb})
+        if title and title != url:
+            self.titleResolved.emit(url, title)
+            logger.debug(f"YtdlManager resolved: '{title}' for {url[-20:]}...")
+        if thumb:
+            self.thumbnailResolved.emit(url, thumb)
+
+    def _resolve_playlist(self, playlist_url: str, kind: str, urls):
+        """Resolve titles for playlist items from one flat playlist response"""
+        wanted = {media_id_for_url(u): u for u in urls}
+        try:
+            # With extract_flat the entries are not resolved one by one, so a
+            # single listing request covers every item
+            info = self._get_ydl(kind).extract_info(playlist_url, download=False, process=False)
+            for entry in (info or {}).get('entries') or []:
+                if self._should_stop:
+                    return
+                if not isinstance(entry, dict):
+                    continue
+                entry_url = entry.get('url') or entry.get('webpage_url') or ''
+                if entry_url and not entry_url.startswith('http'):
+                    entry_url = (f"https://www.bilibili.com/video/{entry_url}" if kind == 'bilibili'
+                                 else f"https://www.youtube.com/watch?v={entry_url}")
+                url = wanted.pop(media_id_for_url(entry_url), None) if entry_url else None
+                title = entry.get('title')
+                if url and title and title != url:
+                    self.titleResolved.emit(url, title)
+                elif url:
+                    wanted[media_id_for_url(url)] = url  # No title in the flat entry
+        except Exception as e:
+            logger.warning(f"YtdlManager playlist lookup failed for {playlist_url[-30:]}: {e}")
+
+        # Anything the flat response didn't cover falls back to per-item resolution
+        for url in wanted.values():
+            self.resolve(url, kind)
+
     def stop(self):
         """Gracefully stop the worker"""
         self._should_stop = True
@@ -3284,14 +3446,23 @@ class YtdlManager(QThread):
         logger.debug("YtdlManager worker started")
         
         while not self._should_stop:
+            job = None
+            started = time.monotonic()
             try:
                 # Use timeout to allow periodic checks
-                job = self._queue.get(timeout=1.0)
+                if self.pool is not None:
+                    job = self.pool.next_job(timeout=1.0)
+                    if job is None:
+                        if self.pool.try_retire(self):
+                            break  # Idle long enough; the pool shrinks
+                        continue
+                    started = time.monotonic()
+                else:
+                    job = self._queue.get(timeout=1.0)
                 
                 if job is None or self._should_stop:
                     break
 
-                url = job['url']
                 kind = job['kind']
                 
                 # Skip if app is shutting down
@@ -3299,36 +3470,16 @@ class YtdlManager(QThread):
                     getattr(self.parent(), '_is_destroyed', False)):
                     break
                 
-                logger.debug(f"YtdlManager processing {kind} URL: {url[-20:]}...")
-
-                with self._lock:  # Thread-safe access to cache
-                    # Get or create yt-dlp instance
-                    cache_key = kind
-                    if cache_key not in self._ydl_cache:
-                        opts = {
-                            'quiet': True,
-                            'no_warnings': True,
-                            'skip_download': True,
-                            'socket_timeout': 30,
-                            'retries': 2,
-                        }
-                        if kind == 'bilibili':
-                            opts['cookiefile'] = str(COOKIES_BILI)
-                        
-                        import yt_dlp
-                        self._ydl_cache[cache_key] = yt_dlp.YoutubeDL(opts)
+                if 'playlist_url' in job:
+                    logger.debug(f"YtdlManager processing {kind} playlist ({len(job['urls'])} titles)")
+                    self._resolve_playlist(job['playlist_url'], kind, job['urls'])
+                    continue
 
-                    ydl = self._ydl_cache[cache_key]
+                url = job['url']
+                logger.debug(f"YtdlManager processing {kind} URL: {url[-20:]}...")
 
-                # Process outside the lock
                 try:
-                    info = ydl.extract_info(url, download=False)
-                    title = info.get('title') if isinstance(info, dict) else None
-                    
-                    if title and title != url and not self._should_stop:
-                        self.titleResolved.emit(url, title)
-                        logger.debug(f"YtdlManager resolved: '{title}' for {url[-20:]}...")
-                        
+                    self._resolve_single(url, kind, job.get('need_duration', False))
                 except Exception as e:
                     logger.warning(f"YtdlManager failed for {url[-20:]}...: {e}")
 
@@ -3338,12 +3489,199 @@ class YtdlManager(QThread):
                 logger.error(f"YtdlManager unexpected error: {e}")
                 if not self._should_stop:
                     time.sleep(1)  # Brief pause before retrying
+            finally:
+                if self.pool is not None and job is not None:
+                    self.pool.job_done(job, time.monotonic() - started)
 
         # Cleanup
         with self._lock:
             self._ydl_cache.clear()
         logger.debug("YtdlManager worker stopped")
 
+
+class YtdlWorkerPool(QObject):
+    """
+    Elastic pool of YtdlManager workers pulling from shared per-site queues.
+
+    Workers take the next job from whichever site still has a free
+    concurrency slot, so one slow site (or URL) never stalls jobs for another.
+    The pool grows with backlog and measured latency and idle workers retire
+    after a quiet period.
+    """
+    titleResolved = Signal(str, str)
+    thumbnailResolved = Signal(str, str)
+    metadataResolved = Signal(str, object)
+    _loadChanged = Signal()  # Emitted from workers; resizing happens on the pool's thread
+
+    # Concurrent extractions per site; Bilibili rate-limits aggressively
+    SITE_LIMITS = {'youtube': 6, 'bilibili': 2}
+    DEFAULT_SITE_LIMIT = 3
+
+    def __init__(self, parent=None, broker=None, min_workers: int = 1, max_workers: int = 8,
+                 idle_timeout_s: float = 30.0, target_drain_s: float = 20.0):
+        super().__init__(parent)
+        self.broker = broker
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.idle_timeout_s = idle_timeout_s
+        self.target_drain_s = target_drain_s
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, deque] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._site_order: List[str] = []  # Round-robin across sites
+        self._workers: List[YtdlManager] = []
+        self._idle_since: Dict[int, float] = {}
+        self._latency = 3.0  # Seconds per job, exponentially weighted
+        self._stopped = False
+
+        self._loadChanged.connect(self._resize)
+        self._resize()
+
+    # --- Submission (any thread) ---
+
+    def resolve(self, url: str, kind: str, need_duration: bool = False):
+        if url and kind:
+            self._submit({'url': url, 'kind': kind, 'need_duration': need_duration})
+
+    def resolve_playlist(self, playlist_url: str, kind: str, urls):
+        if playlist_url and kind and urls:
+            self._submit({'playlist_url': playlist_url, 'kind': kind, 'urls': list(urls)})
+
+    def _submit(self, job: dict):
+        with self._cond:
+            if self._stopped:
+                return
+            site = job['kind']
+            if site not in self._queues:
+                self._queues[site] = deque()
+                self._in_flight.setdefault(site, 0)
+                self._site_order.append(site)
+            self._queues[site].append(job)
+            self._cond.notify()
+        self._loadChanged.emit()
+
+    # --- Worker side ---
+
+    def next_job(self, timeout: float = 1.0) -> Optional[dict]:
+        """Next job whose site has a free slot, or None after timeout"""
+        deadline = time.monotonic() + timeout
+        worker_id = threading.get_ident()
+        with self._cond:
+            while not self._stopped:
+                for _ in range(len(self._site_order)):
+                    site = self._site_order.pop(0)
+                    self._site_order.append(site)
+                    limit = self.SITE_LIMITS.get(site, self.DEFAULT_SITE_LIMIT)
+                    if self._queues[site] and self._in_flight[site] < limit:
+                        self._in_flight[site] += 1
+                        self._idle_since.pop(worker_id, None)
+                        return self._queues[site].popleft()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            self._idle_since.setdefault(worker_id, time.monotonic())
+        return None
+
+    def job_done(self, job: dict, elapsed: float):
+        with self._cond:
+            site = job.get('kind')
+            if site in self._in_flight:
+                self._in_flight[site] = max(0, self._in_flight[site] - 1)
+            # Playlist jobs cover many items; only single lookups describe per-item latency
+            if 'url' in job:
+                self._latency = 0.8 * self._latency + 0.2 * max(0.1, elapsed)
+            self._cond.notify_all()  # A site slot is free again
+        self._loadChanged.emit()
+
+    def try_retire(self, worker) -> bool:
+        """Let an idle worker exit if the pool can spare it"""
+        with self._cond:
+            idle_since = self._idle_since.get(threading.get_ident())
+            if (self._stopped or idle_since is None or
+                    time.monotonic() - idle_since < self.idle_timeout_s or
+                    len(self._workers) <= self.min_workers or
+                    self._backlog_locked()):
+                return False
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self._idle_since.pop(threading.get_ident(), None)
+            return True
+
+    # --- Sizing (pool thread) ---
+
+    def _backlog_locked(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _desired_size(self) -> int:
+        with self._cond:
+            queued = {site: len(q) for site, q in self._queues.items()}
+            in_flight = dict(self._in_flight)
+            latency = self._latency
+        work = sum(queued.values()) + sum(in_flight.values())
+        if not work:
+            return self.min_workers
+        # Enough workers to drain the backlog within target_drain_s at the measured latency,
+        # but never more than the site limits allow to run at once
+        wanted = math.ceil(work * latency / self.target_drain_s)
+        usable = sum(min(self.SITE_LIMITS.get(site, self.DEFAULT_SITE_LIMIT),
+                         queued.get(site, 0) + in_flight.get(site, 0))
+                     for site in set(queued) | set(in_flight))
+        return max(self.min_workers, min(self.max_workers, wanted, max(1, usable)))
+
+    def _resize(self):
+        if self._stopped:
+            return
+        desired = self._desired_size()
+        with self._cond:
+            missing = desired - len(self._workers)
+        for _ in range(max(0, missing)):
+            worker = YtdlManager(None, broker=self.broker, pool=self)
+            worker.titleResolved.connect(self.titleResolved)
+            worker.thumbnailResolved.connect(self.thumbnailResolved)
+            worker.metadataResolved.connect(self.metadataResolved)
+            worker.finished.connect(worker.deleteLater)
+            with self._cond:
+                self._workers.append(worker)
+            worker.start()
+
+    # --- QThread-like lifecycle, so shutdown code can treat the pool as one thread ---
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            workers = list(self._workers)
+            self._cond.notify_all()
+        for worker in workers:
+            worker.stop()
+
+    def wait(self, timeout_ms: int = 3000) -> bool:
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        with self._cond:
+            workers = list(self._workers)
+        for worker in workers:
+            remaining = max(0, int((deadline - time.monotonic()) * 1000))
+            if not worker.wait(remaining):
+                return False
+        return True
+
+    def terminate(self):
+        with self._cond:
+            workers = list(self._workers)
+        for worker in workers:
+            if worker.isRunning():
+                worker.terminate()
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {
+                'workers': len(self._workers),
+                'queued': {site: len(q) for site, q in self._queues.items()},
+                'in_flight': dict(self._in_flight),
+                'latency_s': round(self._latency, 2),
+            }
+
 class DurationFetcher(QThread):
     progressUpdated = Signal(int, int)  # current, total
     durationReady = Signal(int, int)    # index, duration
@@ -3413,6 +3751,29 @@ class DurationFetcher(QThread):
             except Exception:
                 pass       
 
+class SmartQueueSuggestionWorker(QThread):
+    """Computes Smart Queue suggestions off the GUI thread for the Up Next panel"""
+    suggestionsReady = Signal(int, object)  # generation, [(index, reason_icon, reason_text)]
+
+    def __init__(self, manager, current_item, playlist, current_index, upcoming, generation, parent=None):
+        super().__init__(parent)
+        self.manager = manager  # A SmartQueueManager.snapshot(), never the live manager
+        self.current_item = current_item
+        self.playlist = playlist  # Snapshot: the GUI thread may change the live list meanwhile
+        self.current_index = current_index
+        self.upcoming = upcoming
+        self.generation = generation
+
+    def run(self):
+        try:
+            suggestions = self.manager.get_suggestions(
+                self.current_item, self.playlist, self.current_index, self.upcoming
+            )
+        except Exception as e:
+            print(f"Smart Queue: Error getting suggestions: {e}")
+            suggestions = []
+        self.suggestionsReady.emit(self.generation, suggestions)
+
 class LocalDurationQueue(QThread):
     durationReady = Signal(int, int)  # index, duration (seconds)
 
@@ -3905,11 +4266,18 @@ class PlaylistTree(QTreeWidget):
                     # *** FIX STARTS HERE ***
                     # Rebuild the playlist from the tree's new order
                     new_playlist = []
+                    lazy_groups = getattr(self.player, 'lazy_groups', None)
+                    moved_pending = {}
                     for i in range(self.topLevelItemCount()):
                         top_item = self.topLevelItem(i)
                         data = top_item.data(0, Qt.UserRole)
                         if isinstance(data, tuple) and data[0] == 'current':
                             new_playlist.append(data[2])
+                        elif isinstance(data, tuple) and data[0] == 'group' and lazy_groups and lazy_groups.is_pending(data[1]):
+                            # Unpopulated group: carry its items over without rows
+                            start = len(new_playlist)
+                            new_playlist.extend(self.player.playlist[p] for p in lazy_groups.pending(data[1]))
+                            moved_pending[data[1]] = range(start, len(new_playlist))
                         elif isinstance(data, tuple) and data[0] == 'group':
                             for j in range(top_item.childCount()):
                                 child = top_item.child(j)
@@ -3917,6 +4285,8 @@ class PlaylistTree(QTreeWidget):
                                 if isinstance(child_data, tuple) and child_data[0] == 'current':
                                     new_playlist.append(child_data[2])
                     self.player.playlist = new_playlist
+                    for key, positions in moved_pending.items():
+                        lazy_groups.defer(key, positions)
                     # *** FIX ENDS HERE ***
                     
                     event.accept()
@@ -4118,6 +4488,7 @@ class MediaPlayer(QMainWindow):
     requestTimerSignal = Signal(int, object)
     statusMessageSignal = Signal(str, int)
     titleUpdateRequested = Signal(str, str)
+    cachedTitleResolved = Signal(str, str)  # Cache hits, delivered on the main thread
     mpvErrorOccurred = Signal(str)
     errorHandlingStateChanged = Signal(dict)  # For UI updates
 
@@ -4259,6 +4630,43 @@ class MediaPlayer(QMainWindow):
             return self.error_handler.get_error_summary()
         return {"total_errors": 0, "by_type": {}, "recent_errors": []}
 
+    def _item_needs_title(self, item) -> bool:
+        """
+        Whether an item still needs its title resolved. Items carry an explicit
+        'needs_title' flag; the placeholder heuristics below only classify
+        items saved before the flag existed.
+        """
+        if 'needs_title' in item:
+            return bool(item['needs_title'])
+        title = item.get('title', '') or ''
+        url = item.get('url', '')
+        item_type = item.get('type', '')
+        return (
+            not title or
+            # Contains loading placeholder
+            '[Loading Title...]' in title or
+            # Title is just the URL
+            title == url or
+            # Bilibili-specific patterns
+            (item_type == 'bilibili' and (
+                title.startswith('Bilibili Video ') or
+                title.startswith('BV') and len(title) <= 12 or  # Just video ID
+                title in ('Unknown', 'NO TITLE') or
+                len(title) < 8
+            )) or
+            # YouTube-specific patterns
+            (item_type == 'youtube' and (
+                title.startswith('YouTube Video ') or
+                title.startswith('https://www.youtube.com/') or
+                title == item.get('id', '')
+            )) or
+            # Local files with just filename extensions
+            (item_type == 'local' and (
+                not title or 
+                title == Path(url).name and len(title) < 10
+            ))
+        )
+
     def _resume_incomplete_title_fetching(self):
         """
         Check for items that need title resolution and queue them for background fetching.
@@ -4271,56 +4679,27 @@ class MediaPlayer(QMainWindow):
                 if not isinstance(item, dict):
                     continue
                     
-                title = item.get('title', '')
                 url = item.get('url', '')
                 item_type = item.get('type', '')
                 
                 if not url or not item_type:
                     continue
                 
-                # Detect items that need title resolution
-                needs_resolution = (
-                    # Contains loading placeholder
-                    '[Loading Title...]' in title or
-                    # Title is just the URL
-                    title == url or
-                    # Bilibili-specific patterns
-                    (item_type == 'bilibili' and (
-                        title.startswith('Bilibili Video ') or
-                        title.startswith('BV') and len(title) <= 12 or  # Just video ID
-                        title in ('Unknown', 'NO TITLE') or
-                        len(title) < 8
-                    )) or
-                    # YouTube-specific patterns
-                    (item_type == 'youtube' and (
-                        title.startswith('YouTube Video ') or
-                        title.startswith('https://www.youtube.com/') or
-                        title == item.get('id', '')
-                    )) or
-                    # Local files with just filename extensions
-                    (item_type == 'local' and (
-                        not title or 
-                        title == Path(url).name and len(title) < 10
-                    ))
-                )
-                
-                if needs_resolution:
+                if self._item_needs_title(item):
                     items_needing_titles.append((i, item))
             
             if items_needing_titles:
                 print(f"[STARTUP] Found {len(items_needing_titles)} items needing title resolution")
                 self.status.showMessage(f"Fetching titles for {len(items_needing_titles)} items in background...", 4000)
                 
-                # Start background title fetching
+                # Start background title fetching (online items share playlist requests)
+                self._resolve_titles_batch([item for _, item in items_needing_titles])
+                
                 for index, item in items_needing_titles:
                     url = item.get('url')
                     item_type = item.get('type')
                     
-                    if item_type in ('youtube', 'bilibili'):
-                        # Queue for parallel resolution
-                        self._resolve_title_parallel(url, item_type)
-                        print(f"[STARTUP] Queued title fetch for {item_type}: {url[:50]}...")
-                    elif item_type == 'local':
+                    if item_type == 'local':
                         # For local files, try to improve the title from filename
                         try:
                             filename = Path(url).name
@@ -4334,7 +4713,7 @@ class MediaPlayer(QMainWindow):
                 
                 # Save any local file title improvements
                 if any(item[1].get('type') == 'local' for item in items_needing_titles):
-                    self._save_current_playlist()
+                    self._schedule_save_current_playlist()
                     # Refresh UI to show updated local titles
                     QTimer.singleShot(500, lambda: self._refresh_playlist_widget())
                     
@@ -4361,15 +4740,12 @@ class MediaPlayer(QMainWindow):
                 return
             
             # Update playlist data atomically
-            updated = False
-            for item in self.playlist:
-                if isinstance(item, dict) and item.get('url') == url:
-                    item['title'] = title
-                    updated = True
-                    break
-            
-            if not updated:
+            positions = self.playlist_index.positions(url, self.playlist)
+            if not positions:
                 return
+            for pos in positions:
+                self.playlist[pos]['title'] = title
+                self.playlist[pos]['needs_title'] = False
                 
             # Update UI
             self._update_single_tree_item_title(url, title)
@@ -4380,7 +4756,7 @@ class MediaPlayer(QMainWindow):
                 self._set_track_title(title)
             
             # Save playlist
-            self._save_current_playlist()
+            self._schedule_save_current_playlist()
             
         except Exception as e:
             print(f"Title update failed for {url}: {e}")  
@@ -4469,19 +4845,7 @@ class MediaPlayer(QMainWindow):
                 
                 self.listening_stats['daily'] = new_daily
 
-            # 4. Clean up finished workers
-            if hasattr(self, 'ytdl_workers'):
-                active_workers = []
-                for worker in self.ytdl_workers:
-                    try:
-                        if worker.isRunning():
-                            active_workers.append(worker)
-                        else:
-                            worker.deleteLater()
-                    except RuntimeError:
-                        # Worker already deleted
-                        pass
-                self.ytdl_workers = active_workers
+            # 4. Finished title workers are retired and deleted by the pool itself
 
             # 5. Clear Qt object caches if they exist
             for cache_attr in ['_thumbnail_cache', '_icon_cache', '_temp_widgets']:
@@ -4712,6 +5076,20 @@ class MediaPlayer(QMainWindow):
         # --- 1. Define All State Variables First ---
         self._was_maximized = False
         self.playlist = []
+        self.playlist_index = PlaylistIndex()  # media ID -> positions, position -> tree node
+        self.group_aggregates = GroupAggregates(self._item_is_watched, self._item_resume_seconds)  # Per-group totals
+        self.up_next_queue = UpNextQueue()  # Cached playback order behind the Up Next panel
+        self._up_next_suggestions = (None, [])  # (request key, suggestions) from the last finished worker
+        self._up_next_request = None
+        self._suggestion_generation = 0
+        self._suggestion_workers = set()
+        # current.json is written off the GUI thread; metadata updates only mark it dirty
+        self._playlist_persister = DebouncedPersister(
+            lambda: {'current_playlist': [dict(it) for it in self.playlist]},
+            BackgroundJsonWriter(CFG_CURRENT, name='playlist-writer',
+                                 on_written=self._on_playlist_written, indent=2),
+            debounce_ms=1500, max_latency_ms=10000, parent=self
+        )
         self.current_index = -1
         self.playback_positions = {}
         self.saved_playlists = {}
@@ -4810,21 +5188,22 @@ class MediaPlayer(QMainWindow):
         self.requestTimerSignal.connect(self._start_timer_from_main_thread)
         self.statusMessageSignal.connect(self._show_status_message)
         self.titleUpdateRequested.connect(self._update_title_safely) 
+        self.cachedTitleResolved.connect(self._on_title_resolved)
         self.mpvErrorOccurred.connect(self._show_mpv_error)
         self.errorHandlingStateChanged.connect(lambda: self._update_error_status_button())
         self._build_ui()
 
         # Create 4 parallel workers for faster title resolution
         # print(f"DEBUG: Creating {10} YtdlManager workers...")
-        self.ytdl_workers = []
-        for i in range(8):  
-            worker = YtdlManager(self)
-            worker.titleResolved.connect(self._on_title_resolved)
-            worker.start()
-            self.ytdl_workers.append(worker)
-            # print(f"DEBUG: Created YtdlManager worker {i}")
-        self._worker_index = 0
-        # print(f"DEBUG: All {len(self.ytdl_workers)} YtdlManager workers created")
+        # One combined, deduplicated metadata request per URL shared by all fetchers
+        self.metadata_broker = MetadataBroker({'bilibili': str(COOKIES_BILI)}, parent=self)
+        self.metadata_broker.metadataReady.connect(self._on_broker_metadata)
+
+        # Elastic title-resolution pool: shared per-site queues, grows with backlog
+        self.ytdl_pool = YtdlWorkerPool(self, broker=self.metadata_broker, min_workers=1, max_workers=8)
+        self.ytdl_pool.titleResolved.connect(self._on_title_resolved)
+        self.ytdl_pool.thumbnailResolved.connect(self._on_thumbnail_resolved)
+        self.ytdl_pool.metadataResolved.connect(self._on_metadata_resolved)
 
         # Override the playlist methods with enhanced versions
         def enhanced_save():
@@ -4844,6 +5223,8 @@ class MediaPlayer(QMainWindow):
         self._setup_keyboard_shortcuts()
         self._init_mpv()
         self._load_files()
+        if self.library_settings.model_view_enabled:
+            self._install_library_view()
 
         # Apply chevron style after theme is loaded
         if hasattr(self, "playlist_tree"):
@@ -5014,11 +5395,46 @@ class MediaPlayer(QMainWindow):
                 root.child(i).setExpanded(True)
             self.status.showMessage("Playlist headers expanded", 3000)
 
+    def _apply_cached_metadata(self, url) -> bool:
+        """Deliver a cached title for url instead of resolving it; returns True on a hit"""
+        cache = getattr(self, 'metadata_cache', None)
+        entry = cache.get(url) if cache else None
+        if not entry or not entry.title:
+            return False
+        # Signals keep this safe when called from worker threads (subscriptions)
+        self.cachedTitleResolved.emit(url, entry.title)
+        return True
+
     def _resolve_title_parallel(self, url, kind):
         """Distribute title resolution across multiple workers"""
-        worker = self.ytdl_workers[self._worker_index]
-        worker.resolve(url, kind)
-        self._worker_index = (self._worker_index + 1) % len(self.ytdl_workers)            
+        if self._apply_cached_metadata(url):
+            return
+        # New items usually lack a duration too; fetch both in the same request
+        need_duration = any(not self.playlist[i].get('duration')
+                            for i in self.playlist_index.positions(url, self.playlist))
+        self.ytdl_pool.resolve(url, kind, need_duration)
+
+    def _resolve_titles_batch(self, items):
+        """
+        Resolve titles for many items, sharing one flat playlist request per
+        source playlist instead of one extraction per item.
+        """
+        by_playlist = {}
+        for item in items:
+            url, kind = item.get('url'), item.get('type')
+            if not url or kind not in ('youtube', 'bilibili'):
+                continue
+            if self._apply_cached_metadata(url):
+                continue
+            by_playlist.setdefault((item.get('playlist_url'), kind), []).append(url)
+
+        for (playlist_url, kind), urls in by_playlist.items():
+            # A flat playlist request only pays off when it covers several items
+            if playlist_url and len(urls) >= 3:
+                self.ytdl_pool.resolve_playlist(playlist_url, kind, urls)
+            else:
+                for url in urls:
+                    self._resolve_title_parallel(url, kind)
 
     def _handle_paste(self):
         """Handle Ctrl+V paste for media URLs"""
@@ -5625,11 +6041,18 @@ class MediaPlayer(QMainWindow):
     def _update_loading_progress(self, current, total):
         """Update loading progress bar"""
         if hasattr(self, '_loading_progress') and self._loading_progress:
-            progress = int((current / total) * 100) if total > 0 else 0
-            self._loading_progress.setValue(progress)
+            if total > 0:
+                self._loading_progress.setRange(0, 100)
+                self._loading_progress.setValue(int((current / total) * 100))
+            else:
+                # Total unknown while streaming: show a busy indicator
+                self._loading_progress.setRange(0, 0)
             
+        counter = f"{current}/{total}" if total > 0 else f"{current}"
         if hasattr(self, '_loading_label') and self._loading_label:
-            self._loading_label.setText(f"Loading playlist entries... ({current}/{total})")
+            self._loading_label.setText(f"Loading playlist entries... ({counter})")
+        if total <= 0 or current < total:
+            self.status.showMessage(f"Loading playlist entries... ({counter})", 2000)
 
     def _hide_loading(self, final_message="", timeout=3000):
         """Hide loading overlay"""
@@ -6227,9 +6650,14 @@ class MediaPlayer(QMainWindow):
         self.playlist_tree.setIndentation(20)
         self.playlist_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.playlist_tree.itemDoubleClicked.connect(self.on_tree_item_double_clicked)
+        self.playlist_tree.itemExpanded.connect(self._on_tree_group_expanded)
+        self.playlist_tree.itemCollapsed.connect(self._on_tree_group_collapsed)
         self.playlist_tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.playlist_tree.customContextMenuRequested.connect(self._show_playlist_context_menu)
         self.playlist_tree.mousePressEvent = self._create_mouse_press_handler()
+        self.lazy_groups = LazyGroupStore()
+        self._dirty_group_totals = set()
+        self._track_visible_indices(self.playlist_tree)
     
 
         # Set playlist font: Lora, italic, bold (size set dynamically)
@@ -6242,6 +6670,10 @@ class MediaPlayer(QMainWindow):
         # We'll apply this properly after theme loads in _load_files()
         pass  # Remove the style application here for now
 
+        # Optional model/view library, installed by _install_library_view
+        # once the settings are loaded
+        self.library_model = None
+        self.library_view = None
         self.playlist_stack.addWidget(self.playlist_tree)
 
          # --- ADD THESE LINES FOR ICON SIZE AND ROW HEIGHT ---
@@ -6660,7 +7092,7 @@ class MediaPlayer(QMainWindow):
                 dur = self.progress.maximum()
                 self.mini_player.update_progress(pos, dur)
 
-                fetcher = ThumbnailFetcher(item, self)
+                fetcher = ThumbnailFetcher(item, self, broker=getattr(self, 'metadata_broker', None))
                 fetcher.thumbnailReady.connect(self._on_thumbnail_ready)
                 fetcher.finished.connect(fetcher.deleteLater)
                 fetcher.start()
@@ -6691,7 +7123,7 @@ class MediaPlayer(QMainWindow):
     def _play_selected_group(self):
         """Play the currently selected group when 'B' key is pressed"""
         try:
-            selected_items = self.playlist_tree.selectedItems()
+            selected_items = self._library_selected_items()
             if not selected_items:
                 self.status.showMessage("No group selected", 2000)
                 return
@@ -6760,6 +7192,7 @@ class MediaPlayer(QMainWindow):
             # Check if we have any top-level items
             if self.playlist_tree.topLevelItemCount() > 0:
                 top_item = self.playlist_tree.topLevelItem(0)
+                self._ensure_group_populated(top_item)
                 
                 # If it's a group, try to get its first child
                 if top_item.childCount() > 0:
@@ -6809,6 +7242,7 @@ class MediaPlayer(QMainWindow):
                 top_item = self.playlist_tree.topLevelItem(i)
                 if not top_item:
                     continue
+                self._ensure_group_populated(top_item)
                     
                 # If it's a group with children, get the last child
                 if top_item.childCount() > 0:
@@ -7115,13 +7549,27 @@ class MediaPlayer(QMainWindow):
 
     def _font_serif_no_size(self, italic=False, bold=False):
         """Create a serif font with styling but no fixed size (for dynamic scaling)"""
-        font = QFont(self._serif_font)
-        font.setItalic(italic)
-        if bold:
-            font.setWeight(QFont.Bold)
-        font.setStyleStrategy(QFont.PreferAntialias)
-        font.setLetterSpacing(QFont.AbsoluteSpacing, 0.5)
-        return font
+        def _build():
+            font = QFont(self._serif_font)
+            font.setItalic(italic)
+            if bold:
+                font.setWeight(QFont.Bold)
+            font.setStyleStrategy(QFont.PreferAntialias)
+            font.setLetterSpacing(QFont.AbsoluteSpacing, 0.5)
+            return font
+        return get_resource_cache().font(('serif', self._serif_font, italic, bold), _build)
+
+    def _sync_resource_cache(self):
+        """Drop cached icons, pixmaps and fonts if the theme, DPR or typography changed"""
+        try:
+            dpr = self.devicePixelRatioF()
+        except Exception:
+            dpr = 1.0
+        typography = (getattr(self, '_serif_font', ''), QApplication.font().toString())
+        if get_resource_cache().sync(theme=getattr(self, 'theme', 'dark'), dpr=dpr, typography=typography):
+            delegate = getattr(self, 'playing_delegate', None)
+            if delegate is not None:
+                delegate.text_cache.invalidate()
         
     def center_on_screen(self):
         screen = self.screen() if hasattr(self, "screen") and self.screen() else QApplication.primaryScreen()
@@ -7676,6 +8124,8 @@ class MediaPlayer(QMainWindow):
                 
                 # Case 1: It's a group header. Find the first playable child.
                 if isinstance(data, tuple) and data[0] == 'group':
+                    if self.lazy_groups.pending(data[1]):
+                        return self.lazy_groups.pending(data[1])[0]
                     if item.childCount() > 0:
                         for j in range(item.childCount()):
                             child = item.child(j)
@@ -7706,6 +8156,8 @@ class MediaPlayer(QMainWindow):
                 
                 # Case 1: Group header
                 if isinstance(data, tuple) and data[0] == 'group':
+                    if self.lazy_groups.is_pending(data[1]):
+                        indices.extend(self.lazy_groups.pending(data[1]))
                     for j in range(item.childCount()):
                         child = item.child(j)
                         if not child.isHidden():
@@ -7757,6 +8209,8 @@ class MediaPlayer(QMainWindow):
                 
                 # If it's a group with children
                 if isinstance(data, tuple) and data[0] == 'group':
+                    if self.lazy_groups.pending(data[1]):
+                        return self.lazy_groups.pending(data[1])[0]
                     for j in range(item.childCount()):
                         child = item.child(j)
                         child_data = child.data(0, Qt.UserRole)
@@ -7791,6 +8245,7 @@ class MediaPlayer(QMainWindow):
         else:
             self._apply_dark_theme()
         
+        self._sync_resource_cache()
         self._apply_dynamic_fonts()
 
         if hasattr(self, "playlist_tree"):
@@ -7972,6 +8427,7 @@ class MediaPlayer(QMainWindow):
         )
 
         self._subscription_manager.newVideosFound.connect(self._on_new_videos_found)
+        self._subscription_manager.sweepFinished.connect(self._on_subscription_sweep_finished)
         self._subscription_manager.start()
 
     def _on_new_videos_found(self, playlist_url, new_items):
@@ -7980,28 +8436,37 @@ class MediaPlayer(QMainWindow):
             if not new_items:
                 return
 
-            existing_urls = {item.get('url') for item in self.playlist if item.get('url')}
-            
-            truly_new_items = [
-                item for item in new_items if item.get('url') not in existing_urls
-            ]
+            # Rows go straight into their group; the save and metadata lookups
+            # wait for the end of the sweep so every channel shares one of each
+            added = self.bulk_insert(new_items, undo=False, defer_side_effects=True)
 
-            if not truly_new_items:
+            if not added:
                 self._subscription_manager.sub_logger.info(f"All new items for {playlist_url} were already present.")
                 return
 
-            expansion_state = self._get_tree_expansion_state()
-            self.playlist.extend(truly_new_items)
-            self._save_current_playlist()
-            self._refresh_playlist_widget(expansion_state=expansion_state)
+            if not hasattr(self, '_subscription_sweep_items'):
+                self._subscription_sweep_items = []
+            self._subscription_sweep_items.extend(added)
             
-            playlist_name = truly_new_items[0].get('playlist', 'subscription')
-            self.status.showMessage(f"Added {len(truly_new_items)} new videos from '{playlist_name}'", 5000)
+            playlist_name = added[0].get('playlist', 'subscription')
+            self.status.showMessage(f"Added {len(added)} new videos from '{playlist_name}'", 5000)
 
         except Exception as e:
             logger.error(f"Failed to add new videos from subscription: {e}")
             self.status.showMessage("Error adding new subscribed videos.", 4000)
 
+    def _on_subscription_sweep_finished(self):
+        """Persist and enqueue metadata once for everything a sweep added"""
+        items = getattr(self, '_subscription_sweep_items', None)
+        if not items:
+            return
+        self._subscription_sweep_items = []
+        try:
+            self._schedule_save_current_playlist()
+            self._enqueue_new_item_metadata(items)
+        except Exception as e:
+            logger.error(f"Failed to finalize subscription sweep: {e}")
+
     def _update_silence_indicator(self, is_silent: bool = None):
         """Update the silence indicator - simplified version."""
         if is_silent is not None:
@@ -8261,21 +8726,15 @@ class MediaPlayer(QMainWindow):
         # FIXED: Clean up worker threads with proper termination
         try:
             # YT-DLP workers
-            if hasattr(self, 'ytdl_workers'):
-                for i, worker in enumerate(self.ytdl_workers[:]):  # Create a copy of the list
-                    if worker:
-                        try:
-                            worker.stop()
-                            if not worker.wait(1000):  # Wait 1 second
-                                worker.terminate()
-                                worker.wait(500)  # Wait another 500ms after terminate
-                            print(f"[SHUTDOWN] ✓ Cleaned up YT-DLP worker {i}")
-                        except Exception as worker_error:
-                            print(f"[SHUTDOWN] ⚠ Error cleaning YT-DLP worker {i}: {worker_error}")
-                
-                # Clear the list
-                self.ytdl_workers.clear()
-                print(f"[SHUTDOWN] ✓ All YT-DLP workers cleaned up")
+            if hasattr(self, 'ytdl_pool'):
+                try:
+                    self.ytdl_pool.stop()
+                    if not self.ytdl_pool.wait(1000):  # Wait 1 second
+                        self.ytdl_pool.terminate()
+                        self.ytdl_pool.wait(500)  # Wait another 500ms after terminate
+                    print(f"[SHUTDOWN] ✓ All YT-DLP workers cleaned up")
+                except Exception as worker_error:
+                    print(f"[SHUTDOWN] ⚠ Error cleaning YT-DLP workers: {worker_error}")
             
             # Local duration worker
             if hasattr(self, '_local_dur') and self._local_dur:
@@ -8301,18 +8760,6 @@ class MediaPlayer(QMainWindow):
                 except Exception as loader_error:
                     print(f"[SHUTDOWN] ⚠ Playlist loader error: {loader_error}")
                     
-            # Duration fetcher
-            if hasattr(self, '_duration_fetcher') and self._duration_fetcher:
-                try:
-                    self._duration_fetcher.stop()
-                    if not self._duration_fetcher.wait(1000):
-                        self._duration_fetcher.terminate()
-                        self._duration_fetcher.wait(500)
-                    self._duration_fetcher = None
-                    print("[SHUTDOWN] ✓ Duration fetcher cleaned up")
-                except Exception as duration_error:
-                    print(f"[SHUTDOWN] ⚠ Duration fetcher error: {duration_error}")
-                    
         except Exception as e:
             print(f"[SHUTDOWN] ⚠ Worker cleanup error: {e}")
 
@@ -8321,6 +8768,14 @@ class MediaPlayer(QMainWindow):
             print("[SHUTDOWN] Saving session and settings...")
             self._save_session()
             self._save_settings()
+            if getattr(self, 'backfill_job', None):
+                self.backfill_job.checkpoint(force=True)
+            if getattr(self, 'metadata_cache', None):
+                self.metadata_cache.save()
+            if getattr(self, 'playlist_response_cache', None):
+                self.playlist_response_cache.save()
+            if getattr(self, '_playlist_persister', None):
+                self._playlist_persister.close()
             print("[SHUTDOWN] ✓ State and settings saved")
         except Exception as e:
             print(f"[SHUTDOWN] ⚠ Failed to save state: {e}")
@@ -8475,6 +8930,18 @@ class MediaPlayer(QMainWindow):
                 virtual_playlist_data = s.get('virtual_playlist', {})
                 self.virtual_playlist_settings = VirtualPlaylistSettings.from_dict(virtual_playlist_data)
                 
+                # Load metadata settings
+                metadata_data = s.get('metadata', {})
+                self.metadata_settings = MetadataSettings.from_dict(metadata_data)
+                
+                # Load subscription settings
+                subscriptions_data = s.get('subscriptions', {})
+                self.subscription_settings = SubscriptionSettings.from_dict(subscriptions_data)
+                
+                # Load library display settings
+                library_data = s.get('library', {})
+                self.library_settings = LibrarySettings.from_dict(library_data)
+                
                 # Load error handling settings
                 error_handling_data = s.get('error_handling', {})
                 if error_handling_data:
@@ -8574,6 +9041,18 @@ class MediaPlayer(QMainWindow):
         if not hasattr(self, 'virtual_playlist_settings'):
             self.virtual_playlist_settings = VirtualPlaylistSettings()
         
+        # Initialize metadata settings if not already loaded
+        if not hasattr(self, 'metadata_settings'):
+            self.metadata_settings = MetadataSettings()
+        
+        # Initialize subscription settings if not already loaded
+        if not hasattr(self, 'subscription_settings'):
+            self.subscription_settings = SubscriptionSettings()
+        
+        # Initialize library settings if not already loaded
+        if not hasattr(self, 'library_settings'):
+            self.library_settings = LibrarySettings()
+        
         # Initialize smart queue manager with same config directory as other settings
         self.smart_queue_manager = SmartQueueManager(Path(APP_DIR), self.smart_queue_settings)
         
@@ -8582,10 +9061,27 @@ class MediaPlayer(QMainWindow):
             Path(APP_DIR), self.duration_fetch_settings, self
         )
         
+        if getattr(self, 'metadata_broker', None):
+            self.background_duration_fetcher.set_metadata_broker(self.metadata_broker)
+        
         # Connect duration fetcher signals
         self.background_duration_fetcher.durationReady.connect(self._on_background_duration_ready)
         self.background_duration_fetcher.fetchError.connect(self._on_background_duration_error)
 
+        # Persistent title/metadata cache, consulted before any title lookup
+        self.metadata_cache = MetadataCache(Path(APP_DIR), self.metadata_settings)
+
+        # Flat playlist/channel listings, shared by the loader and subscription checks
+        self.playlist_response_cache = PlaylistResponseCache(Path(APP_DIR), self.metadata_settings)
+        set_playlist_cache(self.playlist_response_cache)
+
+        # Resumable metadata backfill (restores any checkpointed job)
+        self.backfill_job = BackfillJob(Path(APP_DIR), self.metadata_settings)
+        self._backfill_timer = QTimer(self)
+        self._backfill_timer.setInterval(2000)
+        self._backfill_timer.timeout.connect(self._backfill_tick)
+        self._backfill_timer.start()
+
         # Force update to ensure styling takes effect
         try:
             self.update()
@@ -8623,6 +9119,11 @@ class MediaPlayer(QMainWindow):
                 data = json.load(open(CFG_CURRENT, 'r', encoding='utf-8'))
                 self.playlist = data.get('current_playlist', [])
                 
+                # One-time migration: classify items saved before the needs_title flag
+                for item in self.playlist:
+                    if isinstance(item, dict) and 'needs_title' not in item:
+                        item['needs_title'] = self._item_needs_title(item)
+                
                 # NEW: Resume title fetching for incomplete items
                 if self.playlist:
                     # Delay the title fetching slightly to let the UI fully initialize
@@ -8702,6 +9203,9 @@ class MediaPlayer(QMainWindow):
             'smart_queue': getattr(self, 'smart_queue_settings', None).to_dict() if hasattr(self, 'smart_queue_settings') and self.smart_queue_settings else {},
             'duration_fetch': getattr(self, 'duration_fetch_settings', None).to_dict() if hasattr(self, 'duration_fetch_settings') and self.duration_fetch_settings else {},
             'virtual_playlist': getattr(self, 'virtual_playlist_settings', None).to_dict() if hasattr(self, 'virtual_playlist_settings') and self.virtual_playlist_settings else {},
+            'metadata': getattr(self, 'metadata_settings', None).to_dict() if hasattr(self, 'metadata_settings') and self.metadata_settings else {},
+            'subscriptions': getattr(self, 'subscription_settings', None).to_dict() if hasattr(self, 'subscription_settings') and self.subscription_settings else {},
+            'library': getattr(self, 'library_settings', None).to_dict() if hasattr(self, 'library_settings') and self.library_settings else {},
             'error_handling': getattr(self, 'error_handling_settings', None).to_dict() if hasattr(self, 'error_handling_settings') and self.error_handling_settings else {},
             'window': {
                 'x': int(self.geometry().x()),
@@ -8724,15 +9228,16 @@ class MediaPlayer(QMainWindow):
         if getattr(self, '_is_destroyed', False):
             return
             
-        temp_file = CFG_CURRENT.with_suffix('.tmp')
-        try:
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump({'current_playlist': self.playlist}, f, indent=2)
-            temp_file.replace(CFG_CURRENT)
-        except Exception as e:
-            logger.error(f"Playlist save failed: {e}")
-            if hasattr(self, 'status'):
-                self.status.showMessage(f"Save failed: {e}", 4000)
+        # Snapshot now; serialization and the atomic replace run on the writer
+        # thread, which reports failures through _on_playlist_written
+        self._playlist_persister.save_now()
+
+    def _on_playlist_written(self, error):
+        """Writer-thread callback after each current.json write"""
+        if error is None or getattr(self, '_is_destroyed', False):
+            return
+        logger.error(f"Playlist save failed: {error}")
+        self.statusMessageSignal.emit(f"Save failed: {error}", 4000)  # Delivered on the GUI thread
 
     def _save_positions(self):
         """Atomic save for playback positions"""
@@ -8756,11 +9261,23 @@ class MediaPlayer(QMainWindow):
                     temp_file.unlink()
                 logger.error(f"Playlists save failed: {e}")
                 
-    def _save_completed(self):
+    def _save_completed(self, urls=None):
         try:
             json.dump(sorted(list(self.completed_urls)), open(CFG_COMPLETED, 'w', encoding='utf-8'))
         except Exception:
             pass
+        self._on_completion_changed(urls)
+
+    def _on_completion_changed(self, urls=None):
+        """Re-count unwatched totals after completion changes (urls=None: many changed)"""
+        if urls is None:
+            self.group_aggregates.invalidate()
+            self._schedule_group_total_update(None)
+            return
+        for url in urls:
+            for i in self.playlist_index.positions(url, self.playlist):
+                self.group_aggregates.update(self.playlist[i])
+                self._schedule_group_total_update(i)
 
     def _save_session(self):
         """Saves the current application state to session.json."""
@@ -8857,11 +9374,142 @@ class MediaPlayer(QMainWindow):
         except Exception:
             pass # Ignore if mpv is not ready
 
+    def _build_library_view(self):
+        """Create the LibraryModel/LibraryView pair used when model_view_enabled is set"""
+        font = self._font_serif_no_size(italic=True, bold=True)
+        self.library_model = LibraryModel(
+            self,
+            icon_func=playlist_icon_for_type,
+            duration_func=format_duration_from_seconds,
+            font_func=lambda: font
+        )
+        self.library_view = LibraryView(self)
+        self.library_view.setModel(self.library_model)
+        self.library_view.setFont(font)
+        self.library_view.setIconSize(QSize(24, 24))
+        self.library_view.positionActivated.connect(self._on_library_position_activated)
+        self.library_view.groupActivated.connect(self._on_library_group_activated)
+        self.library_view.positionMoved.connect(self._on_library_position_moved)
+        self.library_view.customContextMenuRequested.connect(self._show_playlist_context_menu)
+
+    def _install_library_view(self):
+        """
+        Show the model/view library in place of the tree widget (index 0 of
+        the playlist stack). The tree stays hidden for the features that
+        still need it.
+        """
+        self._build_library_view()
+        self.playlist_stack.removeWidget(self.playlist_tree)
+        self.playlist_stack.insertWidget(0, self.library_view)
+        self.playlist_tree.setParent(self.playlist_container)
+        self.playlist_tree.hide()
+        self._refresh_playlist_widget()
+
+    def _on_library_position_activated(self, idx: int):
+        """Double-click on a track in the model/view library (mirrors on_tree_item_double_clicked)"""
+        if not (0 <= idx < len(self.playlist)):
+            return
+        self.play_scope = None
+        self._update_scope_label()
+        self._save_current_position()
+        self.current_index = idx
+        self.play_current()
+        self._highlight_current_row()
+        self._update_up_next()
+
+    def _on_library_group_activated(self, key):
+        """Double-click on a group header in the model/view library: play the group"""
+        indices = self._iter_indices_for_group(key)
+        if not indices:
+            self.status.showMessage(f"No items in group '{key}' to play.", 3000)
+            return
+        self.play_scope = ('group', key)
+        self._update_scope_label()
+        self.current_index = indices[0]
+        self.play_current()
+        self._highlight_current_row()
+        self._update_up_next()
+
+    def _refresh_library_model(self, expansion_state=None):
+        """Model/view counterpart of _refresh_playlist_widget_full"""
+        if not expansion_state:
+            expansion_state = self.library_view.expansion_state()
+        self.playlist_index.invalidate_nodes()
+        self.playlist_index.rebuild(self.playlist)
+        self.library_model.current_index = self.current_index
+        self.library_model.set_playlist(self.playlist, getattr(self, 'group_singles', False))
+        self.library_view.restore_expansion(expansion_state)
+        self.library_header_label.setText(f"Library ({len(self.playlist)})")
+
+        if not self.playlist:
+            self.playlist_stack.setCurrentIndex(1)
+            return
+        self.playlist_stack.setCurrentIndex(0)
+        try:
+            items_needing_duration = [
+                (idx, item) for idx, item in enumerate(self.playlist)
+                if not item.get('duration') and item.get('type') in ('youtube', 'bilibili', 'local')
+            ]
+            if items_needing_duration:
+                self._queue_items_for_background_fetch(items_needing_duration, priority_visible=True)
+        except Exception as e:
+            print(f"Background fetch queue error: {e}")
+
+    def _apply_library_model_edits(self, removed=(), moved=(), inserted=()):
+        """
+        Reflect playlist edits in the model/view library as row removes, moves
+        and inserts instead of a model reset. removed holds positions before
+        the removal, moved (src, dst) pairs in the order they were applied and
+        inserted positions after the insert. Returns False when the tree
+        widget is in use; the caller refreshes it as before.
+        """
+        if getattr(self, 'library_model', None) is None:
+            return False
+        self.up_next_queue.invalidate()
+        for pos in sorted(set(removed), reverse=True):
+            self.library_model.remove_position(pos)
+        for src, dst in moved:
+            self.library_model.move_position(src, dst)
+        for pos in sorted(inserted):
+            self.library_model.insert_position(pos)
+        self.playlist_index.invalidate_nodes()
+        self.playlist_index.rebuild(self.playlist)
+        self.library_model.set_current_index(self.current_index)
+        self.library_header_label.setText(f"Library ({len(self.playlist)})")
+        self.playlist_stack.setCurrentIndex(0 if self.playlist else 1)
+        return True
+
+    def _on_library_position_moved(self, src: int, dst: int):
+        """Track dragged onto another in the model/view library (mirrors PlaylistTree.dropEvent)"""
+        if not (0 <= src < len(self.playlist) and 0 <= dst < len(self.playlist)):
+            return
+        self.playlist.insert(dst, self.playlist.pop(src))
+        if self.current_index == src:
+            self.current_index = dst
+        elif src < self.current_index <= dst:
+            self.current_index -= 1
+        elif dst <= self.current_index < src:
+            self.current_index += 1
+        self._save_current_playlist()
+        self._apply_library_model_edits(moved=[(src, dst)])
+
+    def _library_selected_items(self):
+        """Selected rows of whichever library widget is shown (tree items or LibraryRow)"""
+        if getattr(self, 'library_view', None) is not None:
+            return self.library_view.selectedItems()
+        return self.playlist_tree.selectedItems()
+
     # UI data binding
-    def _refresh_playlist_widget(self, expansion_state=None, incremental_update=False):
+    def _refresh_playlist_widget(self, expansion_state=None, incremental_update=True):
         """Optimized playlist refresh with virtual playlist support"""
         if expansion_state is None:
             expansion_state = {}
+        self._sync_resource_cache()
+        self.up_next_queue.invalidate()  # Playlist or scope may have been reordered
+
+        if getattr(self, 'library_model', None) is not None:
+            self._refresh_library_model(expansion_state)
+            return
 
         # Check if we should use virtual mode
         use_virtual = (hasattr(self, 'virtual_playlist_settings') and 
@@ -8872,6 +9520,7 @@ class MediaPlayer(QMainWindow):
             # Try virtual playlist refresh first
             success = self.playlist_tree.refresh_virtual_playlist(self.playlist, expansion_state)
             if success:
+                self._highlighted_node = None  # Rows were recreated
                 # Update header with virtual mode indicator
                 self.library_header_label.setText(f"Library ({len(self.playlist)}) ⚡ Virtual")
                 
@@ -8886,12 +9535,13 @@ class MediaPlayer(QMainWindow):
                 pass
 
         # Regular playlist refresh
-        # For small playlists or major changes, do full refresh
-        if not incremental_update or len(self.playlist) < 200:
+        # Build from scratch when there is nothing to reconcile against
+        if (not incremental_update or isinstance(self.playlist_tree, VirtualPlaylistWidget)
+                or self.playlist_tree.topLevelItemCount() == 0 or not self.playlist):
             self._refresh_playlist_widget_full(expansion_state)
             return
 
-        # For larger playlists, try incremental update
+        # Otherwise patch the existing rows in place
         try:
             self._refresh_playlist_widget_incremental(expansion_state)
         except Exception:
@@ -8900,6 +9550,11 @@ class MediaPlayer(QMainWindow):
 
     def _refresh_playlist_widget_full(self, expansion_state=None):
         """Full playlist refresh - your existing logic"""
+        self._sync_resource_cache()
+        self.up_next_queue.invalidate()
+        if getattr(self, 'library_model', None) is not None:
+            self._refresh_library_model(expansion_state)
+            return
         if expansion_state is None:
             expansion_state = {}
 
@@ -8915,7 +9570,12 @@ class MediaPlayer(QMainWindow):
         except Exception:
             pass    
 
+        self._highlighted_node = None
         self.playlist_tree.clear()
+        self.lazy_groups.clear()
+        self.playlist_index.invalidate_nodes()
+        self.playlist_index.rebuild(self.playlist)
+        self.group_aggregates.rebuild(self.playlist)  # Group membership may have changed
         # Update the header
         self.library_header_label.setText(f"Library ({len(self.playlist)})")
 
@@ -8955,18 +9615,12 @@ class MediaPlayer(QMainWindow):
                 gnode.setIcon(0, QIcon(chev_px))
             except Exception:
                 pass
+            self._set_group_header(gnode, norm_key, ptitle)
+            if not is_expanded and self._lazy_groups_enabled():
+                self._defer_group_children(gnode, norm_key, [idx for idx, _ in arr])
+                continue
             for idx, it in arr:
-                icon = playlist_icon_for_type(it.get('type'))
-                duration_str = format_duration_from_seconds(it.get('duration', 0))
-                node = QTreeWidgetItem([it.get('title', 'Unknown'), duration_str])
-                node.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
-                if isinstance(icon, QIcon):
-                    node.setIcon(0, icon)
-                else:
-                    node.setText(0, f"{icon} {it.get('title', 'Unknown')}")
-                node.setFont(0, self._font_serif_no_size(italic=True, bold=True))
-                node.setData(0, Qt.UserRole, ('current', idx, it))
-                gnode.addChild(node)
+                gnode.addChild(self._new_playlist_node(idx, it))
 
         # --- Render single items ---
         if single_items:
@@ -8979,29 +9633,18 @@ class MediaPlayer(QMainWindow):
                 is_expanded = expansion_state.get('miscellaneous', False)
                 gnode.setExpanded(is_expanded)
                 
+                self._set_group_header(gnode, 'miscellaneous', 'Miscellaneous')
+                if not is_expanded and self._lazy_groups_enabled():
+                    self._defer_group_children(gnode, 'miscellaneous', [idx for idx, _ in single_items])
+                    single_items = []
                 for idx, it in single_items:
-                    icon = playlist_icon_for_type(it.get('type'))
-                    duration_str = format_duration_from_seconds(it.get('duration', 0))
-                    node = QTreeWidgetItem([it.get('title', 'Unknown'), duration_str])
-                    node.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
-                    if isinstance(icon, QIcon):
-                        node.setIcon(0, icon)
-                    else:
-                        node.setText(0, f"{icon} {it.get('title', 'Unknown')}")
-                    node.setFont(0, self._font_serif_no_size(italic=True, bold=True))
-                    node.setData(0, Qt.UserRole, ('current', idx, it))
-                    gnode.addChild(node)
+                    gnode.addChild(self._new_playlist_node(idx, it))
             else:
                 for idx, it in single_items:
-                    icon = playlist_icon_for_type(it.get('type'))
-                    duration_str = format_duration_from_seconds(it.get('duration', 0))
-                    node = QTreeWidgetItem(self.playlist_tree, [it.get('title', 'Unknown'), duration_str])
-                    if isinstance(icon, QIcon):
-                        node.setIcon(0, icon)
-                    else:
-                        node.setText(0, f"{icon} {it.get('title', 'Unknown')}")
-                    node.setFont(0, self._font_serif_no_size(italic=True, bold=True))
-                    node.setData(0, Qt.UserRole, ('current', idx, it))
+                    self._new_playlist_node(idx, it, parent=self.playlist_tree)
+
+        self.playlist_index.nodes_complete = True
+        self._highlight_current_row(scroll=False)
 
         # Show empty state if needed
         if not self.playlist:
@@ -9022,10 +9665,168 @@ class MediaPlayer(QMainWindow):
                 print(f"Background fetch queue error: {e}")
 
     def _refresh_playlist_widget_incremental(self, expansion_state=None):
-        """Incremental update - only update what changed"""
-        # This is a more complex optimization - for now, just do full refresh
-        # You could implement this later if needed for very large playlists
-        self._refresh_playlist_widget_full(expansion_state)
+        """Incremental update - only update what changed.
+
+        Rows are matched to playlist items by stable ID, and only the inserts,
+        removals and moves computed by library.reconcile are applied, so
+        expansion, selection and scroll position survive. Raises on any
+        inconsistency; the caller falls back to a full refresh.
+        """
+        if expansion_state is None:
+            expansion_state = {}
+        tree = self.playlist_tree
+        root = tree.invisibleRootItem()
+        self.group_aggregates.rebuild(self.playlist)  # Group membership may have changed
+
+        # --- Snapshot the existing rows ---
+        group_nodes = {}  # group key -> node
+        group_children = {}  # group key -> [child nodes]
+        top_entries = []  # ('group', key) or ('item', node), in row order
+        old_nodes = []  # (position the row was built for, node)
+        for i in range(tree.topLevelItemCount()):
+            top = tree.topLevelItem(i)
+            data = top.data(0, Qt.UserRole)
+            if isinstance(data, tuple) and data[0] == 'group':
+                children = [top.child(j) for j in range(top.childCount())]
+                group_nodes[data[1]] = top
+                group_children[data[1]] = children
+                top_entries.append(('group', data[1]))
+                for child in children:
+                    cdata = child.data(0, Qt.UserRole)
+                    old_nodes.append((cdata[1], child))
+            elif isinstance(data, tuple) and data[0] == 'current':
+                top_entries.append(('item', top))
+                old_nodes.append((data[1], top))
+            else:
+                raise ValueError("Unrecognized top-level row")
+
+        # Number duplicates in the order the rows were built (playlist order then)
+        old_nodes.sort(key=lambda entry: entry[0])
+        old_keys = stable_keys(node.data(0, Qt.UserRole)[2].get('url', '') for _, node in old_nodes)
+        node_by_key = {key: node for key, (_, node) in zip(old_keys, old_nodes)}
+        key_by_node = {id(node): key for key, (_, node) in zip(old_keys, old_nodes)}
+        old_top = [entry if entry[0] == 'group' else ('item', key_by_node[id(entry[1])]) for entry in top_entries]
+
+        # --- Target layout ---
+        new_keys = stable_keys(it.get('url', '') for it in self.playlist)
+        pos_by_key = {key: pos for pos, key in enumerate(new_keys)}
+        layout = group_layout(self.playlist, getattr(self, 'group_singles', False))
+        new_top = [('group', key) if key is not None else ('item', new_keys[positions[0]])
+                   for key, _, positions in layout]
+        new_children = {key: [new_keys[p] for p in positions] for key, _, positions in layout if key is not None}
+
+        selected = tree.selectedItems()
+        was_expanded = {key: gnode.isExpanded() for key, gnode in group_nodes.items()}
+        scroll_value = tree.verticalScrollBar().value()
+        new_positions = []
+
+        tree.setUpdatesEnabled(False)
+        try:
+            # Take out removed and moved rows everywhere before inserting anything,
+            # so a row that changes group is reused rather than rebuilt
+            child_plans = {}
+            for gkey, gnode in group_nodes.items():
+                if self.lazy_groups.is_pending(gkey):
+                    continue  # No child rows yet
+                plan = plan_children([key_by_node[id(c)] for c in group_children[gkey]], new_children.get(gkey, []))
+                child_plans[gkey] = plan
+                for key in plan.removed + plan.moved:
+                    gnode.removeChild(node_by_key[key])
+            top_plan = plan_children(old_top, new_top)
+            for kind, key in top_plan.removed + top_plan.moved:
+                root.removeChild(group_nodes[key] if kind == 'group' else node_by_key[key])
+                if kind == 'group' and key not in new_children:
+                    self.lazy_groups.forget(key)
+
+            def _node_for(key, pos):
+                node = node_by_key.get(key)
+                if node is None:
+                    node = node_by_key[key] = self._new_playlist_node(pos, self.playlist[pos])
+                    new_positions.append(pos)
+                return node
+
+            titles = {key: title for key, title, _ in layout if key is not None}
+            for row, (kind, key) in top_plan.inserts:
+                if kind == 'group':
+                    gnode = group_nodes.get(key)
+                    if gnode is None:
+                        gnode = group_nodes[key] = self._new_group_node(key, titles[key])
+                        if self._lazy_groups_enabled() and not expansion_state.get(key, False):
+                            self._defer_group_children(gnode, key, [])
+                        else:
+                            child_plans[key] = plan_children([], new_children[key])
+                    root.insertChild(row, gnode)
+                    gnode.setExpanded(was_expanded.get(key, expansion_state.get(key, False)))
+                else:
+                    root.insertChild(row, _node_for(key, pos_by_key[key]))
+
+            pending_positions = set()
+            for gkey, title, positions in layout:
+                if gkey is None:
+                    continue
+                gnode = group_nodes[gkey]
+                if self.lazy_groups.is_pending(gkey):
+                    self.lazy_groups.defer(gkey, positions)
+                    pending_positions.update(positions)
+                else:
+                    for row, key in child_plans[gkey].inserts:
+                        gnode.insertChild(row, _node_for(key, positions[row]))
+                self._set_group_header(gnode, gkey, title)
+
+            # Renumber every row and refresh text that changed
+            index = self.playlist_index
+            index.invalidate_nodes()
+            index.rebuild(self.playlist)
+            for pos, it in enumerate(self.playlist):
+                if pos in pending_positions:
+                    continue  # Built when its group is first expanded
+                node = node_by_key[new_keys[pos]]
+                self._sync_playlist_node(node, pos, it)
+                index.set_node(pos, node)
+            index.nodes_complete = True
+
+            # Rows that were taken out and reinserted lose their selection
+            for node in selected:
+                try:
+                    if node.treeWidget() is tree:
+                        node.setSelected(True)
+                except RuntimeError:
+                    pass
+        finally:
+            tree.setUpdatesEnabled(True)
+        tree.verticalScrollBar().setValue(scroll_value)
+
+        self.library_header_label.setText(f"Library ({len(self.playlist)})")
+        self._highlight_current_row(scroll=False)
+        if self.playlist_stack.currentIndex() == 1:
+            self.playlist_stack.setCurrentIndex(0)
+
+        try:
+            items_needing_duration = [
+                (pos, self.playlist[pos]) for pos in new_positions
+                if not self.playlist[pos].get('duration') and self.playlist[pos].get('type') in ('youtube', 'bilibili', 'local')
+            ]
+            if items_needing_duration:
+                self._queue_items_for_background_fetch(items_needing_duration, priority_visible=True)
+        except Exception as e:
+            print(f"Background fetch queue error: {e}")
+
+    def _sync_playlist_node(self, node, index: int, item: dict):
+        """Point an existing row at playlist[index] and update its text if it changed"""
+        data = node.data(0, Qt.UserRole)
+        if not (isinstance(data, tuple) and len(data) >= 3 and data[1] == index and data[2] is item):
+            node.setData(0, Qt.UserRole, ('current', index, item))
+
+        title = item.get('title', 'Unknown')
+        icon = playlist_icon_for_type(item.get('type'))
+        expected = title if isinstance(icon, QIcon) else f"{icon} {title}"
+        shown = node.text(0)
+        playing = shown.startswith('▶ ')
+        if (shown[2:] if playing else shown) != expected:
+            node.setText(0, f"▶ {expected}" if playing else expected)
+        duration_str = format_duration_from_seconds(item.get('duration', 0))
+        if node.text(1) != duration_str:
+            node.setText(1, duration_str)
 
     # Helper methods for Virtual Playlist Widget
     def _create_tree_widget_item(self, title: str, duration_str: str):
@@ -9089,9 +9890,13 @@ class MediaPlayer(QMainWindow):
             self.playlist_tree.setIndentation(20)
             self.playlist_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
             self.playlist_tree.itemDoubleClicked.connect(self.on_tree_item_double_clicked)
+            self.playlist_tree.itemExpanded.connect(self._on_tree_group_expanded)
+            self.playlist_tree.itemCollapsed.connect(self._on_tree_group_collapsed)
             self.playlist_tree.setContextMenuPolicy(Qt.CustomContextMenu)
             self.playlist_tree.customContextMenuRequested.connect(self._show_playlist_context_menu)
             self.playlist_tree.mousePressEvent = self._create_mouse_press_handler()
+            self.lazy_groups.clear()
+            self._track_visible_indices(self.playlist_tree)
             self.playlist_tree.setFont(self._font_serif_no_size(italic=True, bold=True))
             self.playlist_tree.setIconSize(QSize(24, 24))
             
@@ -9113,6 +9918,8 @@ class MediaPlayer(QMainWindow):
     def _get_tree_expansion_state(self):
         """Saves the expansion state of all group items in the playlist tree with improved error handling."""
         state = {}
+        if getattr(self, 'library_view', None) is not None:
+            return self.library_view.expansion_state()
         try:
             # Ensure playlist_tree exists and is accessible
             if not hasattr(self, 'playlist_tree') or not self.playlist_tree:
@@ -9291,6 +10098,13 @@ class MediaPlayer(QMainWindow):
         except Exception:
             return False
 
+    def _item_is_watched(self, item) -> bool:
+        return self._is_completed_url(item.get('url'))
+
+    def _item_resume_seconds(self, item) -> float:
+        positions = getattr(self, 'playback_positions', None) or {}
+        return (positions.get(item.get('url')) or 0) / 1000.0
+
     def _apply_filters_to_tree(self, *_args):
         try:
             root = self.playlist_tree.topLevelItem(0)
@@ -9299,6 +10113,9 @@ class MediaPlayer(QMainWindow):
             text = (self.search_bar.text() if hasattr(self, 'search_bar') else '') or ''
             text = text.strip().lower()
             uw = bool(getattr(self, 'unwatched_only', False))
+            if text or uw:
+                self._ensure_group_populated(root)
+            self._invalidate_visible_indices()
             def apply(node):
                 data = node.data(0, Qt.UserRole)
                 if isinstance(data, tuple) and data[0] == 'current':
@@ -9417,77 +10234,111 @@ class MediaPlayer(QMainWindow):
                     if hasattr(self, 'up_next_container'):
                         self.up_next_container.setVisible(True)
 
-                # Rest of your existing code for populating the song list...
-                self.up_next.clear()
-                indices = self._scope_indices()
-
-                if not indices:
-                    return
-
-                try:
-                    curpos = indices.index(self.current_index) if self.current_index in indices else -1
-                except Exception:
-                    curpos = -1
-
-                upcoming = []
-                if curpos >= 0:
-                    upcoming = indices[curpos + 1:curpos + 6]
-                else:
-                    upcoming = indices[:5]
+                # The playback order is cached; a track change only slices it
+                signature = (self.play_scope, id(self.playlist), len(self.playlist))
+                if not self.up_next_queue.is_valid(signature):
+                    self.up_next_queue.set_order(self._scope_indices(), signature)
 
+                skip = None
                 if getattr(self, 'unwatched_only', False):
-                    upcoming = [i for i in upcoming if not self._is_completed_url(self.playlist[i].get('url'))]
+                    skip = lambda i: self._is_completed_url(self.playlist[i].get('url'))
+                upcoming = self.up_next_queue.window(self.current_index, skip)
 
                 # Add smart queue suggestions when enabled and queue is short
                 smart_suggestions = {}  # Map index to (icon, reason) for smart suggestions
                 if (hasattr(self, 'smart_queue_settings') and self.smart_queue_settings.enabled and 
                     len(upcoming) < 5):  # Only add suggestions when queue isn't full
-                    try:
-                        current_item = None
-                        if 0 <= self.current_index < len(self.playlist):
-                            current_item = self.playlist[self.current_index]
-                        
-                        suggestions = self.smart_queue_manager.get_suggestions(
-                            current_item, self.playlist, self.current_index, upcoming
-                        )
-                        
-                        # Add suggestions to the upcoming list and track them
-                        for suggestion_idx, reason_icon, reason_text in suggestions:
-                            if len(upcoming) >= 5:  # Respect the original 5-item limit
-                                break
-                            upcoming.append(suggestion_idx)
-                            smart_suggestions[suggestion_idx] = (reason_icon, reason_text)
-                            
-                    except Exception as e:
-                        print(f"Smart Queue: Error getting suggestions: {e}")
-
-                for i in upcoming:
-                    if 0 <= i < len(self.playlist):
-                        it = self.playlist[i]
-                        title = it.get('title', 'Unknown')
-                        icon = playlist_icon_for_type(it.get('type'))
-                        
-                        # Check if this is a smart suggestion
-                        smart_indicator = ""
-                        if i in smart_suggestions:
-                            reason_icon, reason_text = smart_suggestions[i]
-                            smart_indicator = f"{reason_icon} "
-
-                        node = QTreeWidgetItem()
-
-                        if isinstance(icon, QIcon):
-                            display_title = f"{smart_indicator}{title}" if smart_indicator else title
-                            node.setText(0, display_title)
-                            node.setIcon(0, icon)
-                        else:
-                            display_title = f"{smart_indicator}{icon} {title}" if smart_indicator else f"{icon} {title}"
-                            node.setText(0, display_title)
+                    # Computed off the GUI thread; they are appended once ready
+                    for suggestion_idx, reason_icon, reason_text in self._up_next_suggestions_for(upcoming):
+                        if len(upcoming) >= 5:  # Respect the original 5-item limit
+                            break
+                        upcoming.append(suggestion_idx)
+                        smart_suggestions[suggestion_idx] = (reason_icon, reason_text)
 
-                        node.setData(0, Qt.UserRole, ('next', i))
-                        node.setData(0, Qt.UserRole + 1, title)
-                        self.up_next.addTopLevelItem(node)
+                self._apply_up_next_rows(upcoming, smart_suggestions)
         except Exception:
             pass
+
+    def _up_next_suggestions_for(self, upcoming):
+        """Suggestions for this queue if a worker already computed them; otherwise start one and return []"""
+        key = (self.current_index, tuple(upcoming), len(self.playlist), id(self.playlist))
+        done_key, suggestions = self._up_next_suggestions
+        if done_key == key:
+            return suggestions
+        if self._up_next_request == key:
+            return []  # Already being computed
+        self._up_next_request = key
+        self._suggestion_generation += 1
+        current_item = None
+        if 0 <= self.current_index < len(self.playlist):
+            current_item = self.playlist[self.current_index]
+        worker = SmartQueueSuggestionWorker(
+            self.smart_queue_manager.snapshot(), current_item, list(self.playlist), self.current_index,
+            list(upcoming), self._suggestion_generation, parent=self
+        )
+        worker.suggestionsReady.connect(self._on_up_next_suggestions_ready)
+        worker.finished.connect(lambda w=worker: self._suggestion_workers.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._suggestion_workers.add(worker)
+        worker.start()
+        return []
+
+    def _on_up_next_suggestions_ready(self, generation, suggestions):
+        if generation != self._suggestion_generation:
+            return  # The queue moved on while this was computed
+        self._up_next_suggestions = (self._up_next_request, list(suggestions or []))
+        self._up_next_request = None
+        if self._up_next_suggestions[1]:
+            self._update_up_next()
+
+    def _apply_up_next_rows(self, upcoming, smart_suggestions):
+        """Update the Up Next rows in place: keep unchanged rows, move, remove or insert the rest"""
+        theme = getattr(self, 'theme', 'dark')
+        specs = {}
+        new_keys = []
+        for i in upcoming:
+            if 0 <= i < len(self.playlist):
+                it = self.playlist[i]
+                reason_icon = smart_suggestions[i][0] if i in smart_suggestions else ""
+                key = (i, it.get('title', 'Unknown'), it.get('type'), reason_icon, theme)
+                if key not in specs:
+                    specs[key] = (i, it, reason_icon)
+                    new_keys.append(key)
+
+        nodes = {}
+        for row in range(self.up_next.topLevelItemCount()):
+            node = self.up_next.topLevelItem(row)
+            nodes[node.data(0, Qt.UserRole + 2)] = node
+        plan = plan_children(list(nodes), new_keys)
+        if plan.is_noop:
+            return
+
+        for key in plan.removed + plan.moved:
+            self.up_next.takeTopLevelItem(self.up_next.indexOfTopLevelItem(nodes[key]))
+        for row, key in plan.inserts:
+            node = nodes.get(key)
+            if node is None:
+                i, it, reason_icon = specs[key]
+                node = self._new_up_next_node(i, it, f"{reason_icon} " if reason_icon else "")
+                node.setData(0, Qt.UserRole + 2, key)
+            self.up_next.insertTopLevelItem(row, node)
+
+    def _new_up_next_node(self, i, it, smart_indicator=""):
+        title = it.get('title', 'Unknown')
+        icon = playlist_icon_for_type(it.get('type'))
+        node = QTreeWidgetItem()
+
+        if isinstance(icon, QIcon):
+            display_title = f"{smart_indicator}{title}" if smart_indicator else title
+            node.setText(0, display_title)
+            node.setIcon(0, icon)
+        else:
+            display_title = f"{smart_indicator}{icon} {title}" if smart_indicator else f"{icon} {title}"
+            node.setText(0, display_title)
+
+        node.setData(0, Qt.UserRole, ('next', i))
+        node.setData(0, Qt.UserRole + 1, title)
+        return node
         
     def _on_up_next_double_clicked(self, item, column):
         try:
@@ -9519,7 +10370,7 @@ class MediaPlayer(QMainWindow):
 
     def _selected_current_indices(self):
         try:
-            nodes = self.playlist_tree.selectedItems()
+            nodes = self._library_selected_items()
             idxs = []
             for n in nodes:
                 data = n.data(0, Qt.UserRole)
@@ -9548,7 +10399,8 @@ class MediaPlayer(QMainWindow):
                         self.current_index -= 1
             
             self._save_current_playlist()
-            self._refresh_playlist_widget()
+            if not self._apply_library_model_edits(removed=idxs):
+                self._refresh_playlist_widget()
             self._recover_current_after_change(was_playing)
             self.status.showMessage(f"Removed {len(idxs)} items", 3000)
         except Exception as e:
@@ -9587,58 +10439,83 @@ class MediaPlayer(QMainWindow):
         except Exception:
             pass
 
-    def _highlight_current_row(self):
-        """Highlight the currently playing item with icon and bold text"""
-        try:
-            # Get fonts
-            default_font = self._font_serif_no_size(italic=True, bold=True)
-            playing_font = self._font_serif_no_size(italic=True, bold=True)
-            playing_font.setWeight(QFont.ExtraBold)
-
-            iterator = QTreeWidgetItemIterator(self.playlist_tree)
-            item_to_scroll_to = None
+    def _highlight_current_row(self, scroll=True):
+        """Highlight the currently playing item with icon and bold text.
 
-            while iterator.value():
-                item = iterator.value()
-                data = item.data(0, Qt.UserRole)
+        Only the previously highlighted node and the current one are touched.
+        """
+        if getattr(self, 'library_model', None) is not None:
+            self.library_model.set_current_index(self.current_index)
+            if scroll:
+                self.library_view.scroll_to_position(self.current_index)
+            return
+        if isinstance(self.playlist_tree, VirtualPlaylistWidget) and self.playlist_tree.virtual_active:
+            # Pool rows take the now-playing style when they are bound
+            self._highlighted_node = None
+            if scroll and self.current_index >= 0:
+                self.playlist_tree.scroll_to_playlist_index(self.current_index)
+            else:
+                self.playlist_tree.rebind_visible()
+            return
+        try:
+            node = self._find_current_tree_node()
+            if node is None and scroll and self._populate_lazy_group_for_index(self.current_index):
+                node = self._find_current_tree_node()
+            previous = getattr(self, '_highlighted_node', None)
+            if previous is not None and previous is not node:
+                try:
+                    self._style_playing_node(previous, False)
+                except RuntimeError:
+                    pass  # Node was deleted by a rebuild
+            self._highlighted_node = node
+            if node is None:
+                return
 
-                if isinstance(data, tuple) and data[0] == 'current':
-                    idx = data[1]
-                    
-                    # Get the original text without any playing indicators
-                    original_text = item.text(0)
-                    if original_text.startswith('▶ '):
-                        original_text = original_text[2:]
-
-                    if idx == self.current_index:
-                        item.setText(0, f"▶ {original_text}")
-                        item.setFont(0, playing_font)
-                        text_color = QColor("#d1603f")      # Slightly deeper orange
-                        item.setForeground(0, text_color)
-                        # Add subtle background highlight
-                        item.setBackground(0, QColor(231, 111, 81, 25))  # Very subtle orange background
-
-                        # Set the theme-appropriate highlight color
-                        text_color = QColor("#e76f51") # Same for both themes
-                        item.setForeground(0, text_color)
-                        
-                        # Mark this item to scroll to it later
-                        item_to_scroll_to = item
+            self._style_playing_node(node, True)
+            if scroll:
+                self.playlist_tree.scrollToItem(node, QAbstractItemView.PositionAtCenter)
 
-                    else:
-                        # Not the current item - restore normal appearance
-                        item.setText(0, original_text)
-                        item.setFont(0, default_font)
-                        item.setForeground(0, QBrush()) # Resets to default color
+        except Exception as e:
+            logger.error(f"Highlight row failed: {e}")
 
-                iterator += 1
+    def _find_current_tree_node(self):
+        """Tree node of the current item (None if nothing is playing or it isn't shown)"""
+        idx = self.current_index
+        if idx is None or idx < 0:
+            return None
+        if not isinstance(self.playlist_tree, VirtualPlaylistWidget):
+            return self._tree_node_for_index(idx)
+        # Virtual rows aren't in the node map; search the materialized items
+        iterator = QTreeWidgetItemIterator(self.playlist_tree)
+        while iterator.value():
+            item = iterator.value()
+            if self._tree_node_matches(item, idx):
+                return item
+            iterator += 1
+        return None
 
-            # Scroll to the highlighted item after all styling is applied
-            if item_to_scroll_to:
-                self.playlist_tree.scrollToItem(item_to_scroll_to, QAbstractItemView.PositionAtCenter)
+    def _style_playing_node(self, item, playing: bool):
+        """Apply or clear the now-playing styling on one tree node"""
+        # Get the original text without any playing indicators
+        original_text = item.text(0)
+        if original_text.startswith('▶ '):
+            original_text = original_text[2:]
 
-        except Exception as e:
-            logger.error(f"Highlight row failed: {e}")
+        if playing:
+            playing_font = self._font_serif_no_size(italic=True, bold=True)
+            playing_font.setWeight(QFont.ExtraBold)
+            item.setText(0, f"▶ {original_text}")
+            item.setFont(0, playing_font)
+            # Add subtle background highlight
+            item.setBackground(0, QColor(231, 111, 81, 25))  # Very subtle orange background
+            # Set the theme-appropriate highlight color
+            item.setForeground(0, QColor("#e76f51"))  # Same for both themes
+        else:
+            # Not the current item - restore normal appearance
+            item.setText(0, original_text)
+            item.setFont(0, self._font_serif_no_size(italic=True, bold=True))
+            item.setForeground(0, QBrush())  # Resets to default color
+            item.setBackground(0, QBrush())
         
     def _on_title_resolved(self, url: str, title: str):
         """
@@ -9646,108 +10523,130 @@ class MediaPlayer(QMainWindow):
         It's safe to update the UI from here.
         """
         try:
-            # Find the item in our playlist that corresponds to this URL
-            for item in self.playlist:
-                if item.get('url') == url:
-                    item['title'] = title
-                    break
+            positions = self.playlist_index.positions(url, self.playlist)
+            
+            # Combined metadata may already have applied this title
+            if not any(self.playlist[i].get('title') != title or self.playlist[i].get('needs_title')
+                       for i in positions):
+                return
+            
+            # Update every playlist entry for this URL (duplicates included)
+            for i in positions:
+                self.playlist[i]['title'] = title
+                self.playlist[i]['needs_title'] = False
+            
+            if getattr(self, 'metadata_cache', None):
+                self.metadata_cache.set(url, title=title)
+            if getattr(self, 'backfill_job', None):
+                self.backfill_job.mark_done('title', url)
             
             # Now, update the UI (the playlist tree)
             self._update_tree_item_title(url, title)
             
             # If this is the currently playing track, update the main title label
-            if self.current_index >= 0 and self.playlist[self.current_index].get('url') == url:
+            if self.current_index in positions:
                 self._set_track_title(title)
                 
-            # Save the changes to the playlist file
-            self._save_current_playlist()
+            # Save the changes to the playlist file (debounced; bulk resolution calls this often)
+            self._schedule_save_current_playlist()
             
         except Exception as e:
             print(f"Error in _on_title_resolved: {e}")
 
     def _update_single_tree_item_title(self, url: str, title: str):
         """Update just one tree item instead of rebuilding everything"""
-        try:
-            iterator = QTreeWidgetItemIterator(self.playlist_tree)
-            while iterator.value():
-                item = iterator.value()
-                data = item.data(0, Qt.UserRole)
-                if isinstance(data, tuple) and data[0] == 'current':
-                    _, idx, item_data = data
-                    if isinstance(item_data, dict) and item_data.get('url') == url:
-                        # Update the tree item text and icon
-                        icon = playlist_icon_for_type(item_data.get('type'))
-                        if isinstance(icon, QIcon):
-                            item.setText(0, title)
-                            item.setIcon(0, icon)
-                        else:
-                            item.setText(0, f"{icon} {title}")
-                        
-                        # Clear loading style
-                        font = item.font(0)
-                        font.setItalic(False)
-                        item.setFont(0, font)
-                        item.setForeground(0, QBrush())
-                        
-                        # Update the data reference
-                        item_data['title'] = title
-                        item.setData(0, Qt.UserRole, ('current', idx, item_data))
-                        break
-                iterator += 1
-        except Exception as e:
-            print(f"Update single tree item failed: {e}")
+        self._update_tree_item_title(url, title)
 
     def _update_item_title(self, url: str, title: str):
         """Update item title with optimized tree search"""
-        updated = False
-        for it in self.playlist:
-            if it.get('url') == url:
-                it['title'] = title
-                updated = True
-                break
+        positions = self.playlist_index.positions(url, self.playlist)
+        for pos in positions:
+            self.playlist[pos]['title'] = title
         
-        if updated:
-            self._save_current_playlist()
-            # OPTIMIZED: Find and update specific tree item instead of walking entire tree
+        if positions:
+            self._schedule_save_current_playlist()
             self._update_tree_item_title(url, title)
             
             # Update now playing label if this is current
-            if 0 <= self.current_index < len(self.playlist):
-                if self.playlist[self.current_index].get('url') == url:
-                    self._set_track_title(title)
+            if self.current_index in positions:
+                self._set_track_title(title)
 
     def _update_tree_item_title(self, url: str, title: str):
         """Update specific tree item title without full refresh"""
+        if getattr(self, 'library_model', None) is not None:
+            for idx in self.playlist_index.positions(url, self.playlist):
+                self.library_model.item_changed(idx)
+            return
+        if isinstance(self.playlist_tree, VirtualPlaylistWidget) and self.playlist_tree.virtual_active:
+            for idx in self.playlist_index.positions(url, self.playlist):
+                self.playlist_tree.refresh_index(idx)
+            return
         try:
-            iterator = QTreeWidgetItemIterator(self.playlist_tree)
-            while iterator.value():
-                item = iterator.value()
-                data = item.data(0, Qt.UserRole)
-                if isinstance(data, tuple) and data[0] == 'current':
-                    _, idx, item_data = data
-                    if isinstance(item_data, dict) and item_data.get('url') == url:
-                        # Update the tree item
-                        icon = playlist_icon_for_type(item_data.get('type'))
-                        if isinstance(icon, QIcon):
-                            item.setText(0, title)
-                            item.setIcon(0, icon)
-                        else:
-                            item.setText(0, f"{icon} {title}")
+            for idx in self.playlist_index.positions(url, self.playlist):
+                item = self._tree_node_for_index(idx)
+                if item is None:
+                    continue
+                _, _, item_data = item.data(0, Qt.UserRole)
+                if not isinstance(item_data, dict):
+                    continue
 
-                        # Reset the item's style from its loading state
-                        font = item.font(0)
-                        font.setItalic(False)
-                        item.setFont(0, font)
-                        item.setForeground(0, QBrush()) # Resets to default color
-                        
-                        # Update the data reference
-                        item_data['title'] = title
-                        item.setData(0, Qt.UserRole, ('current', idx, item_data))
-                        break
-                iterator += 1
+                # Update the tree item
+                icon = playlist_icon_for_type(item_data.get('type'))
+                if isinstance(icon, QIcon):
+                    item.setText(0, title)
+                    item.setIcon(0, icon)
+                else:
+                    item.setText(0, f"{icon} {title}")
+
+                # Reset the item's style from its loading state
+                font = item.font(0)
+                font.setItalic(False)
+                item.setFont(0, font)
+                item.setForeground(0, QBrush()) # Resets to default color
+                
+                # Update the data reference
+                item_data['title'] = title
+                item.setData(0, Qt.UserRole, ('current', idx, item_data))
+                if item is getattr(self, '_highlighted_node', None):
+                    self._style_playing_node(item, True)  # Keep the now-playing marker
         except Exception as e:
             print(f"Update tree item title failed: {e}")
 
+    def _tree_node_for_index(self, idx: int):
+        """Tree node for a playlist index via the maintained node map (None if not shown)"""
+        if isinstance(self.playlist_tree, VirtualPlaylistWidget) and self.playlist_tree.virtual_active:
+            return None
+        index = self.playlist_index
+        node = index.node(idx)
+        if node is not None and self._tree_node_matches(node, idx):
+            return node
+        if node is None and index.nodes_complete:
+            return None
+        # Stale map (tree changed behind our back): re-register nodes once
+        self._reindex_tree_nodes()
+        node = index.node(idx)
+        return node if node is not None and self._tree_node_matches(node, idx) else None
+
+    def _tree_node_matches(self, node, idx: int) -> bool:
+        try:
+            data = node.data(0, Qt.UserRole)
+        except RuntimeError:
+            return False  # Underlying C++ item was deleted
+        return isinstance(data, tuple) and len(data) >= 2 and data[0] == 'current' and data[1] == idx
+
+    def _reindex_tree_nodes(self):
+        """Re-register every playlist node in the node map (one tree walk)"""
+        index = self.playlist_index
+        index.invalidate_nodes()
+        iterator = QTreeWidgetItemIterator(self.playlist_tree)
+        while iterator.value():
+            node = iterator.value()
+            data = node.data(0, Qt.UserRole)
+            if isinstance(data, tuple) and len(data) >= 2 and data[0] == 'current':
+                index.set_node(data[1], node)
+            iterator += 1
+        index.nodes_complete = True
+
     def _toggle_group(self, checked):
         """Toggle grouped view and refresh the playlist tree."""
         self.grouped_view = bool(checked)
@@ -9944,13 +10843,18 @@ class MediaPlayer(QMainWindow):
                 if self.play_scope is None:
                     # No specific group selected, default to "Library"
                     self.scope_dropdown.setCurrentText("Library")
+                    totals = self.group_aggregates.library_totals(self.playlist)
                 else:
                     # A group is selected (e.g., playlist or media type)
+                    totals = None
                     kind, key = self.play_scope
                     if kind == 'group':
                         # Update dropdown to show the correct group name
                         name = self._scope_title_from_key(key)
                         self.scope_dropdown.setCurrentText(name)
+                        totals = self.group_aggregates.totals(key, self.playlist)
+                # Scope summary from the maintained aggregates (source-type scopes have none)
+                self.scope_dropdown.setToolTip(self._totals_summary(totals) if totals else "")
             except Exception as e:
                 # Log any errors for debugging
                 print(f"[ScopeLabel] Error updating scope label: {e}")   
@@ -10481,7 +11385,7 @@ class MediaPlayer(QMainWindow):
                     # Deduplicate by URL
                     if any(it.get('url') == u for it in self.playlist):
                         continue
-                    self.playlist.append({'title': title, 'url': u, 'type': t})
+                    self.playlist.append({'title': title, 'url': u, 'type': t, 'needs_title': t != 'local'})
                     added += 1
             if added:
                 self._save_current_playlist(); self._refresh_playlist_widget()
@@ -10499,7 +11403,9 @@ class MediaPlayer(QMainWindow):
                 self.current_index = 0
             elif idx < self.current_index:
                 self.current_index -= 1
-            self._save_current_playlist(); self._refresh_playlist_widget()
+            self._save_current_playlist()
+            if not self._apply_library_model_edits(moved=[(idx, 0)]):
+                self._refresh_playlist_widget()
             self._highlight_current_row()
         except Exception:
             pass
@@ -10514,7 +11420,9 @@ class MediaPlayer(QMainWindow):
                 self.current_index = len(self.playlist) - 1
             elif idx < self.current_index:
                 self.current_index -= 1
-            self._save_current_playlist(); self._refresh_playlist_widget()
+            self._save_current_playlist()
+            if not self._apply_library_model_edits(moved=[(idx, len(self.playlist) - 1)]):
+                self._refresh_playlist_widget()
             self._highlight_current_row()
         except Exception:
             pass
@@ -10639,11 +11547,13 @@ class MediaPlayer(QMainWindow):
                 self._show_loading("Checking playlist...")
                 loader = PlaylistLoaderThread(url, media_type)
                 self._playlist_loader = loader
+                self._playlist_load_counts = {'received': 0, 'added': 0, 'failed': False}
                 loader.itemsReady.connect(self._on_playlist_items_ready)
                 loader.progressUpdate.connect(self._update_loading_progress)
                 
                 def handle_playlist_error(error_msg):
                     try:
+                        self._playlist_load_counts['failed'] = True
                         self._hide_loading()
                         QMessageBox.warning(self, "Playlist Load Failed", 
                             f"Could not load playlist:\n{url[:80]}...\n\nReason: {error_msg}")
@@ -10651,19 +11561,18 @@ class MediaPlayer(QMainWindow):
                         print(f"Playlist load failed: {error_msg}")
                 
                 loader.error.connect(handle_playlist_error)
-                loader.finished.connect(lambda: (
-                    loader.deleteLater(),
-                    setattr(self, '_playlist_loader', None)
-                ))
+                loader.finished.connect(lambda: self._on_playlist_loader_finished(loader))
                 loader.start()
                 return # Stop here, the loader will handle adding items
 
             # --- Simplified single item logic ---
             # If we've reached here, it's a single item (local or network)
             title = Path(url).name if media_type == 'local' else f"[Loading...] {url_lower.split('/')[-1]}"
-            item = {'title': title, 'url': url, 'type': media_type}
+            item = {'title': title, 'url': url, 'type': media_type, 'needs_title': media_type != 'local'}
             new_index = len(self.playlist)
             self.playlist.append(item)
+            self.playlist_index.append(item, self.playlist)
+            self.group_aggregates.extend([item], self.playlist)
 
             self._add_undo_operation('add_items', {
                 'items': [{'index': new_index, 'item': item}],
@@ -10684,10 +11593,17 @@ class MediaPlayer(QMainWindow):
             self.status.showMessage(f"Failed to add media: {e}", 4000)
 
     def _fetch_all_durations(self):
-        """Fetch durations for all items in playlist with cancel support"""
+        """Start (or show) the library-wide metadata backfill for durations, titles and thumbnails"""
         if not self.playlist:
             return
         
+        job = getattr(self, 'backfill_job', None)
+        if job and job.manual and job.is_active():
+            # Already running from an earlier click; just bring the progress back
+            self._show_duration_progress(job.total)
+            self._update_backfill_progress()
+            return
+        
         # Check cache first and only fetch uncached items
         items_needing_fetch = []
         cache_hits = 0
@@ -10708,52 +11624,52 @@ class MediaPlayer(QMainWindow):
         # Update display if we had cache hits
         if cache_hits > 0:
             self._update_playlist_item_display_range(range(len(self.playlist)))
-            self._save_current_playlist()
+            self._schedule_save_current_playlist()
         
-        if not items_needing_fetch:
-            message = f"All items already have duration info"
+        # Titles and thumbnails only exist for online items
+        items_needing_titles = [
+            item for item in self.playlist
+            if item.get('type') in ('youtube', 'bilibili') and self._item_needs_title(item)
+        ]
+        items_needing_thumbs = [
+            item for item in self.playlist
+            if item.get('type') in ('youtube', 'bilibili') and not item.get('thumbnail')
+        ]
+        
+        total = len(items_needing_fetch) + len(items_needing_titles) + len(items_needing_thumbs)
+        if not total:
+            message = "All items already have metadata"
             if cache_hits > 0:
-                message += f" ({cache_hits} from cache)"
+                message += f" ({cache_hits} durations from cache)"
             self.status.showMessage(message, 3000)
             return
         
         reply = QMessageBox.question(
-            self, "Fetch Durations",
-            f"Fetch durations for {len(items_needing_fetch)} videos?\n" +
-            (f"({cache_hits} found in cache)\n" if cache_hits > 0 else "") +
-            "This may take several minutes.",
+            self, "Fetch Metadata",
+            f"Fetch missing metadata for the library?\n"
+            f"Durations: {len(items_needing_fetch)}, titles: {len(items_needing_titles)}, "
+            f"thumbnails: {len(items_needing_thumbs)}\n" +
+            (f"({cache_hits} durations found in cache)\n" if cache_hits > 0 else "") +
+            "Progress is saved and resumes after a restart.",
             QMessageBox.Yes | QMessageBox.No
         )
         
-        if reply == QMessageBox.Yes:
-            # Use background fetcher with high priority for manual requests
-            if hasattr(self, 'background_duration_fetcher'):
-                from duration_fetch.background_fetcher import FetchPriority
-                
-                # Show progress dialog
-                self._show_duration_progress(len(items_needing_fetch))
-                
-                # Track manual fetch progress
-                self._manual_fetch_total = len(items_needing_fetch)
-                self._manual_fetch_completed = 0
-                
-                # Connect to track progress
-                self.background_duration_fetcher.durationReady.connect(self._on_manual_fetch_progress)
-                self.background_duration_fetcher.fetchError.connect(self._on_manual_fetch_error)
-                
-                # Enqueue with high priority
-                self.background_duration_fetcher.enqueue_items(
-                    items_needing_fetch, 
-                    priority=FetchPriority.URGENT
-                )
-            else:
-                # Fallback to old method if background fetcher not available
-                self._show_duration_progress(len(items_needing_fetch))
-                self._duration_fetcher = DurationFetcher(items_needing_fetch, self)
-                self._duration_fetcher.progressUpdated.connect(self._on_duration_progress)
-                self._duration_fetcher.durationReady.connect(self._on_duration_ready)
-                self._duration_fetcher.finished.connect(self._on_duration_fetch_complete)
-                self._duration_fetcher.start()
+        if reply != QMessageBox.Yes:
+            return
+        
+        for _, item in items_needing_fetch:
+            job.add('duration', item.get('url', ''), item.get('type', ''))
+        for item in items_needing_titles:
+            job.add('title', item.get('url', ''), item.get('type', ''))
+        for item in items_needing_thumbs:
+            job.add('thumbnail', item.get('url', ''), item.get('type', ''))
+        
+        # User-started runs dispatch immediately, even while playing
+        job.manual = True
+        job.checkpoint(force=True)
+        
+        self._show_duration_progress(job.total)
+        self._backfill_tick()
     
     def _update_playlist_item_display_range(self, indices):
         """Update display for multiple playlist items"""
@@ -10763,66 +11679,13 @@ class MediaPlayer(QMainWindow):
         except Exception as e:
             print(f"Update playlist range error: {e}")
     
-    def _on_manual_fetch_progress(self, playlist_index: int, duration: int, source: str):
-        """Track progress of manual fetch requests"""
-        try:
-            if hasattr(self, '_manual_fetch_total'):
-                self._manual_fetch_completed += 1
-                
-                # Update progress dialog
-                if hasattr(self, '_duration_progress') and self._duration_progress:
-                    self._duration_progress.setValue(self._manual_fetch_completed)
-                    self._duration_progress.setLabelText(f"Fetching durations... ({self._manual_fetch_completed}/{self._manual_fetch_total})")
-                
-                # Check if complete
-                if self._manual_fetch_completed >= self._manual_fetch_total:
-                    self._cleanup_manual_fetch()
-        except Exception as e:
-            print(f"Manual fetch progress error: {e}")
-    
-    def _on_manual_fetch_error(self, playlist_index: int, error: str):
-        """Handle manual fetch errors"""
-        try:
-            if hasattr(self, '_manual_fetch_total'):
-                self._manual_fetch_completed += 1
-                
-                # Update progress dialog
-                if hasattr(self, '_duration_progress') and self._duration_progress:
-                    self._duration_progress.setValue(self._manual_fetch_completed)
-                
-                # Check if complete
-                if self._manual_fetch_completed >= self._manual_fetch_total:
-                    self._cleanup_manual_fetch()
-        except Exception as e:
-            print(f"Manual fetch error handling error: {e}")
-    
-    def _cleanup_manual_fetch(self):
-        """Clean up manual fetch tracking"""
-        try:
-            # Disconnect progress tracking
-            if hasattr(self, 'background_duration_fetcher'):
-                self.background_duration_fetcher.durationReady.disconnect(self._on_manual_fetch_progress)
-                self.background_duration_fetcher.fetchError.disconnect(self._on_manual_fetch_error)
-            
-            # Close progress dialog
-            if hasattr(self, '_duration_progress') and self._duration_progress:
-                self._duration_progress.close()
-                self._duration_progress = None
-            
-            # Clean up tracking variables
-            if hasattr(self, '_manual_fetch_total'):
-                delattr(self, '_manual_fetch_total')
-            if hasattr(self, '_manual_fetch_completed'):
-                delattr(self, '_manual_fetch_completed')
-            
-            self.status.showMessage("Duration fetching complete", 3000)
-            
-        except Exception as e:
-            print(f"Manual fetch cleanup error: {e}")
-
     def _show_duration_progress(self, total):
         """Show cancellable progress dialog for duration fetching"""
         from PySide6.QtWidgets import QProgressDialog
+        if getattr(self, '_duration_progress', None):
+            self._duration_progress.setMaximum(total)
+            self._duration_progress.show()
+            return
         self._duration_progress = QProgressDialog("Fetching durations...", "Cancel", 0, total, self)
         self._duration_progress.setWindowModality(Qt.WindowModal)
         self._duration_progress.setMinimumDuration(0)  # Show immediately
@@ -10832,15 +11695,15 @@ class MediaPlayer(QMainWindow):
 
     def _cancel_duration_fetch(self):
         """Cancel the duration fetching operation"""
-        if hasattr(self, '_duration_fetcher') and self._duration_fetcher:
-            self._duration_fetcher.stop()
-            self.status.showMessage("Duration fetching cancelled", 3000)
-
-    def _on_duration_progress(self, current, total):
-        """Update progress dialog"""
-        if hasattr(self, '_duration_progress') and self._duration_progress:
-            self._duration_progress.setValue(current)
-            self._duration_progress.setLabelText(f"Fetching durations... ({current}/{total})")
+        # Closing the dialog after completion also emits canceled; ignore that
+        if not getattr(self, '_duration_progress', None):
+            return
+        self._duration_progress = None
+        
+        job = getattr(self, 'backfill_job', None)
+        if job and job.is_active():
+            job.clear()
+            self.status.showMessage("Metadata fetching cancelled", 3000)
 
     def _on_duration_ready(self, index, duration):
         """Store duration when it's fetched and update the UI in-place (no full refresh)."""
@@ -10878,23 +11741,17 @@ class MediaPlayer(QMainWindow):
             except Exception:
                 pass
 
-    def _on_duration_fetch_complete(self):
-        """Clean up after duration fetching"""
-        if hasattr(self, '_duration_progress') and self._duration_progress:
-            self._duration_progress.close()
-            self._duration_progress = None  # Clear reference
-        self.status.showMessage("Duration fetching complete", 3000)
-
     def _schedule_save_current_playlist(self):
-        """Schedule saving the current playlist with debounce."""
-        if not hasattr(self, '_save_timer'):
-            self._save_timer = QTimer()
-            self._save_timer.setSingleShot(True)
-            self._save_timer.timeout.connect(self._save_current_playlist)
-        self._save_timer.start(2000)  # Save after 2 seconds of inactivity
+        """Mark the playlist dirty; the persister coalesces saves (debounced, bounded latency)."""
+        if getattr(self, '_is_destroyed', False):
+            return
+        self._playlist_persister.mark_dirty()
 
     def _add_single_item_to_tree(self, index: int, item: dict):
         """Add a single item to the tree without full refresh - MUCH faster"""
+        if getattr(self, 'library_model', None) is not None or isinstance(self.playlist_tree, VirtualPlaylistWidget):
+            self._append_tree_rows(index, [item])
+            return
         try:
             icon = playlist_icon_for_type(item.get('type'))
 
@@ -10913,6 +11770,9 @@ class MediaPlayer(QMainWindow):
             if has_playlist:
                 expansion_state = self._get_tree_expansion_state()
                 self._refresh_playlist_widget_full(expansion_state=expansion_state)
+            elif should_group_singles and self.lazy_groups.is_pending('miscellaneous'):
+                self._append_tree_rows(index, [item])
+                return
             elif should_group_singles:
                 misc_group = self._find_or_create_misc_group()
                 duration_str = format_duration_from_seconds(item.get('duration', 0))
@@ -10925,6 +11785,7 @@ class MediaPlayer(QMainWindow):
                 node.setData(0, Qt.UserRole, ('current', index, item))
                 _apply_loading_style(node, item)
                 misc_group.addChild(node)
+                self.playlist_index.set_node(index, node)
                 misc_group.setText(0, f"🎵 Miscellaneous ({misc_group.childCount()})")
             else:
                 duration_str = format_duration_from_seconds(item.get('duration', 0))
@@ -10936,7 +11797,10 @@ class MediaPlayer(QMainWindow):
                 node.setFont(0, self._font_serif_no_size(italic=True, bold=True))
                 node.setData(0, Qt.UserRole, ('current', index, item))
                 _apply_loading_style(node, item)
+                self.playlist_index.set_node(index, node)
 
+            if index == self.current_index:
+                self._highlight_current_row(scroll=False)
             if self.playlist_stack.currentIndex() == 1:
                 self.playlist_stack.setCurrentIndex(0)
 
@@ -10944,6 +11808,327 @@ class MediaPlayer(QMainWindow):
             print(f"Add single item to tree failed: {e}")
             self._refresh_playlist_widget_full()
 
+    def bulk_insert(self, items: list, position: Optional[int] = None, undo: bool = True,
+                    defer_side_effects: bool = False) -> list:
+        """
+        Add many items in one operation and return the ones actually added.
+
+        Items already in the playlist (by media ID, via the playlist index) or
+        repeated within the batch are skipped. Appends only create tree rows
+        for the new items; an insert before the end shifts every later index,
+        so it refreshes the tree once. Either way there is a single save and
+        a single title/duration enqueue, and the event loop is never re-entered.
+        With defer_side_effects the caller batches the save and
+        _enqueue_new_item_metadata() itself.
+        """
+        seen = set()
+        new_items = []
+        for item in items or []:
+            url = item.get('url') if isinstance(item, dict) else None
+            if not url:
+                continue
+            key = media_id_for_url(url)
+            if key in seen or self.playlist_index.first(url, self.playlist) >= 0:
+                continue
+            seen.add(key)
+            new_items.append(item)
+
+        if not new_items:
+            return []
+
+        append = position is None or position >= len(self.playlist)
+        base_index = len(self.playlist) if append else max(0, position)
+
+        if undo:
+            self._add_undo_operation('add_items', {
+                'items': [{'index': base_index + i, 'item': item} for i, item in enumerate(new_items)],
+                'was_playing': self._is_playing(),
+                'old_current_index': self.current_index
+            })
+
+        if append:
+            self.playlist.extend(new_items)
+            self.playlist_index.extend(new_items, self.playlist)
+            self.group_aggregates.extend(new_items, self.playlist)
+            self._append_tree_rows(base_index, new_items)
+        else:
+            self.playlist[base_index:base_index] = new_items
+            if self.current_index >= base_index:
+                self.current_index += len(new_items)
+            self.playlist_index.rebuild(self.playlist)
+            self._refresh_playlist_widget_full(expansion_state=self._get_tree_expansion_state())
+
+        if not defer_side_effects:
+            self._schedule_save_current_playlist()
+            # A full refresh (insert path) already queued missing durations
+            self._enqueue_new_item_metadata(new_items, durations=append)
+
+        return new_items
+
+    def _enqueue_new_item_metadata(self, new_items: list, durations: bool = True):
+        """One title and one duration enqueue for a batch of newly added items"""
+        needing_titles = [it for it in new_items if it.get('type') in ('youtube', 'bilibili') and self._item_needs_title(it)]
+        if needing_titles:
+            self._resolve_titles_batch(needing_titles)
+        if durations:
+            needing_duration = []
+            for it in new_items:
+                if it.get('duration') or it.get('type') not in ('youtube', 'bilibili', 'local'):
+                    continue
+                idx = self.playlist_index.first(it.get('url'), self.playlist)
+                if idx >= 0:
+                    needing_duration.append((idx, it))
+            if needing_duration:
+                self._queue_items_for_background_fetch(needing_duration, priority_visible=False)
+
+    def _new_playlist_node(self, index: int, item: dict, parent=None):
+        """Build the tree row for playlist[index], matching _refresh_playlist_widget_full"""
+        icon = playlist_icon_for_type(item.get('type'))
+        duration_str = format_duration_from_seconds(item.get('duration', 0))
+        if parent is None:
+            node = QTreeWidgetItem([item.get('title', 'Unknown'), duration_str])
+            node.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+        else:
+            node = QTreeWidgetItem(parent, [item.get('title', 'Unknown'), duration_str])
+        if isinstance(icon, QIcon):
+            node.setIcon(0, icon)
+        else:
+            node.setText(0, f"{icon} {item.get('title', 'Unknown')}")
+        node.setFont(0, self._font_serif_no_size(italic=True, bold=True))
+        node.setData(0, Qt.UserRole, ('current', index, item))
+        self.playlist_index.set_node(index, node)
+        return node
+
+    def _new_group_node(self, key, title: str):
+        """Unparented group node, matching the groups built by _refresh_playlist_widget_full"""
+        prefix = "🎵" if key == 'miscellaneous' else "📃"
+        gnode = QTreeWidgetItem([f"{prefix} {title} (0)", ""])
+        gnode.setFont(0, self._font_serif_no_size(italic=True, bold=True))
+        gnode.setData(0, Qt.UserRole, ('group', key))
+        gnode.setData(0, Qt.UserRole + 1, key)
+        if key != 'miscellaneous':
+            try:
+                chev_px = make_chevron_pixmap_svg(px_size=20, stroke_color=self.playlist_chevron_color())
+                gnode.setIcon(0, QIcon(chev_px))
+            except Exception:
+                pass
+        return gnode
+
+    def _lazy_groups_enabled(self) -> bool:
+        settings = getattr(self, 'library_settings', None)
+        return bool(settings and settings.lazy_group_children) and not isinstance(self.playlist_tree, VirtualPlaylistWidget)
+
+    def _group_positions(self, gnode, key) -> list:
+        """Playlist positions of a group, whether or not its rows exist"""
+        if self.lazy_groups.is_pending(key):
+            return self.lazy_groups.pending(key)
+        positions = []
+        for i in range(gnode.childCount()):
+            data = gnode.child(i).data(0, Qt.UserRole)
+            if isinstance(data, tuple) and data[0] == 'current':
+                positions.append(data[1])
+        return positions
+
+    def _set_group_header(self, gnode, key, title: str):
+        """Group header text: title, item count and total duration (from the group aggregates)"""
+        totals = self.group_aggregates.totals(key, self.playlist) or GroupTotals()
+        prefix = "🎵" if key == 'miscellaneous' else "📃"
+        gnode.setText(0, f"{prefix} {title} ({totals.count})")
+        gnode.setText(1, format_duration_from_seconds(totals.total_duration))
+        gnode.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+        gnode.setToolTip(0, self._totals_summary(totals))
+
+    def _totals_summary(self, totals) -> str:
+        """One-line summary of a GroupTotals, for tooltips"""
+        parts = [f"{totals.count} item{'s' if totals.count != 1 else ''}",
+                 format_duration_from_seconds(totals.total_duration),
+                 f"{totals.unwatched} unwatched ({format_duration_from_seconds(totals.remaining_duration)} left)"]
+        if totals.last_played:
+            parts.append(f"last played {datetime.fromtimestamp(totals.last_played).strftime('%Y-%m-%d %H:%M')}")
+        return " • ".join(parts)
+
+    def _defer_group_children(self, gnode, key, positions: list):
+        """Leave a collapsed group as a header; rows are built when it is first expanded"""
+        gnode.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        self.lazy_groups.defer(key, positions)
+
+    def _populate_lazy_group(self, gnode, key) -> bool:
+        """Create the rows of an unpopulated group; False if it was already populated"""
+        positions = self.lazy_groups.take(key)
+        if positions is None:
+            return False
+        tree = self.playlist_tree
+        tree.setUpdatesEnabled(False)
+        try:
+            gnode.addChildren([self._new_playlist_node(pos, self.playlist[pos])
+                               for pos in positions if 0 <= pos < len(self.playlist)])
+            gnode.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        finally:
+            tree.setUpdatesEnabled(True)
+        if self.current_index in positions:
+            self._highlight_current_row(scroll=False)
+        return True
+
+    def _ensure_group_populated(self, gnode) -> bool:
+        """Populate gnode if it is an unpopulated group header"""
+        data = gnode.data(0, Qt.UserRole) if gnode is not None else None
+        if isinstance(data, tuple) and data[0] == 'group':
+            return self._populate_lazy_group(gnode, data[1])
+        return False
+
+    def _populate_lazy_group_for_index(self, idx: int) -> bool:
+        """Populate the unpopulated group that holds playlist[idx], if any"""
+        key = self.lazy_groups.group_of(idx)
+        if key is None:
+            return False
+        for i in range(self.playlist_tree.topLevelItemCount()):
+            gnode = self.playlist_tree.topLevelItem(i)
+            data = gnode.data(0, Qt.UserRole)
+            if isinstance(data, tuple) and data[0] == 'group' and data[1] == key:
+                return self._populate_lazy_group(gnode, key)
+        return False
+
+    def _on_tree_group_expanded(self, item):
+        data = item.data(0, Qt.UserRole)
+        if isinstance(data, tuple) and data[0] == 'group':
+            self.lazy_groups.expanded(data[1])
+            self._populate_lazy_group(item, data[1])
+
+    def _on_tree_group_collapsed(self, item):
+        data = item.data(0, Qt.UserRole)
+        after = getattr(getattr(self, 'library_settings', None), 'release_collapsed_after_s', 0)
+        if not (isinstance(data, tuple) and data[0] == 'group') or after <= 0 or not self._lazy_groups_enabled():
+            return
+        self.lazy_groups.collapsed(data[1])
+        QTimer.singleShot(int(after * 1000) + 250, self._release_collapsed_groups)
+
+    def _release_collapsed_groups(self):
+        """Drop the rows of groups that have stayed collapsed for release_collapsed_after_s"""
+        after = getattr(getattr(self, 'library_settings', None), 'release_collapsed_after_s', 0)
+        due = set(self.lazy_groups.due_for_release(after))
+        if not due:
+            return
+        for i in range(self.playlist_tree.topLevelItemCount()):
+            gnode = self.playlist_tree.topLevelItem(i)
+            data = gnode.data(0, Qt.UserRole)
+            if not (isinstance(data, tuple) and data[0] == 'group' and data[1] in due):
+                continue
+            key = data[1]
+            if gnode.isExpanded() or any(gnode.child(j).isSelected() for j in range(gnode.childCount())):
+                self.lazy_groups.expanded(key)
+                continue
+            positions = self._group_positions(gnode, key)
+            children = gnode.takeChildren()
+            if self._highlighted_node is not None and any(c is self._highlighted_node for c in children):
+                self._highlighted_node = None
+            for pos in positions:
+                self.playlist_index.clear_node(pos)
+            self._defer_group_children(gnode, key, positions)
+
+    def _schedule_group_total_update(self, playlist_index):
+        """Refresh the header of the group holding playlist[playlist_index] (batched; None = all groups)"""
+        if playlist_index is None:
+            key = None
+        elif 0 <= playlist_index < len(self.playlist):
+            key = group_key_of(self.playlist[playlist_index])
+        else:
+            return
+        if not self._dirty_group_totals:
+            QTimer.singleShot(500, self._flush_group_totals)
+        self._dirty_group_totals.add(key)
+
+    def _flush_group_totals(self):
+        dirty, self._dirty_group_totals = self._dirty_group_totals, set()
+        try:
+            if not isinstance(self.playlist_tree, VirtualPlaylistWidget):
+                for i in range(self.playlist_tree.topLevelItemCount()):
+                    gnode = self.playlist_tree.topLevelItem(i)
+                    data = gnode.data(0, Qt.UserRole)
+                    if isinstance(data, tuple) and data[0] == 'group' and (None in dirty or data[1] in dirty):
+                        key = data[1]
+                        title = 'Miscellaneous' if key == 'miscellaneous' else self._scope_title_from_key(key)
+                        self._set_group_header(gnode, key, title)
+            self._update_scope_label()
+        except Exception as e:
+            print(f"Group total update error: {e}")
+
+    def _find_or_create_playlist_group(self, key, title: str):
+        """Top-level group node for a playlist key, created collapsed if missing"""
+        for i in range(self.playlist_tree.topLevelItemCount()):
+            gnode = self.playlist_tree.topLevelItem(i)
+            data = gnode.data(0, Qt.UserRole) if gnode else None
+            if isinstance(data, tuple) and data[0] == 'group' and data[1] == key:
+                return gnode
+
+        gnode = self._new_group_node(key, title)
+        self.playlist_tree.addTopLevelItem(gnode)
+        gnode.setExpanded(False)
+        return gnode
+
+    def _append_tree_rows(self, base_index: int, new_items: list):
+        """Create tree rows for items just appended at base_index (no full refresh)"""
+        if getattr(self, 'library_model', None) is not None:
+            self.library_model.append_items(base_index, new_items)
+            self.library_header_label.setText(f"Library ({len(self.playlist)})")
+            if self.playlist_stack.currentIndex() == 1:
+                self.playlist_stack.setCurrentIndex(0)
+            return
+        if isinstance(self.playlist_tree, VirtualPlaylistWidget) and self.playlist_tree.virtual_active:
+            # Virtual rows are bound from the playlist; extend the logical layout in place
+            if self.playlist_tree.append_playlist_items(base_index):
+                self.library_header_label.setText(f"Library ({len(self.playlist)}) ⚡ Virtual")
+                if self.playlist_stack.currentIndex() == 1:
+                    self.playlist_stack.setCurrentIndex(0)
+            else:
+                self._refresh_playlist_widget(expansion_state=self._get_tree_expansion_state())
+            return
+        tree = self.playlist_tree
+        tree.setUpdatesEnabled(False)
+        try:
+            grouped = {}
+            singles = []
+            for offset, it in enumerate(new_items):
+                idx = base_index + offset
+                if it.get('playlist') or it.get('playlist_key'):
+                    key = it.get('playlist_key') or it.get('playlist')
+                    grouped.setdefault(key, {'title': it.get('playlist') or str(key), 'rows': []})['rows'].append((idx, it))
+                else:
+                    singles.append((idx, it))
+
+            for key, g in grouped.items():
+                gnode = self._find_or_create_playlist_group(key, g['title'])
+                self._add_group_rows(gnode, key, g['title'], g['rows'])
+
+            if singles:
+                if getattr(self, 'group_singles', False):
+                    misc_group = self._find_or_create_misc_group()
+                    self._add_group_rows(misc_group, 'miscellaneous', 'Miscellaneous', singles)
+                else:
+                    for idx, it in singles:
+                        self._new_playlist_node(idx, it, parent=tree)
+        except Exception as e:
+            print(f"Append tree rows failed: {e}")
+            self._refresh_playlist_widget_full(expansion_state=self._get_tree_expansion_state())
+        finally:
+            tree.setUpdatesEnabled(True)
+
+        if base_index <= self.current_index < base_index + len(new_items):
+            self._highlight_current_row(scroll=False)
+        self.library_header_label.setText(f"Library ({len(self.playlist)})")
+        if self.playlist_stack.currentIndex() == 1:
+            self.playlist_stack.setCurrentIndex(0)
+
+    def _add_group_rows(self, gnode, key, title: str, rows: list):
+        """Add (index, item) rows to a group, or to its pending rows if it is unpopulated"""
+        if (not self.lazy_groups.is_pending(key) and gnode.childCount() == 0
+                and not gnode.isExpanded() and self._lazy_groups_enabled()):
+            self._defer_group_children(gnode, key, [])  # New collapsed group
+        if self.lazy_groups.is_pending(key):
+            self.lazy_groups.extend(key, [idx for idx, _ in rows])
+        else:
+            gnode.addChildren([self._new_playlist_node(idx, it) for idx, it in rows])
+        self._set_group_header(gnode, key, title)
+
     def _find_or_create_misc_group(self):
         """Find existing miscellaneous group or create it"""
         # Look for existing misc group
@@ -11244,7 +12429,7 @@ class MediaPlayer(QMainWindow):
         return enhanced_mouse_press    
 
     def _show_playlist_context_menu(self, pos):
-        selected_items = self.playlist_tree.selectedItems()
+        selected_items = self._library_selected_items()
         if not selected_items:
             return
 
@@ -11354,7 +12539,7 @@ class MediaPlayer(QMainWindow):
                     menu.addAction("❌ Unable to identify group")
         
         # Show the menu (single call for all cases)
-        menu.exec(self.playlist_tree.viewport().mapToGlobal(pos))
+        menu.exec((self.library_view or self.playlist_tree).viewport().mapToGlobal(pos))
 
 # Add this debug version to your _remove_all_in_group method:
 
@@ -11424,13 +12609,11 @@ class MediaPlayer(QMainWindow):
             # Add to undo stack AFTER successful deletion
             self._add_undo_operation('delete_group', undo_data)
             
-            # Save and refresh
+            # Save and refresh, re-opening the folders that were open before
             self._save_current_playlist()
-            self._refresh_playlist_widget()
+            if not self._apply_library_model_edits(removed=indices):
+                self._refresh_playlist_widget(expansion_state=expansion_state)
             self._recover_current_after_change(was_playing)
-            
-            # --- FIX: Re-open the folders that were open before ---
-            self._refresh_playlist_widget(expansion_state=expansion_state)
 
             # Show status message
             group_name = group_key[:30] + "..." if len(group_key) > 30 else group_key
@@ -11517,6 +12700,7 @@ class MediaPlayer(QMainWindow):
                 duration = probe_local_duration_via_mpv(url)
                 if duration is not None:
                     item['duration'] = duration
+                    self.group_aggregates.update(item)
             elif media_type == 'bilibili':
                 # For Bilibili videos, fetch duration using DurationFetcher
                 self._fetch_duration(idx)
@@ -11536,13 +12720,17 @@ class MediaPlayer(QMainWindow):
         """Handle duration ready signal."""
         if index < len(self.playlist):
             self.playlist[index]['duration'] = duration
+            self.group_aggregates.update(self.playlist[index])
 
     def _move_item(self, idx, delta):
         j = idx + delta
         if 0 <= idx < len(self.playlist) and 0 <= j < len(self.playlist):
             self.playlist[idx], self.playlist[j] = self.playlist[j], self.playlist[idx]
-            self._save_current_playlist(); self._refresh_playlist_widget()
+            self._save_current_playlist()
+            if not self._apply_library_model_edits(moved=[(idx, j)]):
+                self._refresh_playlist_widget()
             self.current_index = j
+            self._highlight_current_row(scroll=False)
 
     def _queue_item_next(self, idx):
         try:
@@ -11553,7 +12741,10 @@ class MediaPlayer(QMainWindow):
                 it = self.playlist.pop(idx)
                 self.playlist.insert(0, it)
                 self.current_index = 0
-                self._save_current_playlist(); self._refresh_playlist_widget(); self.play_current(); return
+                self._save_current_playlist()
+                if not self._apply_library_model_edits(moved=[(idx, 0)]):
+                    self._refresh_playlist_widget()
+                self.play_current(); return
             next_pos = self.current_index + 1
             if idx == next_pos:
                 return  # already next
@@ -11563,7 +12754,9 @@ class MediaPlayer(QMainWindow):
                 self.current_index -= 1
             next_pos = min(next_pos, len(self.playlist))
             self.playlist.insert(next_pos, it)
-            self._save_current_playlist(); self._refresh_playlist_widget()
+            self._save_current_playlist()
+            if not self._apply_library_model_edits(moved=[(idx, next_pos)]):
+                self._refresh_playlist_widget()
             self.status.showMessage("Queued to play next", 3000)
         except Exception:
             pass
@@ -11587,7 +12780,9 @@ class MediaPlayer(QMainWindow):
             }
 
             # Delete
+            removed = self.playlist[idx]
             del self.playlist[idx]
+            self.group_aggregates.remove([removed], self.playlist)
             if self.current_index == idx:
                 self.current_index = -1
             elif idx < self.current_index:
@@ -11597,7 +12792,8 @@ class MediaPlayer(QMainWindow):
 
             # Save and refresh (preserving expansion)
             self._save_current_playlist()
-            self._refresh_playlist_widget(expansion_state=expansion_state)
+            if not self._apply_library_model_edits(removed=[idx]):
+                self._refresh_playlist_widget(expansion_state=expansion_state)
 
             if self.current_index >= len(self.playlist):
                 self.current_index = len(self.playlist) - 1
@@ -11677,8 +12873,11 @@ class MediaPlayer(QMainWindow):
             if success:
                 # The _undo helpers change the playlist data, but don't refresh the UI.
                 # We will now refresh the UI here, restoring the expansion state.
+                # Row-level undos have already updated the model/view library.
                 self._save_current_playlist()
-                self._refresh_playlist_widget(expansion_state=expansion_state)
+                if (getattr(self, 'library_model', None) is None
+                        or op_type not in ('add_items', 'delete_items', 'delete_group')):
+                    self._refresh_playlist_widget(expansion_state=expansion_state)
                 self._recover_current_after_change(op_data.get('was_playing', False))
                 self.status.showMessage(f"Undid: {op_type.replace('_', ' ').title()}", 3000)
             else:
@@ -11706,12 +12905,14 @@ class MediaPlayer(QMainWindow):
 
             # --- Logic to re-apply the original action ---
             success = False
+            removed, restored = [], set()
             if op_type in ['delete_items', 'delete_group']:
                 indices_to_remove = [item['index'] for item in op_data.get('items', [])]
                 # Remove in reverse to preserve indices
                 for i in sorted(indices_to_remove, reverse=True):
                     if 0 <= i < len(self.playlist):
                         del self.playlist[i]
+                        removed.append(i)
                 success = True
 
             # --- THIS IS THE NEW, ADDED LOGIC ---
@@ -11722,7 +12923,9 @@ class MediaPlayer(QMainWindow):
                     index = item_info['index']
                     item = item_info['item']
                     if 0 <= index <= len(self.playlist):
-                        self.playlist.insert(index, item.copy())
+                        item = item.copy()
+                        self.playlist.insert(index, item)
+                        restored.add(id(item))
                 success = True
             # --- END OF NEW LOGIC ---
 
@@ -11733,7 +12936,9 @@ class MediaPlayer(QMainWindow):
 
                 # Refresh the UI
                 self._save_current_playlist()
-                self._refresh_playlist_widget(expansion_state=expansion_state)
+                inserted = [i for i, it in enumerate(self.playlist) if id(it) in restored] if restored else []
+                if not self._apply_library_model_edits(removed=removed, inserted=inserted):
+                    self._refresh_playlist_widget(expansion_state=expansion_state)
                 self._recover_current_after_change(self._is_playing())
             else:
                 # If we don't know how to redo this action, put it back
@@ -11762,28 +12967,32 @@ class MediaPlayer(QMainWindow):
             expansion_state = self._get_tree_expansion_state()
             
             # Restore items in reverse order to maintain indices
+            restored = set()
             for item_info in reversed(items_data):
                 if not isinstance(item_info, dict) or 'index' not in item_info or 'item' not in item_info:
                     continue
                     
                 index = item_info['index']
-                item = item_info['item']
+                item = item_info['item'].copy()  # Use copy to avoid reference issues
                 
                 # Validate index bounds
                 if index < 0:
                     continue
                     
                 if index <= len(self.playlist):
-                    self.playlist.insert(index, item.copy())  # Use copy to avoid reference issues
+                    self.playlist.insert(index, item)
                 else:
-                    self.playlist.append(item.copy())
+                    self.playlist.append(item)
+                restored.add(id(item))
             
             # Restore current index if valid
             if 0 <= old_current_index < len(self.playlist):
                 self.current_index = old_current_index
                 
             self._save_current_playlist()
-            self._refresh_playlist_widget(expansion_state=expansion_state)
+            inserted = [i for i, it in enumerate(self.playlist) if id(it) in restored]
+            if not self._apply_library_model_edits(inserted=inserted):
+                self._refresh_playlist_widget(expansion_state=expansion_state)
             self._recover_current_after_change(was_playing)
             
             return True
@@ -11828,7 +13037,8 @@ class MediaPlayer(QMainWindow):
                 self.current_index = old_current_index
 
             self._save_current_playlist()
-            self._refresh_playlist_widget(expansion_state=expansion_state)
+            if not self._apply_library_model_edits(removed=indices_to_remove):
+                self._refresh_playlist_widget(expansion_state=expansion_state)
             self._recover_current_after_change(was_playing)
             
             self._last_clipboard_offer = ""
@@ -11855,26 +13065,30 @@ class MediaPlayer(QMainWindow):
             old_current_index = data.get('old_current_index', -1)
             
             # Restore items in reverse order to maintain indices
+            restored = set()
             for item_info in reversed(group_data):
                 if not isinstance(item_info, dict) or 'index' not in item_info or 'item' not in item_info:
                     continue
                     
                 index = item_info['index']
-                item = item_info['item']
+                item = item_info['item'].copy()
                 
                 if index < 0:
                     continue
                     
                 if index <= len(self.playlist):
-                    self.playlist.insert(index, item.copy())
+                    self.playlist.insert(index, item)
                 else:
-                    self.playlist.append(item.copy())
+                    self.playlist.append(item)
+                restored.add(id(item))
             
             if 0 <= old_current_index < len(self.playlist):
                 self.current_index = old_current_index
                 
             self._save_current_playlist()
-            self._refresh_playlist_widget(expansion_state=expansion_state)
+            inserted = [i for i, it in enumerate(self.playlist) if id(it) in restored]
+            if not self._apply_library_model_edits(inserted=inserted):
+                self._refresh_playlist_widget(expansion_state=expansion_state)
             self._recover_current_after_change(was_playing)
             
             return True
@@ -12091,6 +13305,9 @@ class MediaPlayer(QMainWindow):
                     return
             
             self._end_session()
+            item = self.playlist[self.current_index]
+            item['last_played'] = int(time.time())
+            self.group_aggregates.update(item)
             
             # --- Determine resume position ---
             item = self.playlist[self.current_index]
@@ -12331,7 +13548,7 @@ class MediaPlayer(QMainWindow):
                     key = self._canonical_url_key(url) if url else None
                     if key and key not in self.completed_urls and url not in self.completed_urls:
                         self.completed_urls.add(key)
-                        self._save_completed()
+                        self._save_completed([url])
             now = time.time()
             # Enforce resume target early after start
             self._maybe_reapply_resume('tick')
@@ -12966,6 +14183,8 @@ class MediaPlayer(QMainWindow):
         try:
             if 0 <= playlist_index < len(self.playlist):
                 self.playlist[playlist_index]['duration'] = duration
+                if getattr(self, 'backfill_job', None):
+                    self.backfill_job.mark_done('duration', self.playlist[playlist_index].get('url', ''))
                 # Update the display for this item without full refresh
                 self._update_playlist_item_display(playlist_index)
                 # Show subtle feedback for auto-fetched durations
@@ -12978,14 +14197,168 @@ class MediaPlayer(QMainWindow):
     def _on_background_duration_error(self, playlist_index: int, error: str):
         """Handle duration fetch error from background fetcher"""
         try:
-            # Only show error for urgent/user-requested fetches, not automatic ones
-            # We can distinguish this by checking if the user recently clicked "Fetch all durations"
-            pass  # Silent for now, as we don't want to spam the user with errors
+            # Stay silent; the backfill job retries and counts failures for the progress dialog
+            if getattr(self, 'backfill_job', None) and 0 <= playlist_index < len(self.playlist):
+                self.backfill_job.mark_done('duration', self.playlist[playlist_index].get('url', ''), success=False)
         except Exception as e:
             print(f"Background Duration: Error handling error signal: {e}")
     
+    def _backfill_tick(self):
+        """Dispatch the next batch of backfill tasks when the job is allowed to run"""
+        try:
+            job = getattr(self, 'backfill_job', None)
+            if not job:
+                return
+            if not job.is_active():
+                self._update_backfill_progress()
+                job.checkpoint()
+                return
+            
+            settings = self.metadata_settings
+            if not job.manual:
+                if not settings.backfill_enabled:
+                    return
+                # Automatic runs only use the network while nothing audible is playing
+                if settings.backfill_idle_only and self._is_playing() and not getattr(self, '_last_system_is_silent', False):
+                    return
+            
+            job.requeue_stale()
+            for task in job.next_batch():
+                self._dispatch_backfill_task(task)
+            
+            job.maybe_checkpoint()
+            self._update_backfill_progress()
+        except Exception as e:
+            print(f"Metadata Backfill: Tick error: {e}")
+    
+    def _dispatch_backfill_task(self, task):
+        """Hand a backfill task to the fetcher that owns its field"""
+        job = self.backfill_job
+        index = self.playlist_index.first(task.url, self.playlist)
+        if index < 0:
+            # Item was removed from the playlist since the job was seeded
+            job.discard(task.url)
+            return
+        item = self.playlist[index]
+        
+        if task.field == 'duration':
+            if item.get('duration'):
+                job.mark_done('duration', task.url)
+                return
+            fetcher = getattr(self, 'background_duration_fetcher', None)
+            if not fetcher or not self.duration_fetch_settings.auto_fetch_enabled:
+                job.mark_done('duration', task.url, success=False)
+                return
+            from duration_fetch.background_fetcher import FetchPriority
+            priority = FetchPriority.HIGH if job.manual else FetchPriority.LOW
+            fetcher.enqueue_items([(index, item)], priority=priority)
+        
+        elif task.field == 'title':
+            if not self._item_needs_title(item):
+                job.mark_done('title', task.url)
+                return
+            self._resolve_title_parallel(task.url, task.kind)
+        
+        elif task.field == 'thumbnail':
+            if item.get('thumbnail'):
+                job.mark_done('thumbnail', task.url)
+                return
+            media_id = media_id_for_url(task.url)
+            if task.kind == 'youtube' and media_id.startswith('youtube:'):
+                # YouTube thumbnails live at a predictable URL; no extraction needed
+                video_id = media_id.split(':', 1)[1]
+                self._on_thumbnail_resolved(task.url, f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg")
+            else:
+                # Full extraction also reports the title, satisfying both tasks at once
+                self._resolve_title_parallel(task.url, task.kind)
+    
+    def _on_thumbnail_resolved(self, url: str, thumb_url: str):
+        """Store a resolved thumbnail URL on the matching playlist items"""
+        try:
+            changed = False
+            for i in self.playlist_index.positions(url, self.playlist):
+                if self.playlist[i].get('thumbnail') != thumb_url:
+                    self.playlist[i]['thumbnail'] = thumb_url
+                    changed = True
+            if getattr(self, 'metadata_cache', None):
+                self.metadata_cache.set(url, thumbnail=thumb_url)
+            if getattr(self, 'backfill_job', None):
+                self.backfill_job.mark_done('thumbnail', url)
+            if changed:
+                self._schedule_save_current_playlist()
+        except Exception as e:
+            print(f"Error in _on_thumbnail_resolved: {e}")
+    
+    def _on_broker_metadata(self, url: str, meta):
+        """Fan a combined metadata result out to every field still missing for url"""
+        try:
+            if not isinstance(meta, dict):
+                return
+            title, duration, thumb = meta.get('title'), meta.get('duration'), meta.get('thumbnail')
+            
+            if duration:
+                fetcher = getattr(self, 'background_duration_fetcher', None)
+                if fetcher:
+                    fetcher.cache.set(url, int(duration), 'yt-dlp')
+                for i in self.playlist_index.positions(url, self.playlist):
+                    if not self.playlist[i].get('duration'):
+                        self.playlist[i]['duration'] = int(duration)
+                        self._update_playlist_item_display(i)
+                        self._schedule_save_current_playlist()
+                if getattr(self, 'backfill_job', None):
+                    self.backfill_job.mark_done('duration', url)
+            
+            if title and any(self._item_needs_title(self.playlist[i])
+                             for i in self.playlist_index.positions(url, self.playlist)):
+                self._on_title_resolved(url, title)
+            
+            if thumb:
+                self._on_thumbnail_resolved(url, thumb)
+            
+            self._on_metadata_resolved(url, meta)
+        except Exception as e:
+            print(f"Error in _on_broker_metadata: {e}")
+    
+    def _on_metadata_resolved(self, url: str, meta):
+        """Remember uploader and thumbnail alongside the title in the metadata cache"""
+        try:
+            if getattr(self, 'metadata_cache', None) and isinstance(meta, dict):
+                self.metadata_cache.set(url, uploader=meta.get('uploader'), thumbnail=meta.get('thumbnail'))
+        except Exception as e:
+            print(f"Error in _on_metadata_resolved: {e}")
+    
+    def _update_backfill_progress(self):
+        """Reflect backfill progress and ETA in the progress dialog"""
+        dialog = getattr(self, '_duration_progress', None)
+        job = getattr(self, 'backfill_job', None)
+        if not dialog or not job:
+            return
+        
+        if not job.is_active():
+            progress = job.progress()
+            self._duration_progress = None  # Clear reference before close emits canceled
+            dialog.close()
+            message = "Metadata fetching complete"
+            if progress['failed']:
+                message += f" ({progress['failed']} failed)"
+            self.status.showMessage(message, 3000)
+            return
+        
+        progress = job.progress()
+        done = progress['completed'] + progress['failed']
+        dialog.setMaximum(max(1, progress['total']))
+        dialog.setValue(min(done, progress['total']))
+        eta = progress['eta_seconds']
+        eta_text = f"about {format_duration_from_seconds(int(eta))} left" if eta is not None else "estimating time left..."
+        dialog.setLabelText(f"Fetching metadata... ({done}/{progress['total']})\n{eta_text}")
+    
     def _update_playlist_item_display(self, playlist_index: int):
         """Update display for a single playlist item (used when duration is fetched)"""
+        if 0 <= playlist_index < len(self.playlist):
+            self.group_aggregates.update(self.playlist[playlist_index])
+        if getattr(self, 'library_model', None) is not None:
+            self.library_model.item_changed(playlist_index)
+            return
         try:
             # Handle virtual playlist widget
             if isinstance(self.playlist_tree, VirtualPlaylistWidget):
@@ -12994,29 +14367,11 @@ class MediaPlayer(QMainWindow):
                 return
             
             # Handle regular playlist tree
-            # Find the tree item for this playlist index and update its duration column
-            root = self.playlist_tree.topLevelItem(0)
-            if not root:
-                return
-                
-            def update_item_recursive(node):
-                data = node.data(0, Qt.UserRole)
-                if isinstance(data, tuple) and data[0] == 'current':
-                    stored_index = data[1]
-                    if stored_index == playlist_index:
-                        # Update the duration column
-                        duration = self.playlist[playlist_index].get('duration', 0)
-                        duration_str = format_duration_from_seconds(duration)
-                        node.setText(1, duration_str)
-                        return True
-                
-                # Check children
-                for i in range(node.childCount()):
-                    if update_item_recursive(node.child(i)):
-                        return True
-                return False
-            
-            update_item_recursive(root)
+            node = self._tree_node_for_index(playlist_index)
+            if node is not None:
+                duration = self.playlist[playlist_index].get('duration', 0)
+                node.setText(1, format_duration_from_seconds(duration))
+            self._schedule_group_total_update(playlist_index)
             
         except Exception as e:
             print(f"Update playlist item display error: {e}")
@@ -13046,10 +14401,37 @@ class MediaPlayer(QMainWindow):
         except Exception as e:
             print(f"Queue background fetch error: {e}")
     
+    def _track_visible_indices(self, tree):
+        """Drop the cached visible indices whenever the rows on screen may change"""
+        self._visible_indices_cache = None
+        if isinstance(tree, VirtualPlaylistWidget):
+            return  # Computes its visible rows from the logical layout
+        tree.verticalScrollBar().valueChanged.connect(self._invalidate_visible_indices)
+        tree.itemExpanded.connect(self._invalidate_visible_indices)
+        tree.itemCollapsed.connect(self._invalidate_visible_indices)
+        model = tree.model()
+        model.rowsInserted.connect(self._invalidate_visible_indices)
+        model.rowsRemoved.connect(self._invalidate_visible_indices)
+        model.rowsMoved.connect(self._invalidate_visible_indices)
+        model.layoutChanged.connect(self._invalidate_visible_indices)
+        model.modelReset.connect(self._invalidate_visible_indices)
+
+    def _invalidate_visible_indices(self, *_args):
+        self._visible_indices_cache = None
+
     def _get_visible_playlist_indices(self) -> List[int]:
-        """Get playlist indices that are currently visible in the tree widget"""
+        """Get playlist indices that are currently visible in the library.
+
+        Walks only the rows on screen: from the row at the top of the viewport
+        down with itemBelow until a row starts below the viewport. The result
+        is cached until the next scroll, resize, expand/collapse, row change
+        or filter.
+        """
         visible_indices = []
         try:
+            if getattr(self, 'library_model', None) is not None:
+                return self.library_view.visible_positions()
+
             if not hasattr(self, 'playlist_tree'):
                 return visible_indices
                 
@@ -13058,29 +14440,23 @@ class MediaPlayer(QMainWindow):
                 return self.playlist_tree.get_visible_indices()
             
             # Handle regular playlist tree
-            # Get the visible area of the tree widget
-            viewport = self.playlist_tree.viewport()
-            visible_rect = viewport.rect()
-            
-            # Check each top-level and child item
-            root = self.playlist_tree.topLevelItem(0)
-            if not root:
-                return visible_indices
-                
-            def check_visibility_recursive(node):
-                # Check if this node is visible
-                item_rect = self.playlist_tree.visualItemRect(node)
-                if visible_rect.intersects(item_rect):
-                    data = node.data(0, Qt.UserRole)
-                    if isinstance(data, tuple) and data[0] == 'current':
-                        visible_indices.append(data[1])  # playlist index
-                
-                # Check children
-                if node.isExpanded():
-                    for i in range(node.childCount()):
-                        check_visibility_recursive(node.child(i))
-            
-            check_visibility_recursive(root)
+            tree = self.playlist_tree
+            visible_rect = tree.viewport().rect()
+            cached = getattr(self, '_visible_indices_cache', None)
+            if cached is not None and cached[0] == visible_rect.size():
+                return list(cached[1])
+
+            node = tree.itemAt(QPoint(visible_rect.left() + 1, visible_rect.top() + 1))
+            while node is not None:
+                if tree.visualItemRect(node).top() > visible_rect.bottom():
+                    break
+                data = node.data(0, Qt.UserRole)
+                if isinstance(data, tuple) and data[0] == 'current':
+                    visible_indices.append(data[1])  # playlist index
+                node = tree.itemBelow(node)
+
+            self._visible_indices_cache = (visible_rect.size(), visible_indices)
+            return list(visible_indices)
             
         except Exception as e:
             print(f"Get visible indices error: {e}")
@@ -13329,109 +14705,37 @@ class MediaPlayer(QMainWindow):
         dlg.exec()
 
     def _on_playlist_items_ready(self, items: list):
+        # Chunks stream in while the loader runs; the overlay (with Cancel)
+        # stays up until _on_playlist_loader_finished
+        counts = getattr(self, '_playlist_load_counts', None)
+        if counts is None:
+            counts = self._playlist_load_counts = {'received': 0, 'added': 0, 'failed': False}
         if not items:
-            self._hide_loading("No entries found in playlist", 4000)
-            return
-
-        # --- PREPARATION ---
-        # 1. Deduplicate against the entire existing playlist
-        existing_urls = {it.get('url') for it in self.playlist if it.get('url')}
-        new_items = [it for it in items if it.get('url') and it.get('url') not in existing_urls]
-        
-        if not new_items:
-            self._hide_loading("Playlist items already exist", 4000)
             return
 
-        # --- FIX: CAPTURE STATE & CREATE UNDO OPERATION ---
-        was_playing = self._is_playing()
-        old_current_index = self.current_index
-        base_index = len(self.playlist)
-        
-        items_for_undo = []
-        for i, item in enumerate(new_items):
-            items_for_undo.append({'index': base_index + i, 'item': item})
+        counts['received'] += len(items)
+        added = self.bulk_insert(items)
+        counts['added'] += len(added or [])
+        self.status.showMessage(f"Added {counts['added']} new entries so far...", 2000)
 
-        self._add_undo_operation('add_items', {
-            'items': items_for_undo,
-            'was_playing': was_playing,
-            'old_current_index': old_current_index
-        })
-        # --- END FIX ---
-
-        # 2. Update the internal playlist data structure
-        def add_items_progressively():
-            batch_size = 20
-            for i in range(0, len(new_items), batch_size):
-                batch = new_items[i:i + batch_size]
-                self.playlist.extend(batch)
-                
-                # Update UI incrementally
-                for j, item in enumerate(batch):
-                    self._add_single_item_to_tree(len(self.playlist) - len(batch) + j, item)
-                
-                # Process events to keep UI responsive
-                QApplication.processEvents()
-                
-                # Show progress
-                self.status.showMessage(f"Added {min(i + batch_size, len(new_items))}/{len(new_items)} items...", 1000)
-
-        # Run progressively
-        QTimer.singleShot(0, add_items_progressively)
-
-        # --- BATCHED UI UPDATE ---
-        # 3. Define the function that will process one batch of new items
-        def add_batch_to_ui(batch, start_offset):
-            for i, item_data in enumerate(batch):
-                current_index = base_index + start_offset + i
-                self._add_single_item_to_tree(current_index, item_data)
-
-        # 4. Use the helper to process all new items without freezing the UI
-        self._process_with_yield(
-            items=new_items,
-            processor_func=add_batch_to_ui,
-            batch_size=50,
-            progress_callback=lambda p, t: self._show_loading(f"Adding {p} / {t} items...")
-        )
-
-        # --- FINALIZATION ---
-        # 5. Schedule a single save operation after all items are added
-        self._schedule_save_current_playlist()
-        self._hide_loading(f"Added {len(new_items)} new entries (Ctrl+Z to undo)", 5000)
-        
-        # 6. COMPREHENSIVE FIX: Resolve titles for items that need it
-        items_needing_titles = []
-        for item in new_items:
-            title = item.get('title', '')
-            url = item.get('url', '')
-            item_type = item.get('type', '')
-            
-            # More comprehensive check for items needing title resolution
-            needs_resolution = (
-                # No title at all
-                not title or
-                # Title equals URL
-                title == url or
-                # Contains loading placeholder
-                '[Loading Title...]' in title or
-                # Bilibili-specific checks
-                (item_type == 'bilibili' and (
-                    title.startswith('Bilibili Video ') or  # Our generic fallback
-                    title == item.get('id', '') or          # Title is just video ID
-                    len(title) < 8                           # Suspiciously short
-                )) or
-                # YouTube-specific checks (for completeness)
-                (item_type == 'youtube' and title.startswith('YouTube Video '))
-            )
-            
-            if needs_resolution and url and item_type:
-                items_needing_titles.append(item)
-                print(f"DEBUG: Queuing title resolution for {item_type}: {title} -> {url[:50]}...")
-        
-        # Resolve titles in background
-        if items_needing_titles:
-            print(f"DEBUG: Starting title resolution for {len(items_needing_titles)} items")
-            for item in items_needing_titles:
-                self._resolve_title_parallel(item.get('url'), item.get('type'))
+    def _on_playlist_loader_finished(self, loader):
+        """Hide the loading overlay and report the totals once the loader is done"""
+        try:
+            loader.deleteLater()
+        except RuntimeError:
+            pass  # Already deleted by _cancel_playlist_loading
+        if getattr(self, '_playlist_loader', None) is not loader:
+            return  # Cancelled (already reported) or replaced by a newer load
+        self._playlist_loader = None
+        counts = getattr(self, '_playlist_load_counts', None) or {}
+        if counts.get('failed'):
+            return  # The error handler already hid the overlay
+        if not counts.get('received'):
+            self._hide_loading("No entries found in playlist", 4000)
+        elif not counts.get('added'):
+            self._hide_loading("Playlist items already exist", 4000)
+        else:
+            self._hide_loading(f"Added {counts['added']} new entries (Ctrl+Z to undo)", 5000)
                         
     def _restart_audio_monitor(self):
         """Restart the audio monitor with new settings"""
@@ -13699,6 +15003,7 @@ class MediaPlayer(QMainWindow):
                 return
             self.playback_positions[url] = pos
             self._last_saved_pos_ms[url] = pos
+            self.group_aggregates.update(item)
             self._save_positions()
             print(f"[resume] saved {format_time(pos)} for {url}")
         except Exception as e:
@@ -13724,6 +15029,7 @@ class MediaPlayer(QMainWindow):
 
     def filter_playlist(self, text: str):
             expansion_backup = self._get_tree_expansion_state()
+            self._invalidate_visible_indices()
             """Filter playlist tree and auto-expand if the number of results is small."""
             try:
                 # --- CONFIGURATION ---
@@ -13740,6 +15046,19 @@ class MediaPlayer(QMainWindow):
                 groups_with_matches = []
                 total_matches_found = 0
 
+                # Build rows for unpopulated groups that contain a match
+                for key in self.lazy_groups.pending_keys():
+                    titles = [self.playlist[p].get('title', '') for p in self.lazy_groups.pending(key)
+                              if 0 <= p < len(self.playlist)]
+                    group_title = str(self._scope_title_from_key(key) or key)
+                    if query in group_title.lower() or any(query in t.lower() for t in titles):
+                        for i in range(self.playlist_tree.topLevelItemCount()):
+                            gnode = self.playlist_tree.topLevelItem(i)
+                            data = gnode.data(0, Qt.UserRole)
+                            if isinstance(data, tuple) and data[0] == 'group' and data[1] == key:
+                                self._populate_lazy_group(gnode, key)
+                                break
+
                 # Iterate through all top-level items
                 for i in range(self.playlist_tree.topLevelItemCount()):
                     item = self.playlist_tree.topLevelItem(i)
@@ -13812,6 +15131,7 @@ class MediaPlayer(QMainWindow):
 
     def _show_all_items(self):
         """Show all items in the playlist tree"""
+        self._invalidate_visible_indices()
         try:
             for i in range(self.playlist_tree.topLevelItemCount()):
                 item = self.playlist_tree.topLevelItem(i)
@@ -14022,7 +15342,7 @@ class MediaPlayer(QMainWindow):
     def _remove_selected_items(self):
         """Remove selected items - handles both individual items and group headers with undo support"""
         try:
-            items = self.playlist_tree.selectedItems()
+            items = self._library_selected_items()
             if not items:
                 return
             
@@ -14164,7 +15484,8 @@ class MediaPlayer(QMainWindow):
 
             # Save and refresh
             self._save_current_playlist()
-            self._refresh_playlist_widget()
+            if not self._apply_library_model_edits(removed=indices_to_remove):
+                self._refresh_playlist_widget()
             self._recover_current_after_change(was_playing)
             
             # Status message
@@ -14211,6 +15532,7 @@ class MediaPlayer(QMainWindow):
                 return # We've handled the event
 
         elif event.type() == QEvent.ApplicationFontChange:
+            self._sync_resource_cache()
             self._apply_dynamic_fonts()
         
         # Always call the superclass method for other events.
@@ -14224,6 +15546,14 @@ class MediaPlayer(QMainWindow):
             logger.info("Saving session and settings on exit...")
             self._save_session()
             self._save_settings()
+            if getattr(self, 'backfill_job', None):
+                self.backfill_job.checkpoint(force=True)
+            if getattr(self, 'metadata_cache', None):
+                self.metadata_cache.save()
+            if getattr(self, 'playlist_response_cache', None):
+                self.playlist_response_cache.save()
+            if getattr(self, '_playlist_persister', None):
+                self._playlist_persister.close()
             print("[SHUTDOWN] ✓ State and settings saved")
         except Exception as e:
             logger.error(f"Failed to save state on close: {e}")
@@ -14247,6 +15577,8 @@ class MediaPlayer(QMainWindow):
             threads_to_stop.append(('afk_monitor', self.afk_monitor))
         if getattr(self, 'ytdl_manager', None):
             threads_to_stop.append(('ytdl_manager', self.ytdl_manager))
+        if getattr(self, 'ytdl_pool', None):
+            threads_to_stop.append(('ytdl_pool', self.ytdl_pool))
         if getattr(self, 'background_duration_fetcher', None):
             threads_to_stop.append(('background_duration_fetcher', self.background_duration_fetcher))
         
@@ -14268,6 +15600,13 @@ class MediaPlayer(QMainWindow):
                 logger.error(f"Error stopping {thread_name}: {e}")
                 print(f"[SHUTDOWN] ⚠ Error stopping {thread_name}: {e}")
 
+        # Smart Queue suggestion workers finish quickly; let them complete
+        for worker in list(getattr(self, '_suggestion_workers', ())):
+            try:
+                worker.wait(1000)
+            except Exception:
+                pass
+
         # Stop local duration worker with timeout
         try:
             if hasattr(self, '_local_dur') and self._local_dur:
@@ -14310,6 +15649,7 @@ class SubscriptionManager(QThread):
     Manages playlist subscriptions, periodically checking for new videos.
     """
     newVideosFound = Signal(str, list)
+    sweepFinished = Signal()  # After the last newVideosFound of a sweep
     logMessage = Signal(str)
     subscriptionListUpdated = Signal()
     subscriptionTitleResolved = Signal(str, str)
@@ -14346,47 +15686,66 @@ class SubscriptionManager(QThread):
         except Exception as e:
             self.logMessage.emit(f"Error saving subscriptions: {e}")
 
-    def check_subscription(self, sub_url):
-        """Fetches a playlist and returns a list of new items."""
+    def _settings(self) -> SubscriptionSettings:
+        # The manager starts before the player has loaded its config
+        return getattr(self.player, 'subscription_settings', None) or SubscriptionSettings()
+
+    def _schedule(self) -> PollSchedule:
+        settings = self._settings()
+        return PollSchedule(
+            base_interval_s=settings.poll_base_interval_s,
+            min_interval_s=settings.poll_min_interval_s,
+            max_interval_s=settings.poll_max_interval_s,
+            jitter=settings.poll_jitter
+        )
+
+    def check_subscription(self, sub_url, should_stop=None):
+        """
+        Fetches the newest entries of a subscription and returns the unseen ones.
+        Fetch errors are logged and re-raised so the checker reports them.
+        """
+        def stopping():
+            return not self._is_running or bool(should_stop and should_stop())
+
+        # One check per subscription history at a time; a timed-out check from
+        # an earlier sweep may still be finishing
+        lock = history_lock(sub_url)
+        while not lock.acquire(timeout=0.5):
+            if stopping():
+                return []
         try:
+            settings = self._settings()
             self.sub_logger.info(f"Fetching: {sub_url}")
-            # Use yt-dlp to get a flat list of video entries
-            playlist_items = fetch_playlist_flat(sub_url)
-            if not playlist_items:
-                self.sub_logger.warning(f"No items found for {sub_url}")
-                return []
+            history = SubscriptionHistory(APP_DIR, sub_url, max_entries=settings.history_max_entries,
+                                          default_depth=settings.check_depth)
 
-            # Load the history of seen URLs for this subscription
-            seen_urls = set()
-            history_file = APP_DIR / f"sub_history_{hash(sub_url)}.json"
-            if history_file.exists():
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    seen_urls = set(json.load(f))
-
-            new_items = []
-            current_urls = set()
-            for item in playlist_items:
-                url = item.get('url')
-                if not url:
-                    continue
-                current_urls.add(url)
-                if url not in seen_urls:
-                    new_items.append(item)
+            def fetch_items(url, stop_when=None, limit=None):
+                return fetch_playlist_flat(url, stop_when=stop_when, limit=limit, should_stop=stopping)
 
-            if new_items:
-                self.sub_logger.info(f"Found {len(new_items)} new video(s) in {sub_url}")
-                # Save the updated list of all URLs for this subscription
-                with open(history_file, 'w', encoding='utf-8') as f:
-                    json.dump(list(seen_urls.union(current_urls)), f)
+            result = check_incremental(sub_url, history, fetch_items,
+                                       min_depth=settings.check_depth, max_depth=settings.max_check_depth)
+            self.sub_logger.info(
+                f"Checked {sub_url}: {result.fetched} entries fetched"
+                + (f" (depth {result.depth}, stopped at seen)" if result.early_stop else "")
+            )
+
+            if should_stop and should_stop():
+                # Cancelled or timed out: a partial listing must not enter the history
+                return []
+            if result.new_items:
+                self.sub_logger.info(f"Found {len(result.new_items)} new video(s) in {sub_url}")
             else:
                 self.sub_logger.info(f"No new videos found for {sub_url}")
+            history.save()
 
-            return new_items
+            return result.new_items
 
         except Exception as e:
             self.sub_logger.error(f"Failed to check subscription {sub_url}: {e}")
             self.logMessage.emit(f"Error checking {sub_url}")
-            return []
+            raise
+        finally:
+            lock.release()
 
     def add_subscription(self, url, callback_on_finish):
         import threading
@@ -14463,50 +15822,62 @@ class SubscriptionManager(QThread):
         
         return True
 
-    def run_check(self):
-        """Check subscriptions without crashing on network errors"""
+    def run_check(self, force=False):
+        """Check due subscriptions (all of them if force) without crashing on network errors"""
         try:
-            self.logMessage.emit("Checking subscriptions...")
-            self.sub_logger.info("Checking subscriptions...")
-
             if self.upgrade_legacy_subscriptions():
                 self.logMessage.emit("Subscription format upgraded. Refreshing list.")
                 return
 
-            if not self.subscriptions:
+            schedule = self._schedule()
+            urls = [sub.get('url') for sub in self.subscriptions or []
+                    if isinstance(sub, dict) and sub.get('url') and (force or schedule.is_due(sub))]
+            # run() wakes every minute; stay quiet when nothing is due
+            if urls or force:
+                self.logMessage.emit("Checking subscriptions...")
+                self.sub_logger.info("Checking subscriptions...")
+            if not urls:
                 return
+            settings = self._settings()
+            checker = SubscriptionChecker(
+                self.check_subscription,
+                max_workers=settings.max_concurrent_checks,
+                per_host_limit=settings.per_host_limit,
+                timeout_s=settings.check_timeout_s
+            )
 
-            for sub in self.subscriptions:
-                if not self._is_running: 
-                    break
-                if not isinstance(sub, dict): 
-                    continue
-                url = sub.get('url')
-                if not url: 
-                    continue
-
+            def on_result(url, new_videos, stats):
+                # Delivered as each channel finishes, not at the end of the sweep
                 try:
-                    # Check network connectivity first
-                    new_videos = fetch_playlist_flat(url)
                     if new_videos:
-                        # Only process if we got results
-                        for video in new_videos:
-                            if "[Loading Title...]" in video.get('title', ''):
-                                try:
-                                    if hasattr(self.player, '_resolve_title_parallel'):
-                                        self.player._resolve_title_parallel(video['url'], video['type'])
-                                except Exception:
-                                    pass  # Don't crash on title resolution failure
-                        
-                        # Emit new videos found
+                        # Emit new videos found; titles are resolved in one batch per sweep
                         self.newVideosFound.emit(url, new_videos)
-                    
-                    sub['last_checked'] = datetime.now().isoformat()
-                    
+
+                    for sub in self.subscriptions:
+                        if isinstance(sub, dict) and sub.get('url') == url:
+                            if stats.status == 'ok':
+                                sub['last_checked'] = datetime.now().isoformat()
+                            sub['last_check'] = stats.to_dict()
+                            if stats.status != 'cancelled':
+                                schedule.record_check(sub, stats.new_count, ok=stats.status == 'ok')
+                            break
+
+                    if stats.status != 'ok':
+                        self.sub_logger.warning(f"Check for {url} {stats.status} after {stats.duration_s:.1f}s: {stats.error}")
                 except Exception as e:
                     # Log subscription check failure but don't crash
-                    self.sub_logger.warning(f"Failed to check subscription {url}: {e}")
-                    continue
+                    self.sub_logger.warning(f"Failed to handle subscription result {url}: {e}")
+
+            def on_progress(done, total):
+                self.logMessage.emit(f"Checked {done}/{total} subscriptions")
+
+            started = time.monotonic()
+            try:
+                checker.run(urls, on_result=on_result, on_progress=on_progress,
+                            should_stop=lambda: not self._is_running)
+            finally:
+                self.sweepFinished.emit()
+            self.sub_logger.info(f"Checked {len(urls)} subscriptions in {time.monotonic() - started:.1f}s")
 
             # Save subscription updates
             try:
@@ -14521,19 +15892,25 @@ class SubscriptionManager(QThread):
     def run(self):
         self.logMessage.emit("Subscription manager started.")
         self.sub_logger.info("Subscription manager started.")
+        # Only subscriptions whose persisted next-due time has passed
         self.run_check()
 
         while self._is_running:
-            for _ in range(1800):
+            # Sleep until the earliest subscription is due; re-evaluate at least
+            # once a minute so newly added subscriptions are picked up
+            wait_s = self._schedule().seconds_until_next(self.subscriptions)
+            wait_s = 60 if wait_s is None else min(max(wait_s, 1), 60)
+            for _ in range(int(wait_s)):
                 if not self._is_running or self.force_check_request:
                     break
                 self.msleep(1000)
             
-            if self.force_check_request:
+            force = self.force_check_request
+            if force:
                 self.force_check_request = False
 
             if self._is_running:
-                self.run_check()
+                self.run_check(force=force)
 
         self.logMessage.emit("Subscription manager stopped.")
 
@@ -5,6 +5,7 @@ Smart Queue Manager for Silence Suzuka Player
 Analyzes content and user patterns to provide intelligent queue suggestions.
 """
 
+import copy
 import json
 import time
 from pathlib import Path
@@ -383,6 +384,18 @@ class SmartQueueManager:
         except Exception:
             return 'unknown'
     
+    def snapshot(self) -> 'SmartQueueManager':
+        """
+        Copy of the current state for computing suggestions on a worker thread
+        while record_interaction keeps updating this instance
+        """
+        clone = copy.copy(self)
+        clone.settings = copy.copy(self.settings)
+        clone.learning_data = copy.deepcopy(self.learning_data)
+        clone.recent_skips = list(self.recent_skips)
+        clone.recent_completions = list(self.recent_completions)
+        return clone
+
     def update_settings(self, new_settings: SmartQueueSettings):
         """Update smart queue settings"""
         self.settings = new_settings
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Subscriptions Module for Silence Suzuka Player
+
+Provides subscription check settings, stable per-subscription history,
+incremental checks that stop at the first already-seen upload, a bounded
+concurrent checker and adaptive per-subscription polling.
+"""
+
+from .settings import SubscriptionSettings
+from .history import SubscriptionHistory, history_key, history_lock
+from .incremental import CheckResult, check_incremental, is_newest_first_feed
+from .checker import SubscriptionChecker, CheckStats, StubSubscriptionSource, host_for_url
+from .schedule import PollSchedule
+
+__all__ = ['SubscriptionSettings', 'SubscriptionHistory', 'history_key', 'history_lock', 'CheckResult',
+           'check_incremental', 'is_newest_first_feed', 'SubscriptionChecker', 'CheckStats',
+           'StubSubscriptionSource', 'host_for_url', 'PollSchedule']
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Subscription Checker for Silence Suzuka Player
+
+Runs subscription checks on a bounded thread pool instead of one after
+another. A per-host limit keeps a sweep from hammering one site, each check
+has a deadline after which it is cancelled and reported as timed out, and
+every result is delivered as soon as its check finishes.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+
+def host_for_url(url: str) -> str:
+    """Host used for per-host limits ('www.' and 'm.' prefixes folded)"""
+    host = (urlparse(url).netloc or '').lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host or 'local'
+
+
+@dataclass
+class CheckStats:
+    """Per-subscription record of one check"""
+    url: str
+    status: str = 'pending'  # 'ok', 'error', 'timeout' or 'cancelled'
+    new_count: int = 0
+    duration_s: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.status,
+            'new_count': self.new_count,
+            'duration_s': round(self.duration_s, 2),
+            'error': self.error
+        }
+
+
+class _Running:
+    """A dispatched check and its cancellation flag"""
+
+    def __init__(self, url: str, host: str, timeout_s: float):
+        self.url = url
+        self.host = host
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout_s
+        self.cancel = threading.Event()
+
+
+class SubscriptionChecker:
+    """
+    Bounded, per-host limited runner for subscription checks.
+
+    check_fn(url, should_stop) returns the new items for url and should poll
+    should_stop() between entries. A check past its deadline is cancelled and
+    reported right away; its thread is only reclaimed once check_fn returns,
+    so the pool keeps a few spare threads for stragglers.
+    """
+
+    def __init__(self, check_fn: Callable[[str, Callable[[], bool]], List[Dict[str, Any]]],
+                 max_workers: int = 4, per_host_limit: int = 2, timeout_s: float = 90):
+        self.check_fn = check_fn
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.timeout_s = timeout_s
+
+    def run(self, urls: Iterable[str],
+            on_result: Optional[Callable[[str, List[Dict[str, Any]], CheckStats], None]] = None,
+            on_progress: Optional[Callable[[int, int], None]] = None,
+            should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, CheckStats]:
+        """
+        Check every url and return stats keyed by url.
+
+        on_result(url, items, stats) and on_progress(done, total) are called
+        on the calling thread as each check finishes.
+        """
+        pending = deque(dict.fromkeys(u for u in urls if u))
+        total = len(pending)
+        stats: Dict[str, CheckStats] = {}
+        running: Dict[Any, _Running] = {}
+        host_load: Dict[str, int] = {}
+        done = 0
+
+        def finish(run: _Running, status: str, items=None, error=None):
+            nonlocal done
+            host_load[run.host] -= 1
+            st = CheckStats(url=run.url, status=status, new_count=len(items or []),
+                            duration_s=time.monotonic() - run.started, error=error)
+            stats[run.url] = st
+            done += 1
+            if on_result:
+                on_result(run.url, items or [], st)
+            if on_progress:
+                on_progress(done, total)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers * 2, thread_name_prefix='sub-check')
+        try:
+            while pending or running:
+                stopping = bool(should_stop and should_stop())
+
+                # Dispatch while there is a free slot and a host with capacity
+                if not stopping:
+                    for _ in range(len(pending)):
+                        if len(running) >= self.max_workers:
+                            break
+                        url = pending.popleft()
+                        host = host_for_url(url)
+                        if host_load.get(host, 0) >= self.per_host_limit:
+                            pending.append(url)
+                            continue
+                        run = _Running(url, host, self.timeout_s)
+                        host_load[host] = host_load.get(host, 0) + 1
+                        future = executor.submit(self.check_fn, url, run.cancel.is_set)
+                        running[future] = run
+                else:
+                    for future, run in list(running.items()):
+                        run.cancel.set()
+                        del running[future]
+                        finish(run, 'cancelled')
+                    while pending:
+                        url = pending.popleft()
+                        stats[url] = CheckStats(url=url, status='cancelled')
+                    break
+
+                if not running:
+                    continue
+
+                finished, _ = wait(list(running), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    run = running.pop(future)
+                    try:
+                        finish(run, 'ok', items=future.result())
+                    except Exception as e:
+                        finish(run, 'error', error=str(e))
+
+                now = time.monotonic()
+                for future, run in list(running.items()):
+                    if now >= run.deadline:
+                        # The thread winds down at its next should_stop() poll
+                        run.cancel.set()
+                        del running[future]
+                        finish(run, 'timeout', error=f"No result after {self.timeout_s:.0f}s")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return stats
+
+
+class StubSubscriptionSource:
+    """
+    Offline check_fn for exercising the checker without network access.
+
+    responses maps url -> list of items, or an Exception to raise; delays
+    maps url -> seconds to sleep (polling should_stop) before answering.
+    """
+
+    def __init__(self, responses: Dict[str, Any], delays: Optional[Dict[str, float]] = None):
+        self.responses = responses
+        self.delays = delays or {}
+        self.active = 0
+        self.peak_active = 0
+        self.peak_by_host: Dict[str, int] = {}
+        self._by_host: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, should_stop: Callable[[], bool]) -> List[Dict[str, Any]]:
+        host = host_for_url(url)
+        with self._lock:
+            self.active += 1
+            self._by_host[host] = self._by_host.get(host, 0) + 1
+            self.peak_active = max(self.peak_active, self.active)
+            self.peak_by_host[host] = max(self.peak_by_host.get(host, 0), self._by_host[host])
+        try:
+            end = time.monotonic() + self.delays.get(url, 0)
+            while time.monotonic() < end and not should_stop():
+                time.sleep(0.01)
+            response = self.responses.get(url, [])
+            if isinstance(response, Exception):
+                raise response
+            return list(response)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self._by_host[host] -= 1
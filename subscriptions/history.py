@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Subscription History for Silence Suzuka Player
+
+Per-subscription record of already-seen media IDs (newest first) and the
+adaptive check depth. Files are named from a stable digest of the
+subscription URL; the previous names used hash(), which changes between
+runs, so history never survived a restart.
+"""
+
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from metadata.ids import media_id_for_url
+
+
+def history_key(sub_url: str) -> str:
+    """Stable file key for a subscription URL"""
+    return hashlib.sha1(sub_url.strip().encode('utf-8')).hexdigest()[:16]
+
+
+_history_locks: Dict[str, threading.Lock] = {}
+_history_locks_guard = threading.Lock()
+
+
+def history_lock(sub_url: str) -> threading.Lock:
+    """
+    Lock held while a check loads, updates and saves one subscription's
+    history. A timed-out check keeps running until its next should_stop()
+    poll, so without it a later sweep could read and write the same file.
+    """
+    key = history_key(sub_url)
+    with _history_locks_guard:
+        lock = _history_locks.get(key)
+        if lock is None:
+            lock = _history_locks[key] = threading.Lock()
+        return lock
+
+
+class SubscriptionHistory:
+    """
+    Seen media IDs for one subscription.
+
+    Features:
+    - Stable, URL-derived file name
+    - Ordered newest first and capped, so old uploads age out
+    - Remembers the check depth that last proved sufficient
+    """
+
+    def __init__(self, config_dir: Path, sub_url: str, max_entries: int = 5000, default_depth: int = 30):
+        self.sub_url = sub_url
+        self.max_entries = max_entries
+        self.history_file = Path(config_dir) / f"sub_history_{history_key(sub_url)}.json"
+        self.seen: List[str] = []
+        self.depth = default_depth
+        self._seen_set = set()
+        self._load()
+
+    def _load(self):
+        if not self.history_file.exists():
+            return
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.seen = [str(k) for k in data.get('seen', [])]
+            self.depth = int(data.get('depth', self.depth))
+        except Exception as e:
+            print(f"Subscription History: Failed to load {self.history_file.name}: {e}")
+            self.seen = []
+        self._seen_set = set(self.seen)
+
+    def is_empty(self) -> bool:
+        return not self.seen
+
+    def has_seen(self, url: str) -> bool:
+        return media_id_for_url(url) in self._seen_set
+
+    def record(self, urls: Iterable[str]):
+        """Mark urls (newest first) as seen, ahead of the existing history"""
+        fresh = []
+        for url in urls:
+            key = media_id_for_url(url)
+            if key not in self._seen_set:
+                fresh.append(key)
+                self._seen_set.add(key)
+        if not fresh:
+            return
+        self.seen = fresh + self.seen
+        if len(self.seen) > self.max_entries:
+            for key in self.seen[self.max_entries:]:
+                self._seen_set.discard(key)
+            self.seen = self.seen[:self.max_entries]
+
+    def save(self):
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.history_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'url': self.sub_url, 'depth': self.depth, 'seen': self.seen}, f)
+            temp_file.replace(self.history_file)
+        except Exception as e:
+            print(f"Subscription History: Failed to save {self.history_file.name}: {e}")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Incremental Subscription Checks for Silence Suzuka Player
+
+Upload feeds (channels, Bilibili spaces) list newest first, so a check only
+needs the entries above the first one it has already seen. Checks request
+the newest `depth` entries and stop at the first seen ID; the depth doubles
+only when an entire page turns out to be new. Cost therefore follows the
+number of new uploads rather than the size of the channel.
+
+Plain playlists have no guaranteed order (new videos are usually appended at
+the end), so they are still listed in full and diffed against the history.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from .history import SubscriptionHistory
+
+
+_FEED_PATTERNS = (
+    re.compile(r'youtube\.com/(@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+)/?(videos|streams|shorts)?/?($|[?#])', re.I),
+    re.compile(r'space\.bilibili\.com/\d+/?(video|upload/video)?/?($|[?#])', re.I),
+)
+
+
+def is_newest_first_feed(url: str) -> bool:
+    """True for upload feeds that list newest entries first"""
+    if not url or 'list=' in url:
+        return False
+    return any(p.search(url) for p in _FEED_PATTERNS)
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one subscription check"""
+    new_items: List[Dict[str, Any]] = field(default_factory=list)
+    fetched: int = 0  # Entries pulled from the extractor, across all passes
+    depth: int = 0  # Depth used by the final pass
+    early_stop: bool = False  # Stopped at an already-seen entry
+    incremental: bool = True
+
+
+def check_incremental(sub_url: str, history: SubscriptionHistory,
+                      fetch_items: Callable[..., List[Dict[str, Any]]],
+                      min_depth: int = 30, max_depth: int = 960) -> CheckResult:
+    """
+    Return the entries of sub_url not yet in history and record them.
+
+    fetch_items(url, stop_when=..., limit=...) must return items in listing
+    order, ending before the first item for which stop_when returns True.
+    The caller saves the history.
+    """
+    if not is_newest_first_feed(sub_url):
+        items = fetch_items(sub_url)
+        new_items = [it for it in items if it.get('url') and not history.has_seen(it['url'])]
+        history.record(it['url'] for it in new_items)
+        return CheckResult(new_items=new_items, fetched=len(items), incremental=False)
+
+    depth = max(min_depth, min(history.depth or min_depth, max_depth))
+    result = CheckResult()
+    while True:
+        hit_seen = [False]
+
+        def stop_when(item):
+            if history.has_seen(item.get('url', '')):
+                hit_seen[0] = True
+                return True
+            return False
+
+        items = fetch_items(sub_url, stop_when=stop_when, limit=depth)
+        result.fetched += len(items)
+        result.new_items = [it for it in items if it.get('url')]
+        result.depth = depth
+        result.early_stop = hit_seen[0]
+
+        # Grow only when the whole page was new; a first check takes the newest page as-is
+        page_all_new = not hit_seen[0] and len(items) >= depth
+        if not page_all_new or history.is_empty() or depth >= max_depth:
+            break
+        depth = min(depth * 2, max_depth)
+
+    # Remember a grown depth for busy channels; drift back once checks stop early
+    if result.early_stop and len(result.new_items) * 2 < depth:
+        history.depth = max(min_depth, depth // 2)
+    else:
+        history.depth = depth
+
+    history.record(it['url'] for it in result.new_items)
+    return result
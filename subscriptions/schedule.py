@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Subscription Polling Schedule for Silence Suzuka Player
+
+Each subscription keeps its own polling interval instead of sharing one
+fixed timer. Checks that find nothing back the interval off exponentially,
+checks that find uploads tighten it towards the channel's observed upload
+cadence, and every next-due time is jittered so subscriptions added together
+drift apart. State lives in the subscription dict under 'poll', so it is
+saved with the subscription list and survives restarts.
+"""
+
+import time
+import random
+from typing import Any, Dict, Iterable, Optional
+
+
+class PollSchedule:
+    """
+    Adaptive per-subscription polling intervals.
+
+    Poll state ('poll' key of a subscription dict):
+    - interval_s: current polling interval
+    - next_due: Unix timestamp of the next check
+    - upload_rate: EWMA of new uploads per day
+    - failures: consecutive failed checks
+    - last_poll: Unix timestamp of the last successful check
+    """
+
+    BACKOFF = 1.5  # Interval growth after a quiet check
+    RATE_ALPHA = 0.3  # Weight of the newest observation in upload_rate
+    CHECKS_PER_UPLOAD = 2  # Aim to check about twice per expected upload
+
+    def __init__(self, base_interval_s: float = 1800, min_interval_s: float = 900,
+                 max_interval_s: float = 7 * 86400, jitter: float = 0.1):
+        self.base_interval_s = base_interval_s
+        self.min_interval_s = min_interval_s
+        self.max_interval_s = max(min_interval_s, max_interval_s)
+        self.jitter = max(0.0, min(jitter, 0.5))
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval_s, min(self.max_interval_s, interval))
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def state(self, sub: Dict[str, Any]) -> Dict[str, Any]:
+        poll = sub.get('poll')
+        if not isinstance(poll, dict):
+            poll = sub['poll'] = {}
+        poll.setdefault('interval_s', self.base_interval_s)
+        poll.setdefault('upload_rate', 0.0)
+        poll.setdefault('failures', 0)
+        return poll
+
+    def is_due(self, sub: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Subscriptions that were never scheduled are due immediately"""
+        next_due = (sub.get('poll') or {}).get('next_due')
+        if next_due is None:
+            return True
+        return (now or time.time()) >= float(next_due)
+
+    def record_check(self, sub: Dict[str, Any], new_count: int, ok: bool = True,
+                     now: Optional[float] = None) -> float:
+        """Update the interval from a check result and return the new next_due"""
+        now = now or time.time()
+        poll = self.state(sub)
+        interval = float(poll['interval_s'])
+
+        if not ok:
+            # Retry failures sooner than a quiet channel, backing off per failure
+            poll['failures'] = int(poll['failures']) + 1
+            retry = self._clamp(self.min_interval_s * (2 ** (poll['failures'] - 1)))
+            poll['next_due'] = now + self._jittered(min(retry, max(interval, self.min_interval_s)))
+            return poll['next_due']
+
+        poll['failures'] = 0
+        last_poll = poll.get('last_poll')
+        if last_poll:
+            elapsed_days = max((now - float(last_poll)) / 86400, 1e-3)
+            observed = new_count / elapsed_days
+            poll['upload_rate'] = (self.RATE_ALPHA * observed +
+                                   (1 - self.RATE_ALPHA) * float(poll['upload_rate']))
+        poll['last_poll'] = now
+
+        if new_count > 0:
+            interval = interval / 2
+            rate = float(poll['upload_rate'])
+            if rate > 0:
+                cadence = 86400 / (rate * self.CHECKS_PER_UPLOAD)
+                interval = min(interval, cadence)
+        else:
+            interval = interval * self.BACKOFF
+
+        poll['interval_s'] = self._clamp(interval)
+        poll['next_due'] = now + self._jittered(poll['interval_s'])
+        return poll['next_due']
+
+    def seconds_until_next(self, subs: Iterable[Dict[str, Any]], now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest subscription is due (0 if one already is)"""
+        now = now or time.time()
+        waits = []
+        for sub in subs:
+            if not isinstance(sub, dict):
+                continue
+            next_due = (sub.get('poll') or {}).get('next_due')
+            waits.append(0.0 if next_due is None else max(0.0, float(next_due) - now))
+        return min(waits) if waits else None
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Subscription Settings for Silence Suzuka Player
+
+Configuration for subscription checks following the same pattern as
+DurationFetchSettings.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class SubscriptionSettings:
+    """Subscription check configuration settings"""
+
+    # Incremental checks: how many of the newest entries to request
+    check_depth: int = 30
+    max_check_depth: int = 960  # Depth doubles while a whole page is new, up to this
+    history_max_entries: int = 5000  # Seen IDs kept per subscription (newest first)
+
+    # Concurrent sweeps
+    max_concurrent_checks: int = 4
+    per_host_limit: int = 2  # Checks against one site at a time
+    check_timeout_s: int = 90  # A check still running after this is cancelled
+
+    # Adaptive polling
+    poll_base_interval_s: int = 1800  # Starting interval for a new subscription
+    poll_min_interval_s: int = 900
+    poll_max_interval_s: int = 7 * 86400  # Quiet channels back off up to a week
+    poll_jitter: float = 0.1  # +/- fraction applied to every next-due time
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'check_depth': self.check_depth,
+            'max_check_depth': self.max_check_depth,
+            'history_max_entries': self.history_max_entries,
+            'max_concurrent_checks': self.max_concurrent_checks,
+            'per_host_limit': self.per_host_limit,
+            'check_timeout_s': self.check_timeout_s,
+            'poll_base_interval_s': self.poll_base_interval_s,
+            'poll_min_interval_s': self.poll_min_interval_s,
+            'poll_max_interval_s': self.poll_max_interval_s,
+            'poll_jitter': self.poll_jitter
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create from dictionary (JSON deserialization)"""
+        return cls(
+            check_depth=data.get('check_depth', 30),
+            max_check_depth=data.get('max_check_depth', 960),
+            history_max_entries=data.get('history_max_entries', 5000),
+            max_concurrent_checks=data.get('max_concurrent_checks', 4),
+            per_host_limit=data.get('per_host_limit', 2),
+            check_timeout_s=data.get('check_timeout_s', 90),
+            poll_base_interval_s=data.get('poll_base_interval_s', 1800),
+            poll_min_interval_s=data.get('poll_min_interval_s', 900),
+            poll_max_interval_s=data.get('poll_max_interval_s', 7 * 86400),
+            poll_jitter=data.get('poll_jitter', 0.1)
+        )
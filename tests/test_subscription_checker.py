@@ -0,0 +1,107 @@
+"""Tests for SubscriptionChecker, driven offline through StubSubscriptionSource"""
+
+import threading
+import time
+
+from subscriptions import SubscriptionChecker, StubSubscriptionSource
+
+
+def _urls(host, count):
+    return [f"https://{host}/channel/{i}" for i in range(count)]
+
+
+def _wait_idle(source, timeout=2.0):
+    """Wait for stragglers (timed-out or cancelled checks) to return"""
+    end = time.monotonic() + timeout
+    while source.active and time.monotonic() < end:
+        time.sleep(0.01)
+    return source.active == 0
+
+
+def test_concurrency_is_bounded_by_max_workers():
+    urls = [f"https://host{i}.example/feed" for i in range(12)]
+    source = StubSubscriptionSource({u: [{'id': u}] for u in urls}, delays={u: 0.15 for u in urls})
+    checker = SubscriptionChecker(source, max_workers=3, per_host_limit=2, timeout_s=10)
+
+    stats = checker.run(urls)
+
+    assert source.peak_active == 3
+    assert all(st.status == 'ok' and st.new_count == 1 for st in stats.values())
+    assert set(stats) == set(urls)
+
+
+def test_per_host_limit_caps_checks_against_one_site():
+    busy = _urls('www.youtube.com', 6) + _urls('m.youtube.com', 2)
+    others = _urls('bilibili.com', 2)
+    urls = busy + others
+    source = StubSubscriptionSource({}, delays={u: 0.15 for u in urls})
+    checker = SubscriptionChecker(source, max_workers=4, per_host_limit=2, timeout_s=10)
+
+    stats = checker.run(urls)
+
+    # 'www.' and 'm.' fold into one host
+    assert source.peak_by_host['youtube.com'] == 2
+    assert source.peak_by_host['bilibili.com'] <= 2
+    # The other host used the slots youtube.com could not
+    assert source.peak_active > 2
+    assert all(st.status == 'ok' for st in stats.values())
+
+
+def test_check_past_its_deadline_is_reported_as_timeout():
+    slow, fast = 'https://slow.example/feed', 'https://fast.example/feed'
+    source = StubSubscriptionSource({slow: [{'id': 'late'}], fast: [{'id': 'a'}]}, delays={slow: 30})
+    checker = SubscriptionChecker(source, max_workers=2, per_host_limit=1, timeout_s=0.3)
+
+    started = time.monotonic()
+    stats = checker.run([slow, fast])
+    elapsed = time.monotonic() - started
+
+    assert stats[slow].status == 'timeout'
+    assert stats[slow].new_count == 0
+    assert stats[fast].status == 'ok'
+    assert elapsed < 2.0
+    # The cancelled check sees should_stop() and winds down
+    assert _wait_idle(source)
+
+
+def test_results_are_delivered_as_checks_finish():
+    quick, error, slow = ('https://a.example/feed', 'https://b.example/feed', 'https://c.example/feed')
+    source = StubSubscriptionSource(
+        {quick: [{'id': 1}, {'id': 2}], error: RuntimeError("HTTP Error 404"), slow: [{'id': 3}]},
+        delays={slow: 30}
+    )
+    checker = SubscriptionChecker(source, max_workers=3, per_host_limit=1, timeout_s=0.5)
+    delivered = []
+    progress = []
+
+    stats = checker.run([quick, error, slow],
+                        on_result=lambda url, items, st: delivered.append((url, len(items), st.status)),
+                        on_progress=lambda done, total: progress.append((done, total)))
+
+    # Partial results: the finished checks arrive before the slow one times out
+    assert delivered[-1] == (slow, 0, 'timeout')
+    assert sorted(delivered[:2]) == [(quick, 2, 'ok'), (error, 0, 'error')]
+    assert stats[error].error == "HTTP Error 404"
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert _wait_idle(source)
+
+
+def test_should_stop_cancels_running_and_pending_checks():
+    urls = [f"https://host{i}.example/feed" for i in range(6)]
+    source = StubSubscriptionSource({u: [{'id': u}] for u in urls}, delays={u: 30 for u in urls[1:]})
+    checker = SubscriptionChecker(source, max_workers=2, per_host_limit=1, timeout_s=60)
+    stop = threading.Event()
+
+    def on_result(url, items, st):
+        if st.status == 'ok':
+            stop.set()
+
+    started = time.monotonic()
+    stats = checker.run(urls, on_result=on_result, should_stop=stop.is_set)
+
+    assert time.monotonic() - started < 2.0
+    assert stats[urls[0]].status == 'ok'
+    assert {st.status for url, st in stats.items() if url != urls[0]} == {'cancelled'}
+    assert len(stats) == len(urls)
+    assert source.peak_active <= 2
+    assert _wait_idle(source)
@@ -1,10 +1,14 @@
 """
 UI Module for Silence Suzuka Player
 
-Contains typography management and preferences dialogs.
+Contains typography management, preferences dialogs and the rendering
+resource and text layout caches.
 """
 
 from .typography import TypographyManager, TypographySettings
 from .preferences_typography import TypographyPreferencesDialog
+from .resource_cache import ResourceCache, get_resource_cache
+from .text_cache import TextLayoutCache
 
-__all__ = ['TypographyManager', 'TypographySettings', 'TypographyPreferencesDialog']
\ No newline at end of file
+__all__ = ['TypographyManager', 'TypographySettings', 'TypographyPreferencesDialog',
+           'ResourceCache', 'get_resource_cache', 'TextLayoutCache']
\ No newline at end of file
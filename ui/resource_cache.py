@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Rendering Resource Cache for Silence Suzuka Player
+
+Icons, pixmaps and fonts used to draw the library are pure functions of
+their parameters plus the current theme, device pixel ratio and typography.
+ResourceCache keeps one instance per key and drops everything when that
+context changes, so a refresh of thousands of rows renders each SVG and
+builds each QFont once.
+
+Qt pixmaps may only be created on the GUI thread; the cache is not locked
+and must be used from that thread only.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from PySide6.QtGui import QFont
+
+
+class ResourceCache:
+    """
+    Keyed cache of QIcon, QPixmap and QFont instances.
+
+    Features:
+    - One store per resource kind, keyed by the caller's parameters
+    - Whole-cache invalidation on theme, DPR or typography change
+    - Hit/miss/invalidation counters
+    """
+
+    def __init__(self):
+        self._icons: Dict[Hashable, Any] = {}
+        self._pixmaps: Dict[Hashable, Any] = {}
+        self._fonts: Dict[Hashable, QFont] = {}
+        self._context = None
+        self.dpr = 1.0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'invalidations': 0
+        }
+
+    def sync(self, theme: Optional[str] = None, dpr: float = 1.0, typography: Hashable = None) -> bool:
+        """
+        Record the current rendering context, clearing the cache if it changed.
+
+        Returns:
+            True when cached resources were dropped (or on the first call).
+        """
+        context = (theme, round(float(dpr or 1.0), 2), typography)
+        if context == self._context:
+            return False
+        if self._context is not None:
+            self.clear()
+            self._stats['invalidations'] += 1
+        self._context = context
+        self.dpr = context[1]
+        return True
+
+    def _get(self, store: Dict[Hashable, Any], key: Hashable, factory: Callable[[], Any]):
+        value = store.get(key)
+        if value is not None:
+            self._stats['hits'] += 1
+            return value
+        self._stats['misses'] += 1
+        value = factory()
+        if value is not None:
+            store[key] = value
+        return value
+
+    def icon(self, key: Hashable, factory: Callable[[], Any]):
+        """Cached QIcon for key, created with factory() on a miss"""
+        return self._get(self._icons, key, factory)
+
+    def pixmap(self, key: Hashable, factory: Callable[[], Any]):
+        """Cached QPixmap for key, created with factory() on a miss"""
+        return self._get(self._pixmaps, key, factory)
+
+    def font(self, key: Hashable, factory: Callable[[], QFont]) -> QFont:
+        """Copy of the cached QFont for key (callers often adjust the font they get)"""
+        font = self._get(self._fonts, key, factory)
+        return QFont(font) if font is not None else QFont()
+
+    def clear(self):
+        """Drop all cached resources"""
+        self._icons.clear()
+        self._pixmaps.clear()
+        self._fonts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            'icons': len(self._icons),
+            'pixmaps': len(self._pixmaps),
+            'fonts': len(self._fonts),
+            'hits': self._stats['hits'],
+            'misses': self._stats['misses'],
+            'hit_rate': (self._stats['hits'] / lookups) if lookups > 0 else 0,
+            'invalidations': self._stats['invalidations'],
+            'dpr': self.dpr
+        }
+
+
+_resource_cache: Optional[ResourceCache] = None
+
+
+def get_resource_cache() -> ResourceCache:
+    """Process-wide resource cache shared by the player and its helpers"""
+    global _resource_cache
+    if _resource_cache is None:
+        _resource_cache = ResourceCache()
+    return _resource_cache
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Text Layout Cache for Silence Suzuka Player
+
+Eliding and shaping row text is the expensive part of painting the library,
+especially for CJK-heavy titles. TextLayoutCache keeps the elided string and
+a prepared QStaticText per (text, font, width bucket, elide mode), so a row
+that scrolls back into view is drawn without laying its text out again.
+
+Widths are rounded down to a bucket so small width changes still hit the
+cache; text is elided to the bucket width. Like ResourceCache, it must be
+used from the GUI thread only.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont, QFontMetrics, QStaticText, QTransform
+
+
+class TextLayoutCache:
+    """
+    LRU cache of elided, prepared QStaticText objects.
+
+    Features:
+    - Keyed by text, font, width bucket and elide mode
+    - Bounded size with least-recently-used eviction
+    - Cleared when the view is resized or the typography changes
+    """
+
+    def __init__(self, max_entries: int = 4096, width_bucket: int = 8):
+        self.max_entries = max_entries
+        self.width_bucket = max(1, width_bucket)
+        self._entries: 'OrderedDict[Hashable, QStaticText]' = OrderedDict()
+        self._viewport_width = None
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    def get(self, text: str, font: QFont, width: int, elide_mode=Qt.ElideRight) -> QStaticText:
+        """Prepared QStaticText for text elided to width with font"""
+        bucket = max(0, int(width)) // self.width_bucket * self.width_bucket
+        key = (text, font.key(), bucket, elide_mode)
+        static = self._entries.get(key)
+        if static is not None:
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return static
+
+        self._stats['misses'] += 1
+        elided = QFontMetrics(font).elidedText(text, elide_mode, bucket)
+        static = QStaticText(elided)
+        static.setTextFormat(Qt.PlainText)
+        static.setPerformanceHint(QStaticText.AggressiveCaching)
+        static.prepare(QTransform(), font)
+        self._entries[key] = static
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+        return static
+
+    def set_viewport_width(self, width: int) -> bool:
+        """Note the view width; a change (resize) drops every entry. Returns True if cleared."""
+        if width == self._viewport_width:
+            return False
+        cleared = self._viewport_width is not None and bool(self._entries)
+        self._viewport_width = width
+        if cleared:
+            self.invalidate()
+        return cleared
+
+    def invalidate(self):
+        """Drop all cached layouts (resize or typography change)"""
+        self._entries.clear()
+        self._stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            'entries': len(self._entries),
+            'hits': self._stats['hits'],
+            'misses': self._stats['misses'],
+            'hit_rate': (self._stats['hits'] / lookups) if lookups > 0 else 0,
+            'evictions': self._stats['evictions'],
+            'invalidations': self._stats['invalidations']
+        }
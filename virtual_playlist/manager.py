@@ -4,189 +4,365 @@ Virtual Playlist Item Manager for Silence Suzuka Player
 
 Manages the lifecycle of virtual playlist items including loading, unloading,
 and viewport calculations.
+
+The library is treated as a flat list of logical rows: a header row per
+group, followed by that group's items while it is expanded, and top-level
+single items. Logical rows are located by bisecting per-group start offsets,
+so scrolling does not depend on the library size. A fixed pool of
+QTreeWidgetItems, sized to the viewport, is re-bound to whichever logical
+rows are on screen instead of creating and destroying rows as you scroll.
 """
 
+from bisect import bisect_right
 from typing import List, Dict, Any, Optional, Set, Tuple
 from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem
-from PySide6.QtCore import QRect
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QColor, QFont, QIcon
 
+from library.reconcile import group_layout, MISC_GROUP_KEY
 from .settings import VirtualPlaylistSettings
 
 
 class VirtualPlaylistItemManager:
     """Manages virtual playlist items and viewport calculations"""
-    
+
     def __init__(self, tree_widget: QTreeWidget, settings: VirtualPlaylistSettings):
         self.tree_widget = tree_widget
         self.settings = settings
-        
-        # Cache of created items: {index: QTreeWidgetItem}
+
+        # Bound rows of the pool: {playlist index: QTreeWidgetItem}
         self.visible_items: Dict[int, QTreeWidgetItem] = {}
-        
-        # Current visible range
+
+        # Current visible range (logical rows)
         self.visible_start = 0
         self.visible_end = 0
-        
+
         # Total playlist data
         self.playlist_data: List[Dict[str, Any]] = []
-        
+
         # Group information for grouped playlists
         self.group_data: Dict[str, Any] = {}
         self.is_grouped = False
-        
+
+        # Logical row layout
+        self.sections: List[Tuple[Any, str, List[int]]] = []  # (group key or None, title, positions)
+        self.expanded: Set[Any] = set()
+        self._offsets: List[int] = []  # First logical row of each section
+        self._section_of: Dict[int, Tuple[int, int]] = {}  # position -> (section, child row)
+        self._group_section: Dict[Any, int] = {}  # playlist group key -> section
+        self._groups_end = 0  # Playlist groups come first; singles/Miscellaneous start here
+        self.total_rows = 0
+
+        # Recycled row objects, top to bottom
+        self.pool: List[QTreeWidgetItem] = []
+        self.scroll_offset = 0  # First logical row shown
+        self.row_height = 0  # Measured by the widget; settings.item_height until then
+
     def set_playlist_data(self, playlist: List[Dict[str, Any]], group_info: Optional[Dict[str, Any]] = None):
-        """Set the full playlist data"""
+        """
+        Set the full playlist data.
+
+        group_info may carry 'group_singles' (bool) and 'expanded' (group
+        keys to show expanded).
+        """
         self.playlist_data = playlist
         self.group_data = group_info or {}
-        self.is_grouped = bool(group_info)
-        
-        # Clear existing items when data changes
+
+        self.sections = group_layout(playlist, bool(self.group_data.get('group_singles', False)))
+        self.is_grouped = any(key is not None for key, _, _ in self.sections)
+        self._section_of = {}
+        self._group_section = {}
+        self._groups_end = next((s for s, (_, _, positions) in enumerate(self.sections)
+                                 if not self._in_playlist_group(playlist[positions[0]])), len(self.sections))
+        self._index_sections(0)
+        group_keys = {key for key, _, _ in self.sections if key is not None}
+        self.expanded = {key for key in self.group_data.get('expanded', ()) if key in group_keys}
+        self._rebuild_offsets()
+
+        # Bound rows refer to the old data
         self.clear_items()
-    
+
+    @staticmethod
+    def _in_playlist_group(item) -> bool:
+        return isinstance(item, dict) and bool(item.get('playlist') or item.get('playlist_key'))
+
+    def _index_sections(self, start: int):
+        """Refresh the position and group-key lookups for sections from start on"""
+        for s in range(start, len(self.sections)):
+            key, _, positions = self.sections[s]
+            if s < self._groups_end:
+                self._group_section[key] = s
+            for row, pos in enumerate(positions):
+                self._section_of[pos] = (s, row)
+
+    def append_items(self, base_index: int) -> bool:
+        """
+        Lay out playlist_data[base_index:], just appended, by extending the
+        existing sections instead of recomputing group_layout. Returns False
+        if the layout doesn't cover exactly the items before base_index
+        (the caller then refreshes).
+        """
+        if base_index != len(self._section_of) or base_index > len(self.playlist_data):
+            return False
+        group_singles = bool(self.group_data.get('group_singles', False))
+        first_changed = len(self.sections)
+
+        for pos in range(base_index, len(self.playlist_data)):
+            item = self.playlist_data[pos]
+            if self._in_playlist_group(item):
+                key = item.get('playlist_key') or item.get('playlist')
+                s = self._group_section.get(key)
+                if s is None:
+                    # New groups go after the existing ones, ahead of the singles
+                    s = self._groups_end
+                    self.sections.insert(s, (key, item.get('playlist') or str(key), []))
+                    self._groups_end += 1
+                    self.is_grouped = True
+                    self._index_sections(s)  # Sections below it moved down one
+            elif group_singles:
+                s = len(self.sections) - 1
+                if s < self._groups_end or self.sections[s][0] != MISC_GROUP_KEY:
+                    s = len(self.sections)
+                    self.sections.append((MISC_GROUP_KEY, 'Miscellaneous', []))
+                    self.is_grouped = True
+            else:
+                s = len(self.sections)
+                self.sections.append((None, '', []))
+            positions = self.sections[s][2]
+            positions.append(pos)
+            self._section_of[pos] = (s, len(positions) - 1)
+            first_changed = min(first_changed, s)
+
+        self._rebuild_offsets(first_changed)
+        return True
+
+    def _section_rows(self, section) -> int:
+        key, _, positions = section
+        if key is None:
+            return 1
+        return 1 + (len(positions) if key in self.expanded else 0)
+
+    def _rebuild_offsets(self, start: int = 0):
+        """Recompute section start rows from section start on (O(groups), not O(items))"""
+        start = max(0, min(start, len(self._offsets)))
+        del self._offsets[start:]
+        total = self._offsets[-1] + self._section_rows(self.sections[start - 1]) if start else 0
+        for section in self.sections[start:]:
+            self._offsets.append(total)
+            total += self._section_rows(section)
+        self.total_rows = total
+
+    def set_expanded(self, key, expanded: bool) -> bool:
+        """Expand or collapse a group; returns True if the layout changed"""
+        if expanded == (key in self.expanded):
+            return False
+        if expanded:
+            self.expanded.add(key)
+        else:
+            self.expanded.discard(key)
+        self._rebuild_offsets()
+        return True
+
+    def row_at(self, row: int) -> Optional[Tuple]:
+        """
+        Describe logical row: ('group', key, title, count) for a group header,
+        ('current', playlist index, depth) for an item, or None past the end.
+        """
+        if row < 0 or row >= self.total_rows:
+            return None
+        s = bisect_right(self._offsets, row) - 1
+        key, title, positions = self.sections[s]
+        local = row - self._offsets[s]
+        if key is None:
+            return ('current', positions[0], 0)
+        if local == 0:
+            return ('group', key, title, len(positions))
+        return ('current', positions[local - 1], 1)
+
+    def row_for_index(self, playlist_index: int, expand: bool = True) -> int:
+        """Logical row of a playlist item (its group header while collapsed), -1 if unknown"""
+        where = self._section_of.get(playlist_index)
+        if where is None:
+            return -1
+        s, child = where
+        key = self.sections[s][0]
+        if key is None:
+            return self._offsets[s]
+        if key not in self.expanded:
+            if not expand:
+                return self._offsets[s]
+            self.set_expanded(key, True)
+        return self._offsets[s] + 1 + child
+
     def clear_items(self):
         """Clear all cached items"""
         self.visible_items.clear()
         self.visible_start = 0
         self.visible_end = 0
-    
+
+    def reset_pool(self):
+        """Forget pool rows (the tree widget deleted them, e.g. on clear())"""
+        self.pool = []
+        self.clear_items()
+
+    def page_rows(self) -> int:
+        """Logical rows that fit in the viewport"""
+        height = self.tree_widget.viewport().rect().height()
+        return max(1, height // max(1, self.row_height or self.settings.item_height))
+
+    def max_scroll(self) -> int:
+        return max(0, self.total_rows - self.page_rows())
+
     def calculate_visible_range(self) -> Tuple[int, int]:
-        """Calculate which playlist items should be visible based on scroll position"""
+        """Calculate which logical rows should be visible based on scroll position"""
         if not self.playlist_data:
             return 0, 0
-        
-        # Get viewport geometry
-        viewport = self.tree_widget.viewport()
-        viewport_rect = viewport.rect()
-        
-        # Calculate scroll position
-        v_scrollbar = self.tree_widget.verticalScrollBar()
-        scroll_value = v_scrollbar.value()
-        
-        # Calculate visible range based on scroll value and viewport size
-        items_per_page = max(1, viewport_rect.height() // self.settings.item_height)
-        start_index = max(0, scroll_value)  # scroll value is already in item units
-        
-        # Add buffer above and below
-        buffered_start = max(0, start_index - self.settings.viewport_buffer_size)
-        buffered_end = min(len(self.playlist_data), 
-                          start_index + items_per_page + self.settings.viewport_buffer_size)
-        
-        return buffered_start, buffered_end
-    
+
+        # scroll_offset is in logical rows; the pool covers one page plus a partial row
+        start = max(0, min(self.scroll_offset, self.max_scroll()))
+        end = min(self.total_rows, start + self.page_rows() + 1)
+        return start, end
+
+    def _indices_in_rows(self, start: int, end: int) -> List[int]:
+        indices = []
+        for row in range(max(0, start), min(self.total_rows, end)):
+            info = self.row_at(row)
+            if info and info[0] == 'current':
+                indices.append(info[1])
+        return indices
+
     def get_visible_indices(self) -> List[int]:
         """Get list of currently visible playlist indices"""
         start, end = self.calculate_visible_range()
-        return list(range(start, end))
-    
+        return self._indices_in_rows(start, end)
+
     def should_update_viewport(self) -> bool:
         """Check if viewport needs updating based on scroll position"""
-        new_start, new_end = self.calculate_visible_range()
-        
-        # Update if visible range changed significantly
-        threshold = self.settings.viewport_buffer_size // 2
-        start_diff = abs(new_start - self.visible_start)
-        end_diff = abs(new_end - self.visible_end)
-        
-        return start_diff > threshold or end_diff > threshold
-    
-    def update_visible_items(self, create_item_func, icon_func, duration_func) -> List[int]:
+        return self.calculate_visible_range() != (self.visible_start, self.visible_end)
+
+    def _ensure_pool(self, size: int, create_item_func):
+        """Grow (or, with auto_cleanup, shrink) the pool to size rows"""
+        while len(self.pool) < size:
+            tree_item = create_item_func('', '')
+            self.tree_widget.addTopLevelItem(tree_item)
+            self.pool.append(tree_item)
+        if self.settings.auto_cleanup and len(self.pool) > size:
+            root = self.tree_widget.invisibleRootItem()
+            for tree_item in self.pool[size:]:
+                root.removeChild(tree_item)
+            del self.pool[size:]
+
+    def _bind_row(self, tree_item: QTreeWidgetItem, info: Tuple, icon_func, duration_func,
+                  base_font: QFont, current_index: int):
+        """Point a pool row at a logical row, resetting anything a previous binding set"""
+        tree_item.setHidden(False)
+        tree_item.setForeground(0, QBrush())
+        tree_item.setBackground(0, QBrush())
+
+        if info[0] == 'group':
+            _, key, title, count = info
+            prefix = "🎵" if key == MISC_GROUP_KEY else "📃"
+            tree_item.setText(0, f"{prefix} {title} ({count})")
+            tree_item.setText(1, "")
+            tree_item.setIcon(0, QIcon())
+            tree_item.setFont(0, base_font)
+            tree_item.setData(0, Qt.UserRole, ('group', key))
+            tree_item.setData(0, Qt.UserRole + 1, key)
+            tree_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            tree_item.setExpanded(key in self.expanded)
+            return
+
+        _, idx, depth = info
+        item_data = self.playlist_data[idx]
+        title = item_data.get('title', 'Unknown')
+        icon = icon_func(item_data.get('type', 'unknown'))
+        indent = "    " * depth  # Rows are all top-level; indent group children by hand
+        if isinstance(icon, QIcon):
+            tree_item.setIcon(0, icon)
+            text = title
+        else:
+            tree_item.setIcon(0, QIcon())
+            text = f"{icon} {title}" if icon else title
+        tree_item.setText(1, duration_func(item_data.get('duration', 0)))
+        tree_item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+        tree_item.setData(0, Qt.UserRole, ('current', idx, item_data))
+        tree_item.setData(0, Qt.UserRole + 1, None)
+        tree_item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicator)
+        tree_item.setExpanded(False)
+
+        if idx == current_index:
+            playing_font = QFont(base_font)
+            playing_font.setWeight(QFont.ExtraBold)
+            tree_item.setText(0, f"▶ {indent}{text}")
+            tree_item.setFont(0, playing_font)
+            tree_item.setBackground(0, QColor(231, 111, 81, 25))
+            tree_item.setForeground(0, QColor("#e76f51"))
+        else:
+            tree_item.setText(0, f"{indent}{text}")
+            tree_item.setFont(0, base_font)
+            if item_data.get('needs_title') and item_data.get('type') in ('youtube', 'bilibili'):
+                tree_item.setForeground(0, QColor("#888888"))
+        self.visible_items[idx] = tree_item
+
+    def update_visible_items(self, create_item_func, icon_func, duration_func,
+                             base_font: Optional[QFont] = None, current_index: int = -1) -> List[int]:
         """
-        Update visible items and return list of indices that need duration fetching
-        
+        Re-bind the row pool to the visible logical rows and return list of
+        indices that need duration fetching
+
         Args:
             create_item_func: Function to create QTreeWidgetItem (title, duration_str) -> QTreeWidgetItem
             icon_func: Function to get icon for item type (item_type) -> QIcon
             duration_func: Function to format duration (duration_seconds) -> str
-        
+
         Returns:
             List of playlist indices that need duration fetching
         """
         new_start, new_end = self.calculate_visible_range()
-        
-        # Get items that should be visible now
-        should_be_visible = set(range(new_start, new_end))
-        currently_visible = set(self.visible_items.keys())
-        
-        # Remove items that are no longer visible
-        to_remove = currently_visible - should_be_visible
-        for idx in to_remove:
-            item = self.visible_items.pop(idx)
-            # Remove from tree widget
-            parent = item.parent()
-            if parent:
-                parent.removeChild(item)
-            else:
-                root = self.tree_widget.invisibleRootItem()
-                root.removeChild(item)
-        
-        # Add new items that should be visible
-        to_add = should_be_visible - currently_visible
+        self.scroll_offset = new_start
+        self._ensure_pool(self.page_rows() + 1, create_item_func)
+        if base_font is None:
+            base_font = self.tree_widget.font()
+
+        self.visible_items = {}
+        for i, tree_item in enumerate(self.pool):
+            info = self.row_at(new_start + i) if new_start + i < new_end else None
+            if info is None:
+                tree_item.setHidden(True)
+                continue
+            self._bind_row(tree_item, info, icon_func, duration_func, base_font, current_index)
+
+        # Prefetch durations a little beyond the viewport
+        buffer = self.settings.viewport_buffer_size
         items_needing_duration = []
-        
-        for idx in to_add:
-            if idx < len(self.playlist_data):
-                item_data = self.playlist_data[idx]
-                
-                # Create tree widget item
-                title = item_data.get('title', 'Unknown')
-                duration = item_data.get('duration', 0)
-                duration_str = duration_func(duration)
-                
-                tree_item = create_item_func(title, duration_str)
-                
-                # Set icon
-                item_type = item_data.get('type', 'unknown')
-                icon = icon_func(item_type)
-                if icon:
-                    tree_item.setIcon(0, icon)
-                
-                # Store item data
-                tree_item.setData(0, 0x0100, ('current', idx, item_data))  # Qt.UserRole
-                
-                # Add to tree widget as top-level item
-                self.tree_widget.addTopLevelItem(tree_item)
-                
-                # Add to cache
-                self.visible_items[idx] = tree_item
-                
-                # Check if needs duration fetching
-                if not duration and item_type in ('youtube', 'bilibili', 'local'):
-                    items_needing_duration.append(idx)
-        
+        for idx in self._indices_in_rows(new_start - buffer, new_end + buffer):
+            item_data = self.playlist_data[idx]
+            if not item_data.get('duration') and item_data.get('type') in ('youtube', 'bilibili', 'local'):
+                items_needing_duration.append(idx)
+
         # Update visible range tracking
         self.visible_start = new_start
         self.visible_end = new_end
-        
+
         return items_needing_duration
-    
+
     def cleanup_memory(self):
         """Clean up memory if too many items are cached"""
         if not self.settings.auto_cleanup:
             return
-        
-        if len(self.visible_items) > self.settings.cleanup_threshold:
-            # Keep only items in current visible range
-            current_start, current_end = self.calculate_visible_range()
-            current_visible = set(range(current_start, current_end))
-            
-            to_remove = []
-            for idx in self.visible_items:
-                if idx not in current_visible:
-                    to_remove.append(idx)
-            
-            for idx in to_remove:
-                item = self.visible_items.pop(idx)
-                parent = item.parent()
-                if parent:
-                    parent.removeChild(item)
-                else:
-                    root = self.tree_widget.invisibleRootItem()
-                    root.removeChild(item)
-    
+
+        # The pool never grows past one page; drop rows left over from a taller viewport
+        needed = self.page_rows() + 1
+        if len(self.pool) > max(needed, self.settings.cleanup_threshold):
+            root = self.tree_widget.invisibleRootItem()
+            for tree_item in self.pool[needed:]:
+                root.removeChild(tree_item)
+            del self.pool[needed:]
+
     def get_item_by_index(self, playlist_index: int) -> Optional[QTreeWidgetItem]:
         """Get tree widget item for a specific playlist index"""
         return self.visible_items.get(playlist_index)
-    
+
     def is_virtual_mode_beneficial(self) -> bool:
         """Check if virtual mode would be beneficial for current playlist size"""
-        return len(self.playlist_data) >= self.settings.enable_threshold
\ No newline at end of file
+        return len(self.playlist_data) >= self.settings.enable_threshold
@@ -3,11 +3,15 @@
 Virtual Playlist Widget for Silence Suzuka Player
 
 A QTreeWidget that efficiently handles large playlists through virtualization.
+
+The tree only ever holds a viewport-sized pool of rows. A separate scrollbar
+spans the whole logical library (group headers plus expanded items), and
+scrolling re-binds the pool to the rows at the new offset.
 """
 
 from typing import List, Dict, Any, Optional, Callable
 from PySide6.QtCore import Qt, QTimer, Signal
-from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem, QAbstractItemView, QHeaderView
+from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem, QAbstractItemView, QHeaderView, QScrollBar, QApplication
 from PySide6.QtGui import QIcon
 
 from .settings import VirtualPlaylistSettings
@@ -44,9 +48,17 @@ class VirtualPlaylistWidget(QTreeWidget):
         self.icon_func: Optional[Callable] = None
         self.duration_func: Optional[Callable] = None
         
-        # Connect scroll events
-        v_scrollbar = self.verticalScrollBar()
-        v_scrollbar.valueChanged.connect(self._on_scroll)
+        # Logical scrollbar over the whole library; the tree's own one only
+        # knows about the row pool
+        self.logical_scrollbar = QScrollBar(Qt.Vertical, self)
+        self.logical_scrollbar.setSingleStep(1)
+        self.logical_scrollbar.valueChanged.connect(self._on_scroll)
+        self.logical_scrollbar.hide()
+        self._virtual_active = False
+        
+        # Group headers in the pool expand/collapse logical groups
+        self.itemExpanded.connect(lambda item: self._on_group_toggled(item, True))
+        self.itemCollapsed.connect(lambda item: self._on_group_toggled(item, False))
         
         # Debug mode (can be enabled for troubleshooting)
         self._debug_virtual = False
@@ -84,6 +96,45 @@ class VirtualPlaylistWidget(QTreeWidget):
         self.icon_func = icon_func  
         self.duration_func = duration_func
     
+    @property
+    def virtual_active(self) -> bool:
+        """True while rows are virtualized (False when the playlist fell back to regular rendering)"""
+        return self._virtual_active
+
+    def _set_virtual_active(self, active: bool):
+        """Swap between the logical scrollbar (virtual) and the tree's own (regular rendering)"""
+        if active == self._virtual_active:
+            return
+        self._virtual_active = active
+        if active:
+            self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            # Pool rows are recycled, so reordering them by dragging would corrupt the playlist
+            self.setDragDropMode(QAbstractItemView.DropOnly)
+            self.logical_scrollbar.show()
+        else:
+            self.logical_scrollbar.hide()
+            self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            self.setDragDropMode(QAbstractItemView.InternalMove)
+            self.setViewportMargins(0, 0, 0, 0)
+        self._layout_logical_scrollbar()
+
+    def _layout_logical_scrollbar(self):
+        if not self._virtual_active:
+            return
+        rect = self.contentsRect()
+        width = self.logical_scrollbar.sizeHint().width()
+        self.setViewportMargins(0, 0, width, 0)
+        self.logical_scrollbar.setGeometry(rect.right() - width + 1, rect.top(), width, rect.height())
+
+    def _update_scroll_range(self):
+        manager = self.item_manager
+        bar = self.logical_scrollbar
+        bar.blockSignals(True)
+        bar.setRange(0, manager.max_scroll())
+        bar.setPageStep(manager.page_rows())
+        bar.setValue(min(manager.scroll_offset, manager.max_scroll()))
+        bar.blockSignals(False)
+
     def set_playlist_data(self, playlist: List[Dict[str, Any]], group_info: Optional[Dict] = None):
         """Set playlist data and trigger virtual rendering"""
         self.item_manager.set_playlist_data(playlist, group_info)
@@ -101,18 +152,85 @@ class VirtualPlaylistWidget(QTreeWidget):
             # Fallback to regular rendering for small playlists
             if hasattr(self, '_debug_virtual') and self._debug_virtual:
                 print(f"Virtual Playlist: Falling back to regular mode (playlist too small)")
+            self._set_virtual_active(False)
+            self.item_manager.reset_pool()
             return False
         
         if hasattr(self, '_debug_virtual') and self._debug_virtual:
             print(f"Virtual Playlist: Using virtual mode for {playlist_size} items")
+        self._set_virtual_active(True)
         self._update_virtual_viewport()
         return True
     
+    def append_playlist_items(self, base_index: int) -> bool:
+        """
+        Lay out items just appended to the playlist at base_index and re-bind
+        the pool. Returns False when not virtualized or the layout is out of
+        sync (the caller refreshes).
+        """
+        if not self._virtual_active or not self.item_manager.append_items(base_index):
+            return False
+        self._update_virtual_viewport()
+        return True
+
     def _on_scroll(self, value):
         """Handle scroll events with debouncing"""
+        self.item_manager.scroll_offset = value
         if self.settings.enabled and self.item_manager.should_update_viewport():
             # Use timer to debounce rapid scroll events
             self.update_timer.start(16)  # ~60fps updates
+
+    def _on_group_toggled(self, item, expanded: bool):
+        """A pool group header was expanded or collapsed"""
+        if not self._virtual_active:
+            return
+        data = item.data(0, Qt.UserRole)
+        if isinstance(data, tuple) and data[0] == 'group':
+            if self.item_manager.set_expanded(data[1], expanded):
+                self._update_virtual_viewport()
+
+    def wheelEvent(self, event):
+        if not self._virtual_active:
+            super().wheelEvent(event)
+            return
+        steps = event.angleDelta().y() / 120.0
+        rows = int(round(-steps * QApplication.wheelScrollLines()))
+        if rows:
+            self.logical_scrollbar.setValue(self.logical_scrollbar.value() + rows)
+        event.accept()
+
+    def keyPressEvent(self, event):
+        if not self._virtual_active:
+            super().keyPressEvent(event)
+            return
+        bar = self.logical_scrollbar
+        key = event.key()
+        current = self.currentItem()
+        pool = self.item_manager.pool
+        visible_pool = [row for row in pool if not row.isHidden()]
+        if key == Qt.Key_PageDown:
+            bar.setValue(bar.value() + bar.pageStep())
+        elif key == Qt.Key_PageUp:
+            bar.setValue(bar.value() - bar.pageStep())
+        elif key == Qt.Key_Home and event.modifiers() & Qt.ControlModifier:
+            bar.setValue(bar.minimum())
+        elif key == Qt.Key_End and event.modifiers() & Qt.ControlModifier:
+            bar.setValue(bar.maximum())
+        elif key == Qt.Key_Down and visible_pool and current is visible_pool[-1] and bar.value() < bar.maximum():
+            bar.setValue(bar.value() + 1)  # Keep the cursor on the bottom row; the content moves
+        elif key == Qt.Key_Up and visible_pool and current is visible_pool[0] and bar.value() > 0:
+            bar.setValue(bar.value() - 1)
+        else:
+            super().keyPressEvent(event)
+            return
+        self._update_virtual_viewport()
+        event.accept()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._virtual_active:
+            self._layout_logical_scrollbar()
+            self.update_timer.start(16)
     
     def _delayed_viewport_update(self):
         """Update viewport after scroll debounce"""
@@ -123,18 +241,39 @@ class VirtualPlaylistWidget(QTreeWidget):
         if not self.settings.enabled or not all([self.create_item_func, self.icon_func, self.duration_func]):
             return
         
+        if not self._virtual_active:
+            return
+        
         try:
             # Debug info can be disabled in production
             total_items = len(self.item_manager.playlist_data)
             if hasattr(self, '_debug_virtual') and self._debug_virtual:
                 print(f"Virtual Playlist: Updating viewport for {total_items} total items")
             
-            # Update visible items
-            items_needing_duration = self.item_manager.update_visible_items(
-                self.create_item_func,
-                self.icon_func, 
-                self.duration_func
-            )
+            # Re-bind the row pool (signals blocked: rebinding toggles header expansion)
+            self.setUpdatesEnabled(False)
+            self.blockSignals(True)
+            try:
+                items_needing_duration = self.item_manager.update_visible_items(
+                    self.create_item_func,
+                    self.icon_func, 
+                    self.duration_func,
+                    current_index=getattr(self.player, 'current_index', -1)
+                )
+            finally:
+                self.blockSignals(False)
+                self.setUpdatesEnabled(True)
+            self.verticalScrollBar().setValue(0)  # The pool itself never scrolls
+            
+            # Learn the real row height once rows exist, then lay out again
+            pool = self.item_manager.pool
+            if pool and not self.item_manager.row_height:
+                measured = self.visualItemRect(pool[0]).height()
+                if measured > 0:
+                    self.item_manager.row_height = measured
+                    if measured != self.settings.item_height:
+                        self.update_timer.start(0)
+            self._update_scroll_range()
             
             visible_count = len(self.item_manager.visible_items)
             if hasattr(self, '_debug_virtual') and self._debug_virtual:
@@ -161,6 +300,27 @@ class VirtualPlaylistWidget(QTreeWidget):
         """Get currently visible playlist indices for duration fetching prioritization"""
         return self.item_manager.get_visible_indices()
     
+    def rebind_visible(self):
+        """Re-bind the pool now (e.g. the current track changed)"""
+        self._update_virtual_viewport()
+
+    def refresh_index(self, playlist_index: int):
+        """Re-bind the pool row showing a playlist item after its data changed"""
+        if playlist_index in self.item_manager.visible_items:
+            self.update_timer.start(16)
+
+    def scroll_to_playlist_index(self, playlist_index: int):
+        """Scroll the logical view so a playlist item is centred (expanding its group)"""
+        if not self._virtual_active:
+            return
+        manager = self.item_manager
+        row = manager.row_for_index(playlist_index)
+        if row < 0:
+            return
+        target = max(0, min(row - manager.page_rows() // 2, manager.max_scroll()))
+        manager.scroll_offset = target
+        self._update_virtual_viewport()
+
     def update_item_duration(self, playlist_index: int, duration: float):
         """Update duration for a specific item if it's visible"""
         item = self.item_manager.get_item_by_index(playlist_index)
@@ -174,18 +334,21 @@ class VirtualPlaylistWidget(QTreeWidget):
         if not self.settings.enabled:
             return False
         
-        # Set new playlist data
-        success = self.set_playlist_data(playlist)
-        if not success:
-            return False  # Fall back to regular mode
+        # Keep groups that were expanded in the pool (or by the caller) expanded
+        expanded = set(self.item_manager.expanded)
+        expanded.update(key for key, is_open in (expansion_state or {}).items() if is_open)
+        group_info = {
+            'group_singles': bool(getattr(self.player, 'group_singles', False)),
+            'expanded': expanded
+        }
         
-        # Clear tree 
+        # Clear tree (rows from regular rendering or the previous pool)
         self.clear()
+        self.item_manager.reset_pool()
         
-        # For virtual mode, only create and show visible items
-        # The scrolling will be handled by managing visible items dynamically
-        self._update_virtual_viewport()
-        return True
+        # Set new playlist data; in virtual mode only the rows in view are
+        # bound to the recycled pool
+        return self.set_playlist_data(playlist, group_info)  # False: fall back to regular mode
     
     def find_item_by_playlist_index(self, playlist_index: int) -> Optional[QTreeWidgetItem]:
         """Find tree widget item by playlist index"""
@@ -197,6 +360,8 @@ class VirtualPlaylistWidget(QTreeWidget):
             'enabled': self.settings.enabled,
             'total_items': len(self.item_manager.playlist_data),
             'visible_items': len(self.item_manager.visible_items), 
+            'pool_size': len(self.item_manager.pool),
+            'logical_rows': self.item_manager.total_rows,
             'visible_range': (self.item_manager.visible_start, self.item_manager.visible_end),
             'memory_beneficial': self.item_manager.is_virtual_mode_beneficial()
         }